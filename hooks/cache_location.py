@@ -205,3 +205,34 @@ class CacheLocation(HookBaseClass):
 
         return target_path
 
+
+    def get_path_cache_snapshot_folder(self, project_id, entry_point, pipeline_configuration_id):
+        """
+        Establish a shared location for path cache snapshots.
+
+        Path cache snapshots are written by the ``tank snapshot_folders`` command.
+        Whenever a local path cache file is empty or older than the newest snapshot
+        found in this folder, it is replaced by a copy of the snapshot before being
+        synchronized with Shotgun. This turns the full synchronization that each new
+        machine, for example a render farm node, would otherwise run into a file copy
+        followed by a small incremental synchronization.
+
+        The folder should be readable by all the machines using the pipeline
+        configuration. By default, snapshots are stored in the cache folder of the
+        pipeline configuration.
+
+        Note! In the case of the site configuration, project id will be set to None.
+        In the case of an unmanaged pipeline configuration, pipeline config
+        id will be set to None.
+
+        :param project_id: The shotgun id of the project to store snapshots for
+        :param entry_point: Entry point string to identify the scope for a particular plugin
+                            or integration. For more information,
+                            see :meth:`~sgtk.bootstrap.ToolkitManager.entry_point`. For
+                            non-plugin based toolkit projects, this value is None.
+        :param pipeline_configuration_id: The shotgun pipeline config id to store snapshots for
+        :returns: The path to a folder, which doesn't need to exist, or None
+                  to disable path cache snapshots.
+        """
+        tk = self.parent
+        return os.path.join(tk.pipeline_configuration.get_path(), "cache", "path_cache_snapshots")
@@ -18,10 +18,12 @@ import threading
 
 from . import folder
 from . import context
-from .util import shotgun, yaml_cache
+from .util import shotgun, yaml_cache, concurrency, filesystem
 from .errors import TankError
 from .path_cache import PathCache
-from .template import read_templates
+from .template import read_templates, TemplatePath
+from .template_matcher import TemplateMatcher
+from .templatekey import SequenceKey
 from . import constants
 from .util import log_user_activity_metric
 from . import pipelineconfig
@@ -47,6 +49,10 @@ class Sgtk(object):
         
         self.__threadlocal_storage = threading.local()
 
+        # LocalStorage entities looked up by name, see _get_local_storage
+        self.__local_storages = {}
+        self.__local_storages_lock = threading.Lock()
+
         # special stuff to make sure we maintain backwards compatibility in the constructor
         # if the 'project_path' parameter contains a pipeline config object,
         # just use this straight away. If the param contains a string, assume
@@ -63,6 +69,9 @@ class Sgtk(object):
         except TankError, e:
             raise TankError("Could not read templates configuration: %s" % e)
 
+        # prebuild the index used to quickly find templates from paths
+        self.__template_matcher = TemplateMatcher(self.templates)
+
         # execute a tank_init hook for developers to use.
         self.execute_core_hook(constants.TANK_INIT_HOOK_NAME)
 
@@ -84,6 +93,74 @@ class Sgtk(object):
         """
         return self.__pipeline_config
 
+    def _get_path_cache_connections(self):
+        """
+        Returns the path cache database connections pooled for the current thread.
+
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+
+        :returns: Dictionary keyed by database file path,
+                  see :class:`~tank.path_cache.PathCache`.
+        """
+        connections = getattr(self.__threadlocal_storage, "path_cache_connections", None)
+
+        if connections is None:
+            connections = {}
+            self.__threadlocal_storage.path_cache_connections = connections
+
+        return connections
+
+    def _get_local_storage(self, storage_name):
+        """
+        Returns the Shotgun LocalStorage entity with the given name. Storages are
+        looked up once per instance, including the ones which don't exist.
+
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+
+        :param storage_name: Name of the storage, as stored in its code field.
+        :returns: Dictionary with keys type and id, or None if the storage doesn't exist.
+        """
+        with self.__local_storages_lock:
+            if storage_name in self.__local_storages:
+                return self.__local_storages[storage_name]
+
+        local_storage = self.shotgun.find_one("LocalStorage", [["code", "is", storage_name]])
+
+        with self.__local_storages_lock:
+            self.__local_storages[storage_name] = local_storage
+        return local_storage
+
+    def get_template_cache_stats(self):
+        """
+        Returns statistics about the caches holding the results of parsing
+        paths against templates, summed over all the templates.
+
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+
+        :returns: Dictionary with keys ``hits``, ``misses``, ``size`` and ``max_size``.
+        """
+        totals = {"hits": 0, "misses": 0, "size": 0, "max_size": 0}
+        for template in self.templates.values():
+            for name, value in template.get_parse_cache_stats().iteritems():
+                totals[name] += value
+        return totals
+
+    def _get_template_matcher(self):
+        """
+        Returns the :class:`TemplateMatcher` for the current templates.
+
+        The templates dictionary is publicly accessible and may be modified
+        after it has been loaded, in which case the matcher is rebuilt.
+
+        :returns: :class:`TemplateMatcher` instance
+        """
+        if not self.__template_matcher.is_valid_for(self.templates):
+            self.__template_matcher = TemplateMatcher(self.templates)
+        return self.__template_matcher
+
     def execute_core_hook(self, hook_name, **kwargs):
         """
         Executes a core level hook, passing it any keyword arguments supplied.
@@ -272,10 +349,18 @@ class Sgtk(object):
         :raises: :class:`TankError`
         """
         try:
-            self.templates = read_templates(self.__pipeline_config)
+            templates = read_templates(self.__pipeline_config)
         except TankError, e:
             raise TankError("Templates could not be reloaded: %s" % e)
 
+        # the previous templates may still be referenced, make sure they
+        # don't hold on to results from before the reload.
+        for template in self.templates.values():
+            template.clear_parse_cache()
+        self.templates = templates
+
+        self.__template_matcher = TemplateMatcher(self.templates)
+
     def list_commands(self):
         """
         Lists the system commands registered with the system.
@@ -329,22 +414,82 @@ class Sgtk(object):
         :param path: Path to match against a template
         :returns: :class:`TemplatePath` or None if no match could be found.
         """
+        template, fields = self.__match_path(path, self._get_template_matcher())
+        return template
+
+    def templates_from_paths(self, paths, max_workers=None):
+        """
+        Finds the templates matching a list of paths, along with the fields
+        extracted from each path::
+
+            >>> import sgtk
+            >>> tk = sgtk.sgtk_from_path("/studio/project_root")
+            >>> tk.templates_from_paths(["/studio/my_proj/assets/Car/Anim/work", "/foo/bar"])
+            [(<Sgtk Template maya_asset_project: assets/%(Asset)s/%(Step)s/work>,
+              {'Asset': 'Car', 'Step': 'Anim'}),
+             (None, None)]
+
+        This is equivalent to calling :meth:`template_from_path` and
+        :meth:`Template.get_fields` for each of the paths, but is significantly
+        faster when classifying a large number of paths.
+
+        :param paths: List of paths to match against templates.
+        :param max_workers: Optional maximum number of threads used to process
+                            the paths in chunks. By default, all paths are
+                            processed in the calling thread.
+        :returns: List with a ``(template, fields)`` tuple for each input path.
+                  Both items are None if no template matches the path.
+        :raises: :class:`TankError` if more than one template matches a path.
+        """
+        matcher = self._get_template_matcher()
+
+        def match_chunk(chunk):
+            return [self.__match_path(path, matcher) for path in chunk]
+
+        chunks = concurrency.split_in_chunks(paths, constants.TEMPLATE_BATCH_CHUNK_SIZE)
+        results = []
+        for chunk_results in concurrency.map_concurrently(match_chunk, chunks, max_workers):
+            results.extend(chunk_results)
+        return results
+
+    def __match_path(self, path, matcher):
+        """
+        Finds the template matching a path and extracts its fields.
+
+        :param path: Path to match against a template
+        :param matcher: :class:`TemplateMatcher` to find candidate templates with.
+        :returns: Tuple with the matching :class:`Template` and its fields,
+                  or ``(None, None)`` if no match could be found.
+        :raises: :class:`TankError` if more than one template matches the path.
+        """
+        # the normalized path and the positions of static tokens in it
+        # are shared between all path templates.
+        norm_path = os.path.normpath(path)
+        lower_path = norm_path.lower()
+        token_positions_cache = {}
+
+        # only validate the templates whose static parts fit the path
         matched_templates = []
-        for key, template in self.templates.items():
-            if template.validate(path):
+        matched_fields = []
+        for template in matcher.get_candidates_from_normalized_path(lower_path):
+            if isinstance(template, TemplatePath):
+                fields = template._parse_normalized_path(
+                    norm_path, lower_path, token_positions_cache=token_positions_cache
+                )
+            else:
+                fields = template.validate_and_get_fields(path)
+
+            if fields is not None:
                 matched_templates.append(template)
+                matched_fields.append(fields)
 
         if len(matched_templates) == 0:
-            return None
+            return (None, None)
         elif len(matched_templates) == 1:
-            return matched_templates[0]
+            return (matched_templates[0], matched_fields[0])
         else:
             # ambiguity!
             # We're erroring out anyway, take the time to create helpful debug info!
-            matched_fields = []
-            for template in matched_templates:
-                matched_fields.append(template.get_fields(path))
-
             msg = "%d templates are matching the path '%s'.\n" % (len(matched_templates), path)
             msg += "The overlapping templates are:\n"
             for fields, template in zip(matched_fields, matched_templates):
@@ -400,9 +545,74 @@ class Sgtk(object):
         :returns: Matching file paths
         :rtype: List of strings.
         """
+        found_files = set()
+        for glob_str in self.__get_glob_strings(template, fields, skip_keys, skip_missing_optional_keys):
+            # Find all files which are valid for this key set
+            found_files.update([found_file for found_file in glob.iglob(glob_str) if template.validate(found_file)])
+
+        return list(found_files)
+
+    def iter_paths_from_template(self, template, fields, skip_keys=None, skip_missing_optional_keys=False,
+                                 max_workers=constants.PATHS_FROM_TEMPLATE_MAX_WORKERS):
+        """
+        Finds paths that match a template using field values passed, yielding
+        them as they are found.
+
+        This works exactly like :meth:`paths_from_template`, but is better suited
+        to templates matching a large number of files, for example image sequences
+        on network storage. The file system is walked one folder level at a time,
+        only descending into folders which match the static parts of the template
+        and the field values passed. The folders of a level are listed concurrently
+        and the matching paths are yielded as soon as they are found rather than
+        collected in a list.
+
+        .. note:: The paths are not yielded in any particular order.
+
+        For example, to process all the frames of a sequence::
+
+            >>> for path in tk.iter_paths_from_template(render_template, fields, skip_keys=["SEQ"]):
+            ...     process_frame(path)
+
+        :param template: Template against whom to match.
+        :type  template: :class:`TemplatePath`
+        :param fields: Fields and values to use.
+        :type  fields: Dictionary
+        :param skip_keys: Keys whose values should be ignored from the fields parameter.
+        :type  skip_keys: List of key names
+        :param skip_missing_optional_keys: Specify if optional keys should be skipped if they
+                                        aren't found in the fields collection
+        :param max_workers: Maximum number of threads used to list folders. Pass None
+                            to list folders in the calling thread.
+        :returns: Generator of matching file paths.
+        """
+        glob_strs = self.__get_glob_strings(template, fields, skip_keys, skip_missing_optional_keys)
+
+        # several key sets may match the same files
+        found_files = set() if len(glob_strs) > 1 else None
+
+        for glob_str in glob_strs:
+            for found_file in filesystem.iter_glob(glob_str, max_workers):
+                if found_files is not None:
+                    if found_file in found_files:
+                        continue
+                    found_files.add(found_file)
+                if template.validate(found_file):
+                    yield found_file
+
+    def __get_glob_strings(self, template, fields, skip_keys, skip_missing_optional_keys):
+        """
+        Builds the glob patterns to search for files matching a template with.
+        See :meth:`paths_from_template` for details about the parameters.
+
+        :returns: List of unique glob patterns, one for each key set of the
+                  template which can be used to form a path.
+        """
         skip_keys = skip_keys or []
         if isinstance(skip_keys, basestring):
             skip_keys = [skip_keys]
+        else:
+            # don't modify the caller's list
+            skip_keys = list(skip_keys)
         
         # construct local fields dictionary that doesn't include any skip keys:
         local_fields = dict((field, value) for field, value in fields.iteritems() if field not in skip_keys)
@@ -415,8 +625,7 @@ class Sgtk(object):
             local_fields[key] = "*"
             
         # iterate for each set of keys in the template:
-        found_files = set()
-        globs_searched = set()
+        globs_searched = []
         for keys in template._keys:
             # create fields and skip keys with those that 
             # are relevant for this key set:
@@ -446,12 +655,9 @@ class Sgtk(object):
                 # it's possible that multiple key sets return the same search
                 # string depending on the fields and skip-keys passed in
                 continue
-            globs_searched.add(glob_str)
-            
-            # Find all files which are valid for this key set
-            found_files.update([found_file for found_file in glob.iglob(glob_str) if template.validate(found_file)])
-                    
-        return list(found_files) 
+            globs_searched.append(glob_str)
+
+        return globs_searched
 
 
     def abstract_paths_from_template(self, template, fields):
@@ -537,6 +743,10 @@ class Sgtk(object):
 
         if skip_leaf_level:
             search_template = template.parent
+        else:
+            # the leaf level has to be listed, group the files into
+            # sequences rather than processing each frame separately.
+            return self.abstract_sequences_from_template(template, fields).keys()
 
         # now carry out a regular search based on the template
         found_files = self.paths_from_template(search_template, fields)
@@ -577,6 +787,103 @@ class Sgtk(object):
         return list(abstract_paths)
 
 
+    def abstract_sequences_from_template(self, template, fields,
+                                         max_workers=constants.PATHS_FROM_TEMPLATE_MAX_WORKERS):
+        """
+        Finds the image sequences and other abstract paths matching a template,
+        along with the frames found on disk for each of them.
+
+        This works like :meth:`abstract_paths_from_template`, except that the
+        leaf level is always listed. Files are grouped into sequences as the folders
+        are listed: only the first file found for a sequence in a folder is fully
+        matched against the template, the other files of the folder are added to
+        the sequence as long as they only differ from it by their frame number.
+        This makes it suitable for renders with a very large number of frames.
+
+        Imagine you have a template ``render: sequences/{Sequence}/{Shot}/images/{eye}/{name}.{SEQ}.exr``::
+
+            >>> tk.abstract_sequences_from_template(render, {"Sequence": "AAA", "Shot": "001"})
+            {'/studio/my_proj/sequences/AAA/001/images/%V/render_1.%04d.exr': [(1, 100)],
+             '/studio/my_proj/sequences/AAA/001/images/%V/render_2.%04d.exr': [(1, 20), (22, 50)]}
+
+        :param template: Template with which to search
+        :type  template: :class:`TemplatePath`
+        :param fields: Mapping of keys to values with which to assemble the abstract paths.
+        :type fields: dictionary
+        :param max_workers: Maximum number of threads used to list folders. Pass None
+                            to list folders in the calling thread.
+        :returns: Dictionary keyed by abstract path. Values are lists of ``(first, last)``
+                  tuples for the ranges of consecutive frames found, in ascending order.
+                  The lists are empty for paths which don't have a frame number.
+        """
+        abstract_key_names = [k.name for k in template.keys.values() if k.is_abstract]
+
+        # frames can only be matched without parsing the whole path if a
+        # single sequence key is part of the file name and has no value.
+        leaf_keys = set(template.keys.keys()) - set(template.parent.keys.keys())
+        sequence_keys = [
+            k for k in template.keys.values() if isinstance(k, SequenceKey) and k.name not in fields
+        ]
+        sequence_key = None
+        if len(sequence_keys) == 1 and sequence_keys[0].name in leaf_keys:
+            sequence_key = sequence_keys[0]
+            frame_spec = sequence_key.str_from_value("FORMAT: %d")
+
+        # frames found for each abstract path
+        sequences = {}
+        # for each folder, list of (file name prefix, file name suffix, frames)
+        # for the sequences found in it so far.
+        folder_sequences = {}
+
+        for glob_str in self.__get_glob_strings(template, fields, None, False):
+            for found_file in filesystem.iter_glob(glob_str, max_workers):
+
+                if sequence_key:
+                    (folder, file_name) = os.path.split(found_file)
+                    frame = None
+                    for (prefix, suffix, frames) in folder_sequences.get(folder, []):
+                        frame_str = file_name[len(prefix):len(file_name) - len(suffix)]
+                        if (file_name.startswith(prefix) and file_name.endswith(suffix) and
+                                frame_str.isdigit() and
+                                len(prefix) + len(frame_str) + len(suffix) == len(file_name) and
+                                sequence_key.str_from_value(int(frame_str)) == frame_str):
+                            frame = int(frame_str)
+                            frames.add(frame)
+                            break
+                    if frame is not None:
+                        continue
+
+                cur_fields = template.validate_and_get_fields(found_file)
+                if cur_fields is None:
+                    continue
+
+                # collapse the abstract fields down into their
+                # abstract patterns, unless they were given a value.
+                abstract_fields = dict(cur_fields)
+                for abstract_key_name in abstract_key_names:
+                    abstract_fields.pop(abstract_key_name, None)
+                abstract_fields.update(fields)
+                abstract_path = template.apply_fields(abstract_fields)
+
+                frames = sequences.setdefault(abstract_path, set())
+                frame = cur_fields.get(sequence_key.name) if sequence_key else None
+                if not isinstance(frame, int):
+                    continue
+                frames.add(frame)
+
+                # the other frames of this sequence in the same folder only
+                # differ by the frame number in the file name.
+                pattern_fields = dict(cur_fields)
+                pattern_fields[sequence_key.name] = "FORMAT: %d"
+                (pattern_folder, pattern_file_name) = os.path.split(template.apply_fields(pattern_fields))
+                if pattern_folder == folder and pattern_file_name.count(frame_spec) == 1:
+                    (prefix, suffix) = pattern_file_name.split(frame_spec)
+                    folder_sequences.setdefault(folder, []).append((prefix, suffix, frames))
+
+        return dict(
+            (abstract_path, _get_frame_ranges(frames)) for (abstract_path, frames) in sequences.iteritems()
+        )
+
     def paths_from_entity(self, entity_type, entity_id):
         """
         Finds paths associated with a Shotgun entity.
@@ -823,6 +1130,21 @@ def get_authenticated_user():
     global _authenticated_user
     return _authenticated_user
 
+def _get_frame_ranges(frames):
+    """
+    Turns a collection of frame numbers into ranges of consecutive frames.
+
+    :param frames: Iterable of frame numbers.
+    :returns: List of ``(first, last)`` tuples, in ascending order.
+    """
+    ranges = []
+    for frame in sorted(frames):
+        if ranges and ranges[-1][1] == frame - 1:
+            ranges[-1] = (ranges[-1][0], frame)
+        else:
+            ranges.append((frame, frame))
+    return ranges
+
 ##########################################################################################
 # Legacy handling
 
@@ -21,6 +21,9 @@ BUNDLE_METADATA_FILE = "info.yml"
 # configs to be re-deployed, this version number should be incremented.
 BOOTSTRAP_LOGIC_GENERATION = 4
 
+# maximum number of bundles downloaded concurrently when caching apps
+MAX_CONCURRENT_BUNDLE_DOWNLOADS = 8
+
 # config file with information about which core to use
 CONFIG_CORE_DESCRIPTOR_FILE = "core_api.yml"
 
@@ -13,6 +13,7 @@ from .errors import TankBootstrapError
 from .configuration import Configuration
 from .resolver import ConfigurationResolver
 from ..authentication import ShotgunAuthenticator
+from ..util import concurrency
 from .. import LogManager
 
 log = LogManager.get_logger(__name__)
@@ -408,32 +409,51 @@ class ToolkitManager(object):
         # then go ahead and download and post-install them
         pc = tk.pipeline_configuration
 
-        # pass 1 - populate list of all descriptors
+        # pass 1 - populate list of all descriptors, skipping the ones
+        # referring to the same bundle as a previous one.
         descriptors = []
+        descriptor_uris = set()
+
+        def add_descriptor(descriptor):
+            uri = descriptor.get_uri()
+            if uri not in descriptor_uris:
+                descriptor_uris.add(uri)
+                descriptors.append(descriptor)
+
         for env_name in pc.get_environments():
 
             env_obj = pc.get_environment(env_name)
 
             for engine in env_obj.get_engines():
-                descriptors.append(env_obj.get_engine_descriptor(engine))
+                add_descriptor(env_obj.get_engine_descriptor(engine))
 
                 for app in env_obj.get_apps(engine):
-                    descriptors.append(env_obj.get_app_descriptor(engine, app))
+                    add_descriptor(env_obj.get_app_descriptor(engine, app))
 
             for framework in env_obj.get_frameworks():
-                descriptors.append(env_obj.get_framework_descriptor(framework))
-
-        # pass 2 - download all apps
-        for idx, descriptor in enumerate(descriptors):
+                add_descriptor(env_obj.get_framework_descriptor(framework))
 
+        # pass 2 - download all apps, several at a time. Downloads
+        # are moved into the bundle cache as they complete.
+        to_download = []
+        for descriptor in descriptors:
             if not descriptor.exists_local():
-                self._report_progress("Downloading %s..." % descriptor, idx, len(descriptors))
-                descriptor.download_local()
-
+                to_download.append(descriptor)
             else:
                 log.debug("Item %s is already locally installed." % descriptor)
 
-        # pass 3 - do post install
+        if to_download:
+            self._report_progress("Downloading %d items..." % len(to_download), 0, len(to_download))
+
+        downloads = concurrency.iter_concurrently(
+            lambda descriptor: descriptor.download_local(),
+            to_download,
+            constants.MAX_CONCURRENT_BUNDLE_DOWNLOADS
+        )
+        for idx, (descriptor, _) in enumerate(downloads):
+            self._report_progress("Downloaded %s." % descriptor, idx + 1, len(to_download))
+
+        # pass 3 - do post install, once everything has been downloaded
         if do_post_install:
             for descriptor in descriptors:
                 self._report_progress("Running post install for %s" % descriptor)
@@ -10,16 +10,16 @@
 
 import os
 import fnmatch
-import cPickle
 
 from .action_base import Action
 from ..errors import TankError
-from ..util import yaml_cache
+from .. import constants
+from ..util import yaml_cache, filesystem
 
 class CacheYamlAction(Action):
     """
     Action that ensures that crawls a config, caching all YAML data found
-    to disk as pickled data.
+    to disk in the compiled yaml cache of the config.
     """
     def __init__(self):
         Action.__init__(
@@ -67,6 +67,11 @@ class CacheYamlAction(Action):
                  "cache of all YAML data found.")
 
         root_dir = self.tk.pipeline_configuration.get_path()
+        cache_path = os.path.join(root_dir, constants.COMPILED_YAML_CACHE_FILE)
+
+        # use the compiled cache already hooked up to the yaml cache for this
+        # config, if any.
+        compiled_cache = yaml_cache.g_yaml_cache.add_compiled_cache(cache_path, root_dir)
 
         matches = []
         for root, dir_names, file_names in os.walk(root_dir):
@@ -74,21 +79,26 @@ class CacheYamlAction(Action):
                 matches.append(os.path.join(root, file_name))
         for path in matches:
             log.debug("Caching %s..." % path)
-            yaml_cache.g_yaml_cache.get(path)
+            yaml_cache.g_yaml_cache.get(path, deepcopy_data=False)
 
-        items = yaml_cache.g_yaml_cache.get_cached_items()
-        pickle_path = os.path.join(root_dir, "yaml_cache.pickle")
-        log.debug("Writing cache to %s" % pickle_path)
+        # make sure all the files are in the compiled cache, including the ones
+        # which were already loaded in memory before it was hooked up.
+        for item in yaml_cache.g_yaml_cache.get_cached_items():
+            if compiled_cache.handles(item.path):
+                compiled_cache.add(item.path, item.stat, item.data)
 
+        log.debug("Writing cache to %s" % cache_path)
         try:
-            fh = open(pickle_path, "wb")
+            compiled_cache.flush()
         except Exception, e:
-            raise TankError("Unable to open '%s' for writing: %s" % (pickle_path, e))
+            raise TankError("Unable to write compiled cache data to '%s': %s" % (cache_path, e))
 
-        try:
-            cPickle.dump(items, fh)
-        except Exception, e:
-            raise TankError("Unable to dump pickled cache data: %s" % e)
+        # the pickled cache written by previous versions of this command is
+        # superseded by the compiled cache.
+        pickle_path = os.path.join(root_dir, "yaml_cache.pickle")
+        if os.path.exists(pickle_path):
+            log.debug("Removing legacy cache %s" % pickle_path)
+            filesystem.safe_delete_file(pickle_path)
 
         log.info("")
         log.info("Cache yaml completed!")
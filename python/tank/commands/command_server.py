@@ -0,0 +1,588 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Long-lived tank command process serving the shotgun menu commands of a
+pipeline configuration to local clients.
+
+The server keeps the toolkit API and the shotgun engine loaded between requests,
+so that clients don't have to pay for the startup of a tank command every time
+they need the actions of an entity type. It listens on a localhost port which is
+advertised, together with a secret token, in a file in the shotgun menu cache
+folder of the pipeline configuration. Each user runs their own server.
+
+Requests and responses are single lines of json. A request has the form
+{"token": token, "command": name, "args": [...]} where the command and its
+arguments are the ones of the equivalent tank command, and a response has the
+form {"return_code": code, "output": text}.
+"""
+
+from __future__ import with_statement
+
+import binascii
+import getpass
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from . import constants
+from .. import LogManager
+from .. import pipelineconfig_utils
+from ..platform import engine as platform_engine
+from ..errors import TankError
+from ..util import filesystem
+from ..util.process import SubprocessCalledProcessError
+
+log = LogManager.get_logger(__name__)
+
+# commands which can be sent to the server
+SHOTGUN_GET_ACTIONS = "shotgun_get_actions"
+SHOTGUN_CACHE_ACTIONS = "shotgun_cache_actions"
+
+# return codes of the shotgun_get_actions command, matching the tank scripts
+_ERROR_CODE_CACHE_OUT_OF_DATE = 1
+_ERROR_CODE_CACHE_NOT_FOUND = 2
+
+# time at which this process last started the command server of each pipeline configuration
+_server_start_times = {}
+_server_start_times_lock = threading.Lock()
+
+
+def get_server_info_path(pipeline_config_root):
+    """
+    Returns the path to the file describing how to reach the command server
+    of a pipeline configuration run by the current user.
+
+    :param pipeline_config_root: path to the pipeline configuration
+    :returns: path string
+    """
+    try:
+        user_name = getpass.getuser()
+    except Exception:
+        # no user name in the environment, fall back on the user id
+        user_name = str(os.getuid()) if hasattr(os, "getuid") else "default"
+    return os.path.join(
+        pipeline_config_root,
+        "cache",
+        constants.COMMAND_SERVER_INFO_FILE % filesystem.create_valid_filename(user_name)
+    )
+
+
+def execute_command(pipeline_config_root, args, timeout=constants.COMMAND_SERVER_REQUEST_TIMEOUT):
+    """
+    Executes a tank command through the command server of a pipeline configuration.
+
+    :param pipeline_config_root: path to the pipeline configuration
+    :param args: list of arguments of the tank command
+    :param timeout: number of seconds to wait for the server to answer
+    :returns: text output of the command or None if no server could handle the request.
+    :raises: SubprocessCalledProcessError if the command returned a non-zero error code,
+             the same way the tank command would.
+    """
+    server_info = _read_server_info(pipeline_config_root)
+    if server_info is None:
+        return None
+
+    request = {"token": server_info["token"], "command": args[0], "args": args[1:]}
+    try:
+        response = _send_request(server_info["port"], request, timeout)
+    except (socket.error, ValueError, KeyError), e:
+        # a server which went away, or one that is shutting down and doesn't
+        # answer anymore. The caller will run the tank command instead.
+        log.debug("Command server for %s did not answer: %s" % (pipeline_config_root, e))
+        return None
+
+    # the tank command outputs bytes
+    output = response["output"].encode("utf-8")
+    if response["return_code"]:
+        raise SubprocessCalledProcessError(response["return_code"], ["tank"] + args, output=output)
+    return output
+
+
+def start_server(pipeline_config_root):
+    """
+    Starts the command server of a pipeline configuration in the background,
+    unless this process already started it recently.
+
+    The server takes a moment to start and will only handle requests
+    sent after it has advertised itself.
+
+    :param pipeline_config_root: path to the pipeline configuration
+    :raises: TankError if the tank command of the pipeline configuration could
+             not be found or executed.
+    """
+    with _server_start_times_lock:
+        start_time = _server_start_times.get(pipeline_config_root)
+        if start_time is not None and time.time() - start_time < constants.COMMAND_SERVER_START_TIMEOUT:
+            return
+        _server_start_times[pipeline_config_root] = time.time()
+
+    tank_command = "tank" if sys.platform != "win32" else "tank.bat"
+    command_path = os.path.join(pipeline_config_root, tank_command)
+    if not os.path.isfile(command_path):
+        raise TankError("Could not find the tank command on disk: %s" % command_path)
+
+    devnull = open(os.devnull, "r+b")
+    try:
+        try:
+            subprocess.Popen(
+                [command_path, "shotgun_command_server"],
+                stdin=devnull,
+                stdout=devnull,
+                stderr=devnull,
+                close_fds=(sys.platform != "win32")
+            )
+        except OSError, e:
+            raise TankError("Could not start the command server for %s: %s" % (pipeline_config_root, e))
+    finally:
+        devnull.close()
+
+
+def write_shotgun_cache(tk, engine_obj, entity_type, cache_file_name):
+    """
+    Writes a shotgun cache menu file to disk.
+    The cache is per type and per operating system.
+
+    :param tk:              toolkit API instance
+    :param engine_obj:      shotgun engine started for the entity type
+    :param entity_type:     type of the entity that we want to write the cache
+                            for
+    :param cache_file_name: name of the file used to store the cached data
+    """
+    cache_path = os.path.join(tk.pipeline_configuration.get_shotgun_menu_cache_location(), cache_file_name)
+
+    # get list of actions. Copy them since the engine can be kept around.
+    engine_commands = dict(engine_obj.commands)
+
+    # insert special system commands
+    if entity_type.lower() == "project":
+        engine_commands["__core_info"] = { "properties": {"title": "Check for Core Upgrades...",
+                                                          "deny_permissions": ["Artist"] } }
+
+        engine_commands["__upgrade_check"] = { "properties": {"title": "Check for App Upgrades...",
+                                                              "deny_permissions": ["Artist"] } }
+
+    # extract actions into cache file
+    res = []
+    for (cmd_name, cmd_params) in engine_commands.items():
+
+        # some apps provide a special deny_platforms entry
+        if "deny_platforms" in cmd_params["properties"]:
+            # setting can be Linux, Windows or Mac
+            curr_os = {"linux2": "Linux", "darwin": "Mac", "win32": "Windows"}[sys.platform]
+            if curr_os in cmd_params["properties"]["deny_platforms"]:
+                # deny this platform! :)
+                continue
+
+        title = cmd_params["properties"].get("title", cmd_name)
+        supports_multiple_sel = cmd_params["properties"].get(
+            "supports_multiple_selection", False)
+        deny = ",".join(cmd_params["properties"].get("deny_permissions", []))
+        icon = cmd_params["properties"].get("icon", "")
+        description = cmd_params["properties"].get("description", "")
+
+        entry = [ cmd_name, title, deny, str(supports_multiple_sel),
+                  icon, description ]
+
+        # sanitize the fields to make sure that they do not break the cache
+        # format
+        sanitized = [ token.replace("\n", " ").replace("$", "_")
+                      for token in entry ]
+
+        res.append("$".join(sanitized))
+
+    data = "\n".join(res)
+
+    try:
+        # if file does not exist, make sure it is created with open permissions
+        cache_file_created = False
+        if not os.path.exists(cache_path):
+            cache_file_created = True
+
+        # Write to cache file
+        # Note that we are using binary form here to ensure that the line
+        # endings are written out consistently on all different OSes
+        # otherwise with wt mode, \n on windows will be turned into \n\r
+        # which is not interpreted correctly by the jacascript code.
+        f = open(cache_path, "wb")
+        f.write(data)
+        f.close()
+
+        # make sure cache file has proper permissions
+        if cache_file_created:
+            old_umask = os.umask(0)
+            try:
+                os.chmod(cache_path, 0666)
+            finally:
+                os.umask(old_umask)
+
+    except Exception, e:
+        raise TankError("Could not write to cache file %s: %s" % (cache_path, e))
+
+
+def _read_server_info(pipeline_config_root):
+    """
+    Reads the file advertising the command server of a pipeline configuration.
+
+    :param pipeline_config_root: path to the pipeline configuration
+    :returns: dictionary with the port and token of the server or None if
+              no server is advertised.
+    """
+    try:
+        fh = open(get_server_info_path(pipeline_config_root), "rb")
+        try:
+            server_info = json.load(fh)
+        finally:
+            fh.close()
+    except (IOError, ValueError):
+        return None
+
+    if not isinstance(server_info, dict) or "port" not in server_info or "token" not in server_info:
+        return None
+    return server_info
+
+
+def _send_request(port, request, timeout):
+    """
+    Sends a request to a command server and returns its response.
+
+    :param port: port the server listens to on localhost
+    :param request: dictionary with the request
+    :param timeout: number of seconds to wait for the server
+    :returns: dictionary with the response of the server
+    :raises: socket.error if the server could not be reached and ValueError if
+             it did not answer properly.
+    """
+    sock = socket.create_connection(("127.0.0.1", port), timeout)
+    try:
+        sock.sendall(json.dumps(request) + "\n")
+        return json.loads(_read_line(sock))
+    finally:
+        sock.close()
+
+
+def _read_line(sock):
+    """
+    Reads a newline terminated message from a socket.
+
+    :param sock: connected socket
+    :returns: message, without its trailing newline
+    :raises: ValueError if the connection was closed before the end of the message.
+    """
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ValueError("Connection closed before the end of the message.")
+        if "\n" in chunk:
+            chunks.append(chunk[:chunk.index("\n")])
+            return "".join(chunks)
+        chunks.append(chunk)
+
+
+def _get_file_state(path):
+    """
+    Returns the state of a file, used to detect modifications.
+
+    :param path: path to the file
+    :returns: (mtime, size) tuple or None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime, stat.st_size)
+
+
+class _ErrorCounter(logging.Handler):
+    """
+    Log handler counting the errors logged while it is installed.
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self, logging.ERROR)
+        self.num_errors = 0
+
+    def emit(self, record):
+        self.num_errors += 1
+
+
+class CommandServer(object):
+    """
+    Serves the shotgun menu commands of a pipeline configuration.
+
+    The toolkit API instance and the last shotgun engine started are kept between
+    requests. They are dropped as soon as a file of the configuration is modified,
+    and the server exits when the core it runs is modified or when it hasn't
+    received any request for a while.
+    """
+
+    def __init__(self, pipeline_config_root, idle_timeout=constants.COMMAND_SERVER_IDLE_TIMEOUT):
+        """
+        :param pipeline_config_root: path to the pipeline configuration to serve
+        :param idle_timeout: number of seconds without requests after which the server exits
+        """
+        self._pipeline_config_root = pipeline_config_root
+        self._idle_timeout = idle_timeout
+        self._info_path = get_server_info_path(pipeline_config_root)
+        self._token = binascii.hexlify(os.urandom(16))
+        self._socket = None
+        self._tk = None
+        self._engine = None
+        self._engine_entity_type = None
+        self._config_state = None
+        self._core_state = None
+
+    @property
+    def port(self):
+        """
+        Port the server listens to on localhost, or None if it is not listening.
+        """
+        if self._socket is None:
+            return None
+        return self._socket.getsockname()[1]
+
+    def serve(self):
+        """
+        Handles requests until the server is idle for too long or the core is modified.
+
+        Nothing is done if another server is already running for the pipeline configuration.
+        """
+        try:
+            execute_command(self._pipeline_config_root, [SHOTGUN_GET_ACTIONS, "", ""])
+        except SubprocessCalledProcessError:
+            log.debug("A command server is already running for %s." % self._pipeline_config_root)
+            return
+
+        self._config_state = self._get_config_state()
+        self._core_state = self._get_core_state()
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self._socket.bind(("127.0.0.1", 0))
+            self._socket.listen(5)
+            self._socket.settimeout(self._idle_timeout)
+            self._write_server_info()
+            log.debug("Command server for %s listening on port %d." % (self._pipeline_config_root, self.port))
+
+            while True:
+                try:
+                    (conn, _) = self._socket.accept()
+                except socket.timeout:
+                    log.debug("Command server idle for %s seconds, exiting." % self._idle_timeout)
+                    break
+
+                try:
+                    conn.settimeout(constants.COMMAND_SERVER_REQUEST_TIMEOUT)
+                    if not self._handle_connection(conn):
+                        break
+                finally:
+                    conn.close()
+        finally:
+            self._shutdown()
+
+    def _handle_connection(self, conn):
+        """
+        Handles the request sent on a connection.
+
+        :param conn: socket connected to the client
+        :returns: False if the server should exit, True otherwise.
+        """
+        try:
+            request = json.loads(_read_line(conn))
+            if request["token"] != self._token:
+                log.warning("Command server received a request with an invalid token.")
+                return True
+            command = request["command"]
+            args = request["args"]
+        except (socket.error, ValueError, KeyError, TypeError), e:
+            log.warning("Command server received an invalid request: %s" % e)
+            return True
+
+        if self._get_core_state() != self._core_state:
+            # our code is outdated. Leave the request unanswered so that
+            # the client runs the tank command instead.
+            log.debug("Core API modified, exiting the command server.")
+            return False
+
+        config_state = self._get_config_state()
+        if config_state != self._config_state:
+            log.debug("Configuration modified, reloading it.")
+            self._destroy_engine()
+            self._tk = None
+            self._config_state = config_state
+
+        try:
+            if command == SHOTGUN_GET_ACTIONS and len(args) == 2:
+                (return_code, output) = self._shotgun_get_actions(*args)
+            elif command == SHOTGUN_CACHE_ACTIONS and len(args) == 2:
+                (return_code, output) = self._shotgun_cache_actions(*args)
+            else:
+                (return_code, output) = (1, "Unsupported command: %s %s" % (command, " ".join(args)))
+        except Exception, e:
+            log.exception("Command server failed to execute %s." % command)
+            (return_code, output) = (1, "Error executing %s: %s" % (command, e))
+
+        try:
+            conn.sendall(json.dumps({"return_code": return_code, "output": output}) + "\n")
+        except (socket.error, ValueError), e:
+            # the client runs the tank command when it doesn't get an answer
+            log.warning("Command server could not send its response: %s" % e)
+        return True
+
+    def _shotgun_get_actions(self, cache_file_name, env_file_name):
+        """
+        Returns the content of a shotgun menu cache file if it is up to date,
+        the same way the tank scripts do.
+
+        :param cache_file_name: name of the cache file
+        :param env_file_name: name of the shotgun environment file the cache is written from
+        :returns: (return code, output) tuple
+        """
+        cache_path = os.path.join(self._pipeline_config_root, "cache", cache_file_name)
+        env_path = os.path.join(self._pipeline_config_root, "config", "env", env_file_name)
+
+        if not os.path.isfile(env_path):
+            return (_ERROR_CODE_CACHE_NOT_FOUND, "")
+
+        cache_state = _get_file_state(cache_path)
+        if cache_state is None or cache_state[0] <= os.path.getmtime(env_path):
+            return (_ERROR_CODE_CACHE_OUT_OF_DATE, "")
+
+        fh = open(cache_path, "rb")
+        try:
+            return (0, fh.read())
+        finally:
+            fh.close()
+
+    def _shotgun_cache_actions(self, entity_type, cache_file_name):
+        """
+        Writes the shotgun menu cache file of an entity type.
+
+        :param entity_type: entity type to write the cache for
+        :param cache_file_name: name of the cache file
+        :returns: (return code, output) tuple
+        """
+        error_counter = _ErrorCounter()
+        LogManager().root_logger.addHandler(error_counter)
+        try:
+            try:
+                tk = self._get_tk()
+                if self._engine is None or self._engine_entity_type != entity_type:
+                    self._destroy_engine()
+                    self._engine = platform_engine.start_shotgun_engine(tk, entity_type, tk.context_empty())
+                    self._engine_entity_type = entity_type
+                write_shotgun_cache(tk, self._engine, entity_type, cache_file_name)
+            except TankError, e:
+                log.error("Error writing shotgun cache file: %s" % e)
+        finally:
+            LogManager().root_logger.removeHandler(error_counter)
+
+        if error_counter.num_errors:
+            # apps may have failed to initialize, don't keep an engine
+            # that would hide these errors from the next requests.
+            self._destroy_engine()
+            return (1, "Generating the cache file for this environment may have resulted in "
+                       "some actions being omitted because of configuration errors. See the "
+                       "tank log files for details.")
+        return (0, "")
+
+    def _get_tk(self):
+        """
+        Returns the toolkit API instance of the pipeline configuration, creating it if needed.
+        """
+        if self._tk is None:
+            # imported here, the api module itself depends on the commands
+            from ..api import tank_from_path
+            try:
+                self._tk = tank_from_path(self._pipeline_config_root)
+            except TankError, e:
+                raise TankError("Could not instantiate an Sgtk API Object! Details: %s" % e)
+            # attach our logger to the tank instance
+            # this will be detected by the shotgun engine and used.
+            self._tk.log = log
+        return self._tk
+
+    def _destroy_engine(self):
+        """
+        Destroys the shotgun engine kept by the server, if any.
+        """
+        if self._engine is not None:
+            try:
+                self._engine.destroy()
+            except Exception:
+                log.exception("Could not destroy the shotgun engine.")
+            self._engine = None
+            self._engine_entity_type = None
+
+    def _get_config_state(self):
+        """
+        Returns the state of the files of the configuration, used to detect modifications.
+        """
+        state = []
+        config_root = os.path.join(self._pipeline_config_root, "config")
+        for (dir_path, dir_names, file_names) in os.walk(config_root):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                path = os.path.join(dir_path, file_name)
+                state.append((path, _get_file_state(path)))
+        return state
+
+    def _get_core_state(self):
+        """
+        Returns the state of the core API the server runs, used to detect upgrades.
+        """
+        try:
+            core_root = pipelineconfig_utils.get_path_to_current_core()
+        except TankError:
+            return None
+        return _get_file_state(os.path.join(core_root, "install", "core", "info.yml"))
+
+    def _write_server_info(self):
+        """
+        Advertises the server in the cache folder of the pipeline configuration.
+
+        The file is only readable by the current user since its token grants
+        access to the server.
+        """
+        tmp_path = "%s.%d.tmp" % (self._info_path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0600)
+        fh = os.fdopen(fd, "wb")
+        try:
+            json.dump({"port": self.port, "token": self._token, "pid": os.getpid()}, fh)
+        finally:
+            fh.close()
+        if sys.platform == "win32" and os.path.exists(self._info_path):
+            os.remove(self._info_path)
+        os.rename(tmp_path, self._info_path)
+
+    def _shutdown(self):
+        """
+        Stops listening, releases the engine and removes the server advertisement
+        unless another server replaced it.
+        """
+        self._destroy_engine()
+        self._tk = None
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+        server_info = _read_server_info(self._pipeline_config_root)
+        if server_info and server_info["token"] == self._token:
+            try:
+                os.remove(self._info_path)
+            except OSError, e:
+                log.warning("Could not remove %s: %s" % (self._info_path, e))
@@ -43,3 +43,25 @@ DEFAULT_CFG = "tk-config-default"
 
 # the name of the shell engine
 SHELL_ENGINE = "tk-shell"
+
+# maximum number of items looked up at the same time when checking for updates
+MAX_CONCURRENT_UPDATE_CHECKS = 8
+
+# file in the shotgun menu cache folder of a pipeline configuration describing
+# how to reach the command server a user runs for that configuration.
+# The folder is shared by all users, so the file is named after the user.
+COMMAND_SERVER_INFO_FILE = "command_server_%s.json"
+
+# environment variable that if set, makes the get_entity_commands command start
+# and use a command server for the pipeline configurations it queries
+COMMAND_SERVER_ENV_VAR = "TK_COMMAND_SERVER"
+
+# number of seconds after which a command server without requests exits
+COMMAND_SERVER_IDLE_TIMEOUT = 900
+
+# number of seconds during which a command server being started is waited
+# for before starting another one
+COMMAND_SERVER_START_TIMEOUT = 60
+
+# number of seconds a client waits for the command server to answer a request
+COMMAND_SERVER_REQUEST_TIMEOUT = 300
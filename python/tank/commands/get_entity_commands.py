@@ -8,6 +8,8 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+from . import command_server
+from . import constants
 from .action_base import Action
 from ..errors import TankError
 from ..util.process import SubprocessCalledProcessError, subprocess_check_output
@@ -22,6 +24,10 @@ def execute_tank_command(pipeline_config_path, args):
     Wrapper around execution of the tank command of a specified pipeline
     configuration.
 
+    If command servers are enabled, the command is sent to the command server
+    of the pipeline configuration, which is started if it isn't running yet.
+    The tank command is executed when the server can't handle the request.
+
     :raises: Will raise a SubprocessCalledProcessError if the tank command
              returns a non-zero error code.
              Will raise a TankError if the tank command could not be
@@ -44,6 +50,13 @@ def execute_tank_command(pipeline_config_path, args):
         raise TankError("Could not find the tank command on disk: %s"
                         % command_path)
 
+    if os.environ.get(constants.COMMAND_SERVER_ENV_VAR):
+        output = command_server.execute_command(pipeline_config_path, args)
+        if output is not None:
+            return output
+        # start a server for the next requests
+        command_server.start_server(pipeline_config_path)
+
     return subprocess_check_output([command_path] + args)
 
 
@@ -101,6 +101,81 @@ class SynchronizePathCache(Action):
                       "the 'upgrade_folders' tank command.")
 
 
+class SnapshotPathCache(Action):
+    """
+    Tank command to write a snapshot of the path cache to a shared location,
+    used to seed the path caches of other machines.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Action.__init__(self,
+                        "snapshot_folders",
+                        Action.TK_INSTANCE,
+                        ("Writes a snapshot of the local folder information to a shared location, "
+                         "speeding up the folder synchronization of machines which don't have any "
+                         "local folder information yet, such as new render farm nodes."),
+                        "Admin")
+
+        # this method can be executed via the API
+        self.supports_api = True
+        self.parameters = {}
+
+    def run_noninteractive(self, log, parameters):
+        """
+        Tank command API accessor.
+        Called when someone runs a tank command through the core API.
+
+        :param log: std python logger
+        :param parameters: dictionary with tank command parameters
+        :returns: Path to the snapshot file.
+        """
+        # validate params and seed default values
+        self._validate_parameters(parameters)
+        return self._run(log)
+
+    def run_interactive(self, log, args):
+        """
+        Tank command accessor
+
+        :param log: std python logger
+        :param args: command line args
+        """
+        if len(args) != 0:
+            raise TankError("Syntax: snapshot_folders")
+
+        return self._run(log)
+
+    def _run(self, log):
+        """
+        Actual business logic for command
+
+        :param log: logger
+        :returns: Path to the snapshot file.
+        """
+        if not self.tk.pipeline_configuration.get_shotgun_path_cache_enabled():
+            # remote cache not turned on for this project
+            raise TankError("Looks like this project doesn't synchronize its folders with Shotgun! "
+                            "If you want to turn on synchronization for this project, run "
+                            "the 'upgrade_folders' tank command.")
+
+        pc = path_cache.PathCache(self.tk)
+        try:
+            log.info("Ensuring that the local folder representation is up to date...")
+            pc.synchronize()
+
+            log.info("Writing folder snapshot...")
+            snapshot_path = pc.write_snapshot()
+        finally:
+            pc.close()
+
+        log.info("Folder snapshot written to %s. Machines with no or older local folder "
+                 "information will start from it when synchronizing their folders." % snapshot_path)
+        return snapshot_path
+
+
 class PathCacheMigrationAction(Action):
     """
     Tank command for migrating an existing project to use the new FilesystemLocation
@@ -75,6 +75,7 @@ BUILT_IN_ACTIONS = [setup_project.SetupProjectAction,
                     pc_overview.PCBreakdownAction,
                     migrate_entities.MigratePublishedFileEntitiesAction,
                     path_cache.SynchronizePathCache,
+                    path_cache.SnapshotPathCache,
                     path_cache.PathCacheMigrationAction,
                     unregister_folders.UnregisterFoldersAction,
                     clone_configuration.CloneConfigAction,
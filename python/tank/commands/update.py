@@ -11,7 +11,8 @@
 from .action_base import Action
 from . import console_utils
 from . import util
-from ..platform.environment import WritableEnvironment
+from ..platform.environment import Environment, WritableEnvironment
+from ..util import concurrency
 from . import constants
 import os
 
@@ -263,6 +264,14 @@ def check_for_updates(log,
                     log.info("> found %s" % filename) 
                     env_filenames.append(os.path.join(env_path, filename))
         
+        # look up the latest versions of all items up front
+        latest_versions = _resolve_latest_versions(
+            log,
+            [Environment(env_filename, pc) for env_filename in env_filenames],
+            engine_instance_name,
+            app_instance_name
+        )
+
         # now process them one after the other
         for env_filename in env_filenames: 
             env_obj = WritableEnvironment(env_filename, pc)
@@ -273,7 +282,8 @@ def check_for_updates(log,
                                                     env_obj, 
                                                     engine_instance_name, 
                                                     app_instance_name, 
-                                                    suppress_prompts)
+                                                    suppress_prompts,
+                                                    latest_versions)
             
     else:
 
@@ -282,7 +292,15 @@ def check_for_updates(log,
             env_names_to_process = pc.get_environments()
         else:
             env_names_to_process = [env_name]
-    
+
+        # look up the latest versions of all items up front
+        latest_versions = _resolve_latest_versions(
+            log,
+            [pc.get_environment(x) for x in env_names_to_process],
+            engine_instance_name,
+            app_instance_name
+        )
+
         for env_name in env_names_to_process:
             env_obj = pc.get_environment(env_name, writable=True)
             env_obj.set_yaml_preserve_mode(preserve_yaml)
@@ -292,7 +310,8 @@ def check_for_updates(log,
                                                     env_obj, 
                                                     engine_instance_name, 
                                                     app_instance_name, 
-                                                    suppress_prompts)
+                                                    suppress_prompts,
+                                                    latest_versions)
     
     
     # display summary
@@ -338,7 +357,8 @@ def _process_environment(tk,
                          environment_obj,
                          engine_instance_name=None, 
                          app_instance_name=None, 
-                         suppress_prompts=False):    
+                         suppress_prompts=False,
+                         latest_versions=None):    
     """
     Updates a given environment object
     
@@ -348,6 +368,8 @@ def _process_environment(tk,
     :param engine_instance_name: Engine instance name to update
     :param app_instance_name: App instance name to update
     :param suppress_prompts: If True, run without prompting
+    :param latest_versions: Latest versions found so far, as returned
+                            by :func:`_resolve_latest_versions`.
     
     :returns: list of updated items
     """
@@ -359,7 +381,39 @@ def _process_environment(tk,
     log.info("Environment %s..." % environment_obj.name)
     log.info("======================================================================")
     log.info("")
-    
+
+    frameworks_listed = False
+
+    for (engine, app, framework) in _get_environment_items(environment_obj,
+                                                            engine_instance_name,
+                                                            app_instance_name):
+        if framework and not frameworks_listed:
+            log.info("")
+            log.info("Frameworks:")
+            log.info("-" * 70)
+            frameworks_listed = True
+
+        items.append( _process_item(log, suppress_prompts, tk, environment_obj,
+                                    engine, app, framework, latest_versions) )
+        if not framework:
+            log.info("")
+
+    return items
+
+
+def _get_environment_items(environment_obj, engine_instance_name=None, app_instance_name=None):
+    """
+    Lists the engines, apps and frameworks of an environment to check for updates.
+
+    :param environment_obj: Environment object
+    :param engine_instance_name: Only list this engine and its apps
+    :param app_instance_name: Only list the apps with this instance name
+
+    :returns: list of (engine_name, app_name, framework_name) tuples, in the order
+              they should be processed. Unused names are set to None.
+    """
+    items = []
+
     if engine_instance_name is None:
         # process all engines
         engines_to_process = environment_obj.get_engines()
@@ -375,8 +429,7 @@ def _process_environment(tk,
             engines_to_process = []
     
     for engine in engines_to_process:
-        items.append( _process_item(log, suppress_prompts, tk, environment_obj, engine) )
-        log.info("")
+        items.append((engine, None, None))
         
         if app_instance_name is None:
             # no filter - process all apps
@@ -392,19 +445,66 @@ def _process_environment(tk,
                 apps_to_process = []
         
         for app in apps_to_process:
-            items.append( _process_item(log, suppress_prompts, tk, environment_obj, engine, app) )
-            log.info("")
-    
-    if len(environment_obj.get_frameworks()) > 0:
-        log.info("")
-        log.info("Frameworks:")
-        log.info("-" * 70)
+            items.append((engine, app, None))
+
+    for framework in environment_obj.get_frameworks():
+        items.append((None, None, framework))
 
-        for framework in environment_obj.get_frameworks():
-            items.append( _process_item(log, suppress_prompts, tk, environment_obj, framework_name=framework) )
-        
     return items
-        
+
+
+def _resolve_latest_versions(log, environments, engine_instance_name=None, app_instance_name=None):
+    """
+    Looks up the latest version of all the items to check for updates in the
+    given environments, before any of them gets updated.
+
+    Items used in several environments are only looked up once, and several
+    lookups are carried out at a time. Items which could not be looked up are
+    left out, they are looked up again as they get processed so that errors
+    are reported as usual.
+
+    :param log: Python logger
+    :param environments: List of environment objects
+    :param engine_instance_name: Engine instance name to update
+    :param app_instance_name: App instance name to update
+
+    :returns: Dictionary of latest descriptors, keyed by (descriptor uri, version pattern).
+    """
+    items = {}
+    for environment_obj in environments:
+        for (engine, app, framework) in _get_environment_items(environment_obj,
+                                                                engine_instance_name,
+                                                                app_instance_name):
+            try:
+                (descriptor, version_pattern) = _get_item_descriptor(environment_obj, engine, app, framework)
+            except Exception, e:
+                log.debug("Could not get the descriptor of %s in %s: %s" % (app or engine or framework,
+                                                                              environment_obj.name, e))
+                continue
+            items[(descriptor.get_uri(), version_pattern)] = descriptor
+
+    def resolve(key):
+        (_, version_pattern) = key
+        try:
+            latest_desc = items[key].find_latest_version(version_pattern)
+            # the deprecation status is checked for all items and may need
+            # the item to be downloaded, so get it while we're at it.
+            latest_desc.deprecation_status
+            return latest_desc
+        except Exception, e:
+            log.debug("Could not look up the latest version of %s: %s" % (items[key], e))
+            return None
+
+    log.info("Looking for the latest version of %d items..." % len(items))
+    keys = items.keys()
+    results = concurrency.map_concurrently(resolve, keys, constants.MAX_CONCURRENT_UPDATE_CHECKS)
+
+    latest_versions = {}
+    for (key, latest_desc) in zip(keys, results):
+        if latest_desc:
+            latest_versions[key] = latest_desc
+    return latest_versions
+
     
 def _update_item(log, suppress_prompts, tk, env, old_descriptor, new_descriptor, engine_name=None, app_name=None, framework_name=None):
     """
@@ -464,10 +564,15 @@ def _update_item(log, suppress_prompts, tk, env, old_descriptor, new_descriptor,
         
 
 
-def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=None, framework_name=None):
+def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=None, framework_name=None,
+                  latest_versions=None):
     """
     Checks if an app/engine/framework is up to date and potentially upgrades it.
 
+    Latest versions already looked up are taken from ``latest_versions``,
+    as returned by :func:`_resolve_latest_versions`. Other items are looked
+    up and added to it.
+
     Returns a dictionary with keys:
     - was_updated (bool)
     - old_descriptor
@@ -489,7 +594,7 @@ def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=Non
         log.info("Engine %s (Environment %s)" % (engine_name, env.name))
 
 
-    status = _check_item_update_status(env, engine_name, app_name, framework_name)
+    status = _check_item_update_status(env, engine_name, app_name, framework_name, latest_versions)
     item_was_updated = False
 
     if status["can_update"]:
@@ -536,12 +641,38 @@ def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=Non
     return d
 
 
-def _check_item_update_status(environment_obj, engine_name=None, app_name=None, framework_name=None):
+def _get_item_descriptor(environment_obj, engine_name=None, app_name=None, framework_name=None):
+    """
+    Returns the descriptor of an engine or app or framework, along with
+    the version pattern its updates are constrained by.
+
+    :returns: Tuple (descriptor, version pattern). The version pattern is None
+              if any later version can be used.
+    """
+    if framework_name:
+        curr_desc = environment_obj.get_framework_descriptor(framework_name)
+        # framework_name follows a convention and is on the form 'frameworkname_version', 
+        # where version is on the form v1.2.3, v1.2.x, v1.x.x
+        # use this pattern as a constraint as we check for updates
+        return (curr_desc, framework_name.split("_")[-1])
+
+    elif app_name:
+        return (environment_obj.get_app_descriptor(engine_name, app_name), None)
+
+    else:
+        return (environment_obj.get_engine_descriptor(engine_name), None)
+
+
+def _check_item_update_status(environment_obj, engine_name=None, app_name=None, framework_name=None,
+                              latest_versions=None):
     """
     Checks if an engine or app or framework is up to date.
     Will locate the latest version of the item and run a comparison.
     Will check for constraints and report about these 
     (if the new version requires minimum version of shotgun, the core API, etc.)
+
+    The latest version is taken from ``latest_versions`` if it has already been
+    looked up, and otherwise added to it.
     
     Returns a dictionary with the following keys:
     - current:       Current engine descriptor
@@ -551,29 +682,21 @@ def _check_item_update_status(environment_obj, engine_name=None, app_name=None,
     - can_update:    Can we update?
     - update_status: String with details describing the status.  
     """
+    (curr_desc, version_pattern) = _get_item_descriptor(environment_obj, engine_name, app_name, framework_name)
 
     parent_engine_desc = None
-    
-    if framework_name:
-        curr_desc = environment_obj.get_framework_descriptor(framework_name)
-        # framework_name follows a convention and is on the form 'frameworkname_version', 
-        # where version is on the form v1.2.3, v1.2.x, v1.x.x
-        version_pattern = framework_name.split("_")[-1]
-        # use this pattern as a constraint as we check for updates
-        latest_desc = curr_desc.find_latest_version(version_pattern)
-        
-    
-    elif app_name:
-        curr_desc = environment_obj.get_app_descriptor(engine_name, app_name)
+    if app_name:
         # for apps, also get the descriptor for their parent engine
         parent_engine_desc = environment_obj.get_engine_descriptor(engine_name)
-        # and get potential upgrades
-        latest_desc = curr_desc.find_latest_version()
 
+    # and get potential upgrades
+    key = (curr_desc.get_uri(), version_pattern)
+    if latest_versions is not None and key in latest_versions:
+        latest_desc = latest_versions[key]
     else:
-        curr_desc = environment_obj.get_engine_descriptor(engine_name)
-        # and get potential upgrades
-        latest_desc = curr_desc.find_latest_version()
+        latest_desc = curr_desc.find_latest_version(version_pattern)
+        if latest_versions is not None:
+            latest_versions[key] = latest_desc
 
 
     # out of date check
@@ -28,6 +28,33 @@ PIPELINE_CONFIGURATION_INIT_HOOK_NAME = "pipeline_configuration_init"
 # hook that is executed whenever a cache location should be determined
 CACHE_LOCATION_HOOK_NAME = "cache_location"
 
+# number of database pages kept in memory by path cache connections
+PATH_CACHE_DB_CACHE_PAGES = 20000
+
+# maximum number of bytes of the path cache database file memory mapped
+# by path cache connections, when the file is stored locally.
+PATH_CACHE_DB_MMAP_SIZE = 268435456
+
+# number of FilesystemLocation records retrieved from Shotgun and
+# loaded into the database at a time during a full path cache sync
+PATH_CACHE_SYNC_PAGE_SIZE = 5000
+
+# maximum number of ids passed to a single path cache sql statement,
+# to stay under the sqlite limit on the number of statement parameters
+PATH_CACHE_SQL_CHUNK_SIZE = 500
+
+# version of the path cache snapshot files written by the snapshot_folders
+# command. Snapshots written with a different version are ignored.
+PATH_CACHE_SNAPSHOT_FORMAT_VERSION = 1
+
+# number of path cache snapshots kept in the snapshot folder
+PATH_CACHE_SNAPSHOTS_TO_KEEP = 2
+
+# environment variable that if set, enables an in memory cache of path cache lookups
+# shared by all path cache objects in a process. The value sets the maximum number
+# of lookups kept in memory for each path cache database.
+PATH_CACHE_LOOKUP_CACHE_SIZE_ENV_VAR = "TK_PATH_CACHE_LOOKUP_CACHE_SIZE"
+
 # Configuration file containing setup and path details
 PIPELINECONFIG_FILE = "pipeline_configuration.yml"
 
@@ -65,6 +92,16 @@ TEMPLATE_PATH_SECTION = "paths"
 # the string section in a templates file
 TEMPLATE_STRING_SECTION = "strings"
 
+# maximum number of threads listing folders concurrently
+# in Sgtk.iter_paths_from_template
+PATHS_FROM_TEMPLATE_MAX_WORKERS = 8
+
+# number of paths processed together when matching paths against templates in bulk
+TEMPLATE_BATCH_CHUNK_SIZE = 500
+
+# maximum number of path parsing results cached by each template
+TEMPLATE_PARSE_CACHE_SIZE = 1000
+
 # a human readable explanation of the above. For error messages.
 VALID_TEMPLATE_KEY_NAME_DESC = "letters, numbers, underscore, space and period"
 
@@ -77,5 +114,25 @@ PROFILING_LOG_CHANNEL = "sgtk.stopwatch"
 # environment variable that if set, enables debug logging in the engine
 DEBUG_LOGGING_ENV_VAR = "TK_DEBUG"
 
+# environment variable that if set, makes the backend log file be written
+# by a background thread. The value is the policy applied when messages are
+# logged faster than they are written: "block" waits for room in the queue,
+# "drop_oldest" discards the oldest messages waiting to be written.
+ASYNC_FILE_LOGGING_ENV_VAR = "TK_ASYNC_FILE_LOGGING"
+ASYNC_FILE_LOGGING_BLOCK = "block"
+ASYNC_FILE_LOGGING_DROP_OLDEST = "drop_oldest"
+
+# maximum number of messages waiting to be written to the backend log file
+ASYNC_FILE_LOGGING_QUEUE_SIZE = 10000
+
+# maximum number of messages written to the backend log file between flushes
+ASYNC_FILE_LOGGING_BATCH_SIZE = 500
+
 # cache data for toolkit init
-TOOLKIT_INIT_CACHE_FILE = "toolkit_init.cache"
\ No newline at end of file
+TOOLKIT_INIT_CACHE_FILE = "toolkit_init.cache"
+
+# compiled yaml cache file, stored at the root of a pipeline configuration
+COMPILED_YAML_CACHE_FILE = "yaml_cache.bin"
+
+# compiled folder schema file, stored at the root of a pipeline configuration
+COMPILED_FOLDER_SCHEMA_FILE = "folder_schema.bin"
@@ -74,6 +74,14 @@ class Context(object):
         self.__additional_entities = additional_entities or []
         self._entity_fields_cache = {}
 
+        # memoized results of as_template_fields, keyed by id(template), and
+        # data extracted from the path cache, shared between all templates.
+        # Both are cleared whenever the path cache is modified.
+        self._template_fields_cache = {}
+        self._path_cache_fields_cache = {}
+        self._entity_locations_cache = None
+        self._path_cache_state = None
+
     def __repr__(self):
         # multi line repr
         msg = []
@@ -225,6 +233,9 @@ class Context(object):
         
         # except:
         # ctx_copy._entity_fields_cache
+        # ctx_copy._template_fields_cache
+        # ctx_copy._path_cache_fields_cache
+        # ctx_copy._entity_locations_cache
         
         return ctx_copy
 
@@ -532,7 +543,71 @@ class Context(object):
         :raises:            :class:`TankError` if the fields can't be resolved for some reason or if 'validate' is True
                             and any of the context fields for the template weren't found. 
         """
-        # Get all entities into a dictionary
+        if isinstance(template, TemplatePath):
+            # the fields are derived from the path cache, make sure nothing
+            # memoized predates the last modification of it.
+            self._check_path_cache_state()
+
+        entities = self._get_entities()
+
+        # the same templates are typically resolved over and over again
+        # for a given context, e.g. by apps and hooks
+        cached = self._template_fields_cache.get(id(template))
+        if cached and cached[0] is template:
+            fields = dict(cached[1])
+        else:
+            fields = self._get_template_fields(template, entities)
+            self._template_fields_cache[id(template)] = (template, dict(fields))
+
+        if validate:
+            # check that all context template fields were found and if not then raise a TankError
+            missing_fields = []
+            for key_name in template.keys.keys():
+                if key_name in entities and key_name not in fields:
+                    # we have a template key that should have been found but wasn't!
+                    missing_fields.append(key_name)
+
+            if missing_fields:
+                raise TankError("Cannot resolve template fields for context '%s' - the following "
+                                "keys could not be resolved: '%s'.  Please run the folder creation "
+                                "for '%s' and try again!" 
+                                % (self, ", ".join(missing_fields), self.shotgun_url))
+
+        return fields
+
+    def create_copy_for_user(self, user):
+        """
+        Provides the ability to create a copy of an existing Context for a specific user.
+
+        This is useful if you need to determine a user specific version of a path, e.g.
+        when copying files between different user sandboxes. Example::
+
+            >>> import sgtk
+            >>> tk = sgtk.sgtk_from_path("/studio.08/demo_project")
+            >>> ctx = tk.context_from_path("/studio.08/demo_project/sequences/AAA/ABC/Lighting/dirk.gently/work")
+            >>> ctx.user
+            {'type': 'HumanUser', 'id': 23, 'name': 'Dirk Gently'}
+            >>>
+            >>> copied_ctx = tk.create_copy_for_user({'type': 'HumanUser', 'id': 7, 'name': 'John Snow'})
+            >>> copied_ctx.user
+            {'type': 'HumanUser', 'id': 23, 'name': 'John Snow'}
+
+        :param user:  The Shotgun user entity dictionary that should be set on the copied context
+        :returns: :class:`Context`
+        """
+        ctx_copy = copy.deepcopy(self)
+        ctx_copy.__user = user
+        return ctx_copy       
+
+    ################################################################################################
+    # private methods
+
+    def _get_entities(self):
+        """
+        Returns all the entities of this context.
+
+        :returns: Dictionary of entity type -> entity dictionary.
+        """
         entities = {}
 
         if self.entity:
@@ -552,6 +627,45 @@ class Context(object):
             if add_entity["type"] not in entities:
                 entities[add_entity["type"]] = add_entity
 
+        return entities
+
+    def _check_path_cache_state(self):
+        """
+        Clears the memoized template fields and path cache data if the
+        path cache has been modified since they were computed.
+        """
+        path_cache = PathCache(self.__tk)
+        try:
+            state = path_cache.get_state()
+        finally:
+            path_cache.close()
+
+        if state != self._path_cache_state:
+            self._template_fields_cache = {}
+            self._path_cache_fields_cache = {}
+            self._entity_locations_cache = None
+            self._path_cache_state = state
+
+    def _get_entity_locations(self):
+        """
+        Memoized version of :meth:`entity_locations`, only valid for as long
+        as the path cache is not modified.
+
+        :returns: A list of paths
+        """
+        if self._entity_locations_cache is None:
+            self._entity_locations_cache = self.entity_locations
+        return self._entity_locations_cache
+
+    def _get_template_fields(self, template, entities):
+        """
+        Computes the fields returned by :meth:`as_template_fields`.
+
+        :param template: The template to find fields for
+        :param entities: Dictionary of entity type -> entity dictionary for all
+                         the entities of this context.
+        :returns: A dictionary of field name, value pairs.
+        """
         fields = {}
 
         # Try to populate fields using paths caches for entity
@@ -568,7 +682,7 @@ class Context(object):
             # 
             # therefore, if the context object contains an entity object and this entity is
             # not represented in the path cache, raise an exception.
-            if self.entity and len(self.entity_locations) == 0:
+            if self.entity and len(self._get_entity_locations()) == 0:
                 # context has an entity associated but no path cache entries
                 raise TankError("Cannot resolve template data for context '%s' - this context "
                                 "does not have any associated folders created on disk yet and "
@@ -590,49 +704,8 @@ class Context(object):
         # get values for shotgun query keys in template
         fields.update(self._fields_from_shotgun(template, entities))
 
-        if validate:
-            # check that all context template fields were found and if not then raise a TankError
-            missing_fields = []
-            for key_name in template.keys.keys():
-                if key_name in entities and key_name not in fields:
-                    # we have a template key that should have been found but wasn't!
-                    missing_fields.append(key_name)
-
-            if missing_fields:
-                raise TankError("Cannot resolve template fields for context '%s' - the following "
-                                "keys could not be resolved: '%s'.  Please run the folder creation "
-                                "for '%s' and try again!" 
-                                % (self, ", ".join(missing_fields), self.shotgun_url))
-
         return fields
 
-    def create_copy_for_user(self, user):
-        """
-        Provides the ability to create a copy of an existing Context for a specific user.
-
-        This is useful if you need to determine a user specific version of a path, e.g.
-        when copying files between different user sandboxes. Example::
-
-            >>> import sgtk
-            >>> tk = sgtk.sgtk_from_path("/studio.08/demo_project")
-            >>> ctx = tk.context_from_path("/studio.08/demo_project/sequences/AAA/ABC/Lighting/dirk.gently/work")
-            >>> ctx.user
-            {'type': 'HumanUser', 'id': 23, 'name': 'Dirk Gently'}
-            >>>
-            >>> copied_ctx = tk.create_copy_for_user({'type': 'HumanUser', 'id': 7, 'name': 'John Snow'})
-            >>> copied_ctx.user
-            {'type': 'HumanUser', 'id': 23, 'name': 'John Snow'}
-
-        :param user:  The Shotgun user entity dictionary that should be set on the copied context
-        :returns: :class:`Context`
-        """
-        ctx_copy = copy.deepcopy(self)
-        ctx_copy.__user = user
-        return ctx_copy       
-
-    ################################################################################################
-    # private methods
-
     def _fields_from_shotgun(self, template, entities):
         """
         Query Shotgun server for keys used by this template whose values come directly
@@ -722,7 +795,7 @@ class Context(object):
         project_roots = self.__tk.pipeline_configuration.get_data_roots().values()
 
         # get all locations on disk for our context object from the path cache
-        path_cache_locations = self.entity_locations 
+        path_cache_locations = self._get_entity_locations()
 
         # now loop over all those locations and check if one of the locations 
         # are matching the template that is passed in. In that case, try to
@@ -799,8 +872,8 @@ class Context(object):
                         continue
 
                     # find fields for any paths associated with this entity by looking in the path cache:
-                    entity_fields = _values_from_path_cache(context_entities[key_name], template, path_cache, 
-                                                           required_fields=found_fields)
+                    entity_fields = self._values_from_path_cache(context_entities[key_name], template, path_cache,
+                                                                 required_fields=found_fields)
 
                     # entity_fields may contain additional fields that correspond to entities
                     # so we should be sure to validate these as well if we can.
@@ -884,6 +957,33 @@ class Context(object):
 
         return found_fields
 
+    def _values_from_path_cache(self, entity, template, path_cache, required_fields):
+        """
+        Memoized version of :func:`_values_from_path_cache`. Results are shared between
+        all templates since templates with common ancestors query the same data.
+
+        :param entity:          The entity to search for fields for
+        :param template:        The template to use to search the path cache
+        :param path_cache:      An instance of the path_cache to search in
+        :param required_fields: A dictionary of fields that must exist in any matched path
+        :returns:               Dictionary of fields found by matching the template against all paths
+                                found for the entity
+        """
+        # ancestor templates are new objects every time they are requested,
+        # so they are identified by their definition instead.
+        cache_key = (
+            entity["type"],
+            entity["id"],
+            template.definition,
+            template.root_path,
+            tuple(sorted(required_fields.items()))
+        )
+        if cache_key not in self._path_cache_fields_cache:
+            self._path_cache_fields_cache[cache_key] = _values_from_path_cache(
+                entity, template, path_cache, required_fields
+            )
+        return dict(self._path_cache_fields_cache[cache_key])
+
 
 ################################################################################################
 # factory methods for constructing new Context objects, primarily called from the Tank object
@@ -1133,36 +1233,17 @@ def from_path(tk, path, previous_context=None):
     # get a cache handle
     path_cache = PathCache(tk)
 
-    # gather all roots as lower case
-    project_roots = [x.lower() for x in tk.pipeline_configuration.get_data_roots().values()]
-
     # first gather entities
     entities = []
     secondary_entities = []
-    curr_path = path
-    while True:
-        curr_entity = path_cache.get_entity(curr_path)
+    for (curr_path, curr_entity, curr_secondary_entities) in path_cache.get_entities_for_path_and_parents(path):
         if curr_entity:
             # Don't worry about entity types we've already got in the context. In the future
             # we should look for entity ids that conflict in order to flag a degenerate schema.
             entities.append(curr_entity)
         
         # add secondary entities
-        secondary_entities.extend( path_cache.get_secondary_entities(curr_path) )
-
-        if curr_path.lower() in project_roots:
-            #TODO this could fail with windows path variations
-            # we have reached a root!
-            break
-
-        # and continue with parent path
-        parent_path = os.path.abspath(os.path.join(curr_path, ".."))
-
-        if curr_path == parent_path:
-            # We're at the disk root, probably a degenerate path
-            break
-        else:
-            curr_path = parent_path
+        secondary_entities.extend(curr_secondary_entities)
 
     path_cache.close()
 
@@ -1537,9 +1618,6 @@ def _context_data_from_cache(tk, entity_type, entity_id):
     # extra entities we should include in the context
     path_cache = PathCache(tk)
 
-    # Grab all project roots
-    project_roots = tk.pipeline_configuration.get_data_roots().values()
-
     # Special case for project as we have the primary data path, which 
     # always points at a project. We only check if the associated configuration
     # has any associated data roots, otherwise a primary config won't exist.
@@ -1551,9 +1629,9 @@ def _context_data_from_cache(tk, entity_type, entity_id):
     paths = path_cache.get_paths(entity_type, entity_id, primary_only=True)
 
     for path in paths:
-        # now recurse upwards and look for entity types we haven't found yet
-        curr_path = path
-        curr_entity = path_cache.get_entity(curr_path)
+        # look up the entities for the path and all its parents in one go
+        path_entities = path_cache.get_entities_for_path_and_parents(path)
+        (curr_path, curr_entity, _) = path_entities[0]
         
         if curr_entity is None:
             # this is some sort of anomaly! the path returned by get_paths
@@ -1572,10 +1650,8 @@ def _context_data_from_cache(tk, entity_type, entity_id):
             context["entity"]["name"] = curr_entity["name"]
 
         # note - paths returned by get_paths are always prefixed with a
-        # project root so there is no risk we end up with an infinite loop here..
-        while curr_path not in project_roots:
-            curr_path = os.path.abspath(os.path.join(curr_path, ".."))
-            curr_entity = path_cache.get_entity(curr_path)
+        # project root so the parents always end with the project root.
+        for (curr_path, curr_entity, _) in path_entities[1:]:
             if curr_entity:
                 cur_type = curr_entity["type"]
                 if cur_type in types_fields:
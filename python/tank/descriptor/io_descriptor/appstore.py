@@ -15,6 +15,7 @@ Toolkit App Store Descriptor.
 import os
 import uuid
 import tempfile
+import threading
 import urllib
 import urllib2
 import httplib
@@ -53,8 +54,12 @@ class IODescriptorAppStore(IODescriptorBase):
 
     """
 
-    # cache app store connections for performance
-    _app_store_connections = {}
+    # cache app store connections for performance. Shotgun API instances
+    # can't be used by several threads at once, so each thread has its own.
+    _app_store_connections = threading.local()
+    # serializes the creation of app store connections, which
+    # uses the connection to the client site.
+    _app_store_connections_lock = threading.Lock()
 
     # internal app store mappings
     (APP, FRAMEWORK, ENGINE, CONFIG, CORE) = range(5)
@@ -327,24 +332,19 @@ class IODescriptorAppStore(IODescriptorBase):
             pass
         return (summary, url)
 
-    def download_local(self):
+    def _download_local(self, destination_path):
         """
-        Retrieves this version to local repo.
-        Will exit early if app already exists local.
-        """
-        if self.exists_local():
-            # nothing to do!
-            return
+        Retrieves this version into the given folder.
 
-        # cache into the primary location
-        target = self._get_cache_paths()[0]
-        filesystem.ensure_folder_exists(target)
+        :param destination_path: Folder to download the item into.
+        """
+        filesystem.ensure_folder_exists(destination_path)
 
         # connect to the app store
         (sg, script_user) = self.__create_sg_app_store_connection()
 
         # fetch metadata from sg...
-        metadata_cache_file = os.path.join(target, METADATA_FILE)
+        metadata_cache_file = os.path.join(destination_path, METADATA_FILE)
         metadata = self.__cache_app_store_metadata(metadata_cache_file)
 
         # now get the attachment info
@@ -378,8 +378,8 @@ class IODescriptorAppStore(IODescriptorBase):
         fh.close()
 
         # unzip core zip file to app target location
-        log.debug("Unpacking %s bytes to %s..." % (os.path.getsize(zip_tmp), target))
-        unzip_file(zip_tmp, target)
+        log.debug("Unpacking %s bytes to %s..." % (os.path.getsize(zip_tmp), destination_path))
+        unzip_file(zip_tmp, destination_path)
 
         # remove zip file
         filesystem.safe_delete_file(zip_tmp)
@@ -594,74 +594,83 @@ class IODescriptorAppStore(IODescriptorBase):
         # and shotgun sites.
         sg_url = self._sg_connection.base_url
 
-        if sg_url not in self._app_store_connections:
+        if not hasattr(self._app_store_connections, "by_site"):
+            self._app_store_connections.by_site = {}
+        connections = self._app_store_connections.by_site
 
-            # Connect to associated Shotgun site and retrieve the credentials to use to
-            # connect to the app store site
-            try:
-                (script_name, script_key) = self.__get_app_store_key_from_shotgun()
-            except urllib2.HTTPError, e:
-                if e.code == 403:
-                    # edge case alert!
-                    # this is likely because our session token in shotgun has expired.
-                    # The authentication system is based around wrapping the shotgun API,
-                    # and requesting authentication if needed. Because the app store
-                    # credentials is a separate endpoint and doesn't go via the shotgun
-                    # API, we have to explicitly check.
-                    #
-                    # trigger a refresh of our session token by issuing a shotgun API call
-                    self._sg_connection.find_one("HumanUser", [])
-                    # and retry
-                    (script_name, script_key) = self.__get_app_store_key_from_shotgun()
-                else:
-                    raise
-
-            # Connect to the app store and resolve the script user id we are connecting with.
-            # Set the timeout explicitly so we ensure the connection won't hang in cases where
-            # a response is not returned in a reasonable amount of time.
-            app_store_sg = shotgun_api3.Shotgun(
-                constants.SGTK_APP_STORE,
-                script_name=script_name,
-                api_key=script_key,
-                http_proxy=self.__get_app_store_proxy_setting(),
-                connect=False
-            )
-            # set the default timeout for app store connections
-            app_store_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
+        if sg_url not in connections:
 
-            # determine the script user running currently
-            # get the API script user ID from shotgun
+            self._app_store_connections_lock.acquire()
             try:
-                script_user = app_store_sg.find_one(
-                    "ApiUser",
-                    filters=[["firstname", "is", script_name]],
-                    fields=["type", "id"]
-                )
-            # Connection errors can occur for a variety of reasons. For example, there is no
-            # internet access or there is a proxy server blocking access to the Toolkit app store.
-            except (httplib2.HttpLib2Error, httplib2.socks.HTTPError, httplib.HTTPException), e:
-                raise TankAppStoreConnectionError(e)
-            # In cases where there is a firewall/proxy blocking access to the app store, sometimes
-            # the firewall will drop the connection instead of rejecting it. The API request will
-            # timeout which unfortunately results in a generic SSLError with only the message text
-            # to give us a clue why the request failed.
-            # The exception raised in this case is "ssl.SSLError: The read operation timed out"
-            except httplib2.ssl.SSLError, e:
-                if "timed" in e.message:
-                    raise TankAppStoreConnectionError(
-                        "Connection to %s timed out: %s" % (app_store_sg.config.server, e)
-                    )
-            except Exception:
-                raise TankAppStoreError(e)
 
-            if script_user is None:
-                raise TankAppStoreError(
-                    "Could not evaluate the current App Store User! Please contact support."
+                # Connect to associated Shotgun site and retrieve the credentials to use to
+                # connect to the app store site
+                try:
+                    (script_name, script_key) = self.__get_app_store_key_from_shotgun()
+                except urllib2.HTTPError, e:
+                    if e.code == 403:
+                        # edge case alert!
+                        # this is likely because our session token in shotgun has expired.
+                        # The authentication system is based around wrapping the shotgun API,
+                        # and requesting authentication if needed. Because the app store
+                        # credentials is a separate endpoint and doesn't go via the shotgun
+                        # API, we have to explicitly check.
+                        #
+                        # trigger a refresh of our session token by issuing a shotgun API call
+                        self._sg_connection.find_one("HumanUser", [])
+                        # and retry
+                        (script_name, script_key) = self.__get_app_store_key_from_shotgun()
+                    else:
+                        raise
+
+                # Connect to the app store and resolve the script user id we are connecting with.
+                # Set the timeout explicitly so we ensure the connection won't hang in cases where
+                # a response is not returned in a reasonable amount of time.
+                app_store_sg = shotgun_api3.Shotgun(
+                    constants.SGTK_APP_STORE,
+                    script_name=script_name,
+                    api_key=script_key,
+                    http_proxy=self.__get_app_store_proxy_setting(),
+                    connect=False
                 )
+                # set the default timeout for app store connections
+                app_store_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
+
+                # determine the script user running currently
+                # get the API script user ID from shotgun
+                try:
+                    script_user = app_store_sg.find_one(
+                        "ApiUser",
+                        filters=[["firstname", "is", script_name]],
+                        fields=["type", "id"]
+                    )
+                # Connection errors can occur for a variety of reasons. For example, there is no
+                # internet access or there is a proxy server blocking access to the Toolkit app store.
+                except (httplib2.HttpLib2Error, httplib2.socks.HTTPError, httplib.HTTPException), e:
+                    raise TankAppStoreConnectionError(e)
+                # In cases where there is a firewall/proxy blocking access to the app store, sometimes
+                # the firewall will drop the connection instead of rejecting it. The API request will
+                # timeout which unfortunately results in a generic SSLError with only the message text
+                # to give us a clue why the request failed.
+                # The exception raised in this case is "ssl.SSLError: The read operation timed out"
+                except httplib2.ssl.SSLError, e:
+                    if "timed" in e.message:
+                        raise TankAppStoreConnectionError(
+                            "Connection to %s timed out: %s" % (app_store_sg.config.server, e)
+                        )
+                except Exception:
+                    raise TankAppStoreError(e)
+
+                if script_user is None:
+                    raise TankAppStoreError(
+                        "Could not evaluate the current App Store User! Please contact support."
+                    )
 
-            self._app_store_connections[sg_url] = (app_store_sg, script_user)
+                connections[sg_url] = (app_store_sg, script_user)
+            finally:
+                self._app_store_connections_lock.release()
 
-        return self._app_store_connections[sg_url]
+        return connections[sg_url]
 
     def __get_app_store_proxy_setting(self):
         """
@@ -12,6 +12,8 @@ import os
 import re
 import cgi
 import sys
+import uuid
+import shutil
 import urlparse
 
 from .. import constants
@@ -505,6 +507,73 @@ class IODescriptorBase(object):
             log.debug("Downloading %s to the local Toolkit install location..." % self)
             self.download_local()
 
+    def download_local(self):
+        """
+        Retrieves this version to local repo.
+        Will exit early if app already exists local.
+
+        The item is downloaded into a temporary folder next to its location
+        in the primary bundle cache, which is then renamed into place. This
+        way, processes looking at or downloading the same item concurrently
+        never see a partially downloaded item.
+        """
+        if self.exists_local():
+            # nothing to do!
+            return
+
+        # cache into the primary location
+        target = self._get_cache_paths()[0]
+        parent_folder = os.path.dirname(target)
+        filesystem.ensure_folder_exists(parent_folder)
+
+        # keep the temporary name short, bundle cache paths
+        # can get close to MAX_PATH on windows.
+        temp_target = os.path.join(
+            parent_folder,
+            "%s.%s.tmp" % (os.path.basename(target), uuid.uuid4().hex[:8])
+        )
+
+        try:
+            self._download_local(temp_target)
+            self._move_into_place(temp_target, target)
+        finally:
+            if os.path.exists(temp_target):
+                shutil.rmtree(temp_target, ignore_errors=True)
+
+    def _move_into_place(self, source, target):
+        """
+        Renames a downloaded item into its location in the bundle cache.
+
+        If another process has completed the same download in the meantime,
+        its copy is kept and the given one is left in place to be cleaned up.
+        Leftovers of incomplete downloads made by older versions of Toolkit,
+        e.g. a folder without a manifest, are replaced.
+
+        :param source: Path to the downloaded item.
+        :param target: Path to the item in the bundle cache.
+        """
+        try:
+            os.rename(source, target)
+            return
+        except OSError, e:
+            if self.exists_local():
+                log.debug("%s was downloaded concurrently, discarding %s." % (self, source))
+                return
+            if not os.path.exists(target):
+                raise TankDescriptorError(
+                    "Could not move %s into the bundle cache at %s: %s" % (self, target, e)
+                )
+
+        log.debug("Replacing incomplete bundle cache content %s for %s..." % (target, self))
+        shutil.rmtree(target, ignore_errors=True)
+        try:
+            os.rename(source, target)
+        except OSError, e:
+            if not self.exists_local():
+                raise TankDescriptorError(
+                    "Could not move %s into the bundle cache at %s: %s" % (self, target, e)
+                )
+
     def exists_local(self):
         """
         Returns true if this item exists in a locally accessible form
@@ -552,9 +621,14 @@ class IODescriptorBase(object):
         """
         raise NotImplementedError
 
-    def download_local(self):
+    def _download_local(self, destination_path):
         """
-        Retrieves this version to local repo.
+        Retrieves this version into the given folder. Called by
+        :meth:`download_local`, which takes care of moving the
+        downloaded content into the bundle cache.
+
+        :param destination_path: Folder to download the item into.
+                                 The folder doesn't exist yet.
         """
         raise NotImplementedError
 
@@ -7,9 +7,17 @@
 # By accessing, using, copying or modifying this work you indicate your 
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights 
 # not expressly granted therein are reserved by Shotgun Software Inc.
+from __future__ import with_statement
+
 import os
+import uuid
+import shutil
+import hashlib
+import threading
 
-from ...util.git import execute_git_command
+from ...util.git import execute_git_command, TankGitError
+from ...util.process import subprocess_check_output
+from ...util import filesystem
 from .base import IODescriptorBase
 from ... import LogManager
 
@@ -25,6 +33,14 @@ class IODescriptorGit(IODescriptorBase):
     parameter).
     """
 
+    # locks making sure each mirror is created and fetched by one
+    # thread at a time, keyed by mirror path.
+    _mirror_locks = {}
+    _mirror_locks_lock = threading.Lock()
+
+    # mirrors which have been fetched from their repository by this process
+    _fetched_mirrors = set()
+
     def __init__(self, descriptor_dict):
         """
         Constructor
@@ -43,17 +59,138 @@ class IODescriptorGit(IODescriptorBase):
         # Note: the git command always uses forward slashes
         self._sanitized_repo_path = self._path.replace(os.path.sep, "/")
 
-    def _clone_repo(self, target_path):
+    def _get_mirror_path(self):
+        """
+        Returns the path to the local mirror of the repository.
+
+        Mirrors are bare repositories stored in the primary bundle cache, keyed
+        by repository url, from which tags are listed and versions retrieved
+        without cloning the repository again.
+
+        :returns: Path to the mirror, which may not exist yet.
+        """
+        # the name alone is not enough, forks typically share it.
+        url_hash = hashlib.sha1(self._sanitized_repo_path).hexdigest()[:8]
+        return os.path.join(
+            self._bundle_cache_root,
+            "git_mirrors",
+            "%s.%s" % (os.path.basename(self._path), url_hash)
+        )
+
+    def _get_mirror_lock(self, mirror_path):
+        """
+        Returns the lock to hold while creating or fetching the given mirror.
+
+        :param mirror_path: Path to the mirror.
+        :returns: Lock object.
+        """
+        with self._mirror_locks_lock:
+            return self._mirror_locks.setdefault(mirror_path, threading.Lock())
+
+    def _ensure_mirror(self, fetch=False):
+        """
+        Ensures the local mirror of the repository exists.
+
+        The mirror is created if needed, and fetched from the repository the
+        first time it is used by this process. Failing to fetch an existing
+        mirror is not an error, so that versions it already holds can still be
+        retrieved when the repository can't be reached.
+
+        :param fetch: Fetch the mirror even if it was already fetched by this process.
+        :returns: Path to the mirror.
+        :raises: TankGitError if the mirror could not be created.
+        """
+        mirror_path = self._get_mirror_path()
+
+        with self._get_mirror_lock(mirror_path):
+            if not os.path.exists(mirror_path):
+                self._create_mirror(mirror_path)
+
+            elif fetch or mirror_path not in self._fetched_mirrors:
+                log.debug("Fetching %r into mirror %s" % (self, mirror_path))
+                try:
+                    execute_git_command("fetch -q --prune origin", cwd=mirror_path)
+                except TankGitError, e:
+                    log.warning("Could not update the local mirror of %s: %s" % (self._path, e))
+
+            self._fetched_mirrors.add(mirror_path)
+
+        return mirror_path
+
+    def _create_mirror(self, mirror_path):
+        """
+        Creates the local mirror of the repository.
+
+        The mirror is cloned next to its location and then renamed into place,
+        so that other processes never use a partially cloned mirror.
+
+        :param mirror_path: Path to the mirror.
+        :raises: TankGitError if the clone command fails
+        """
+        filesystem.ensure_folder_exists(os.path.dirname(mirror_path))
+        temp_path = "%s.%s.tmp" % (mirror_path, uuid.uuid4().hex[:8])
+        try:
+            log.debug("Git mirroring %r into %s" % (self, mirror_path))
+            execute_git_command(
+                "clone -q --mirror \"%s\" \"%s\"" % (self._sanitized_repo_path, temp_path)
+            )
+            try:
+                os.rename(temp_path, mirror_path)
+            except OSError:
+                if not os.path.exists(mirror_path):
+                    raise
+                log.debug("%s was mirrored concurrently, discarding %s." % (self, temp_path))
+        finally:
+            if os.path.exists(temp_path):
+                shutil.rmtree(temp_path, ignore_errors=True)
+
+    def _get_mirror_with(self, ref):
+        """
+        Ensures the local mirror of the repository exists and holds the given
+        commit, fetching it again if the commit can't be found.
+
+        :param ref: Tag, branch or commit hash.
+        :returns: Path to the mirror.
+        """
+        mirror_path = self._ensure_mirror()
+        try:
+            subprocess_check_output(
+                "git rev-parse -q --verify \"%s^{commit}\"" % ref,
+                shell=True,
+                cwd=mirror_path
+            )
+        except Exception:
+            # created after the mirror was last fetched
+            mirror_path = self._ensure_mirror(fetch=True)
+        return mirror_path
+
+    def _clone_repo(self, target_path, ref=None):
         """
         Clone the repo into the target path
 
+        The clone is made from the local mirror of the repository, and its
+        origin then set to the repository itself.
+
         :param target_path: The target path to clone the repo to
+        :param ref: Tag, branch or commit the clone is going to be set to,
+                    making sure the mirror holds it.
         :raises:            TankError if the clone command fails
         """
+        if ref:
+            mirror_path = self._get_mirror_with(ref)
+        else:
+            mirror_path = self._ensure_mirror()
+
         # Note: git doesn't like paths in single quotes when running on
         # windows - it also prefers to use forward slashes!
         log.debug("Git Cloning %r into %s" % (self, target_path))
-        execute_git_command("clone -q \"%s\" \"%s\"" % (self._sanitized_repo_path, target_path))
+        execute_git_command(
+            "clone -q \"%s\" \"%s\"" % (mirror_path.replace(os.path.sep, "/"), target_path)
+        )
+        execute_git_command(
+            "remote set-url origin \"%s\"" % self._sanitized_repo_path,
+            cwd=target_path
+        )
 
     def get_system_name(self):
         """
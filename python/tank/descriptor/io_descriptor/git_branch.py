@@ -111,17 +111,11 @@ class IODescriptorGitBranch(IODescriptorGit):
         filesystem.ensure_folder_exists(parent_folder)
 
         # now clone, set to branch and set to specific commit
-        cwd = os.getcwd()
-        try:
-            # clone the repo
-            self._clone_repo(target_path)
-            os.chdir(target_path)
-            log.debug("Switching to branch %s..." % self._branch)
-            execute_git_command("checkout -q %s" % self._branch)
-            log.debug("Setting commit to %s..." % self._version)
-            execute_git_command("reset --hard -q %s" % self._version)
-        finally:
-            os.chdir(cwd)
+        self._clone_repo(target_path, self._version)
+        log.debug("Switching to branch %s..." % self._branch)
+        execute_git_command("checkout -q %s" % self._branch, cwd=target_path)
+        log.debug("Setting commit to %s..." % self._version)
+        execute_git_command("reset --hard -q %s" % self._version, cwd=target_path)
 
     def get_version(self):
         """
@@ -130,18 +124,13 @@ class IODescriptorGitBranch(IODescriptorGit):
         """
         return self._version
 
-    def download_local(self):
-        """
-        Retrieves this version to local repo.
-        Will exit early if app already exists local.
+    def _download_local(self, destination_path):
         """
-        if self.exists_local():
-            # nothing to do!
-            return
+        Retrieves this version into the given folder.
 
-        # cache into the primary location
-        target = self._get_cache_paths()[0]
-        self._clone_into(target)
+        :param destination_path: Folder to download the item into.
+        """
+        self._clone_into(destination_path)
 
     def copy(self, target_path, connected=False):
         """
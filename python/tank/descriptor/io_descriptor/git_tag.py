@@ -124,28 +124,16 @@ class IODescriptorGitTag(IODescriptorGit):
 
         :returns: IODescriptorGitTag object
         """
-        # now first clone the repo into a tmp location
-        clone_tmp = os.path.join(tempfile.gettempdir(), "%s_tank_clone" % uuid.uuid4().hex)
-        filesystem.ensure_folder_exists(clone_tmp)
-
-        # get the most recent tag hash
-        cwd = os.getcwd()
+        # list the tags of the repository from its local mirror
+        mirror_path = self._ensure_mirror(fetch=True)
         try:
-            # clone the repo
-            self._clone_repo(clone_tmp)
-            os.chdir(clone_tmp)
-
-            try:
-                # get list of tags from git
-                git_tags = subprocess_check_output(
-                    "git tag",
-                    shell=True
-                ).split("\n")
-            except Exception, e:
-                raise TankDescriptorError("Could not get list of tags for %s: %s" % (self, e))
-
-        finally:
-            os.chdir(cwd)
+            git_tags = subprocess_check_output(
+                "git tag",
+                shell=True,
+                cwd=mirror_path
+            ).split("\n")
+        except Exception, e:
+            raise TankDescriptorError("Could not get list of tags for %s: %s" % (self, e))
 
         if len(git_tags) == 0:
             raise TankDescriptorError(
@@ -168,35 +156,25 @@ class IODescriptorGitTag(IODescriptorGit):
 
         :returns: IODescriptorGitTag object
         """
-        # now first clone the repo into a tmp location
-        clone_tmp = os.path.join(tempfile.gettempdir(), "%s_tank_clone" % uuid.uuid4().hex)
-        filesystem.ensure_folder_exists(clone_tmp)
+        # get the most recent tag hash from the local mirror of the repository
+        mirror_path = self._ensure_mirror(fetch=True)
+        try:
+            git_hash = subprocess_check_output(
+                "git rev-list --tags --max-count=1",
+                shell=True,
+                cwd=mirror_path
+            ).strip()
+        except Exception, e:
+            raise TankDescriptorError("Could not get list of tags for %s: %s" % (self, e))
 
-        # get the most recent tag hash
-        cwd = os.getcwd()
         try:
-            # clone the repo
-            self._clone_repo(clone_tmp)
-            os.chdir(clone_tmp)
-
-            try:
-                git_hash = subprocess_check_output(
-                    "git rev-list --tags --max-count=1",
-                    shell=True
-                ).strip()
-            except Exception, e:
-                raise TankDescriptorError("Could not get list of tags for %s: %s" % (self, e))
-
-            try:
-                latest_version = subprocess_check_output(
-                    "git describe --tags %s" % git_hash,
-                    shell=True
-                ).strip()
-            except Exception, e:
-                raise TankDescriptorError("Could not get tag for hash %s: %s" % (hash, e))
-
-        finally:
-            os.chdir(cwd)
+            latest_version = subprocess_check_output(
+                "git describe --tags %s" % git_hash,
+                shell=True,
+                cwd=mirror_path
+            ).strip()
+        except Exception, e:
+            raise TankDescriptorError("Could not get tag for hash %s: %s" % (git_hash, e))
 
         new_loc_dict = copy.deepcopy(self._descriptor_dict)
         new_loc_dict["version"] = latest_version
@@ -212,44 +190,28 @@ class IODescriptorGitTag(IODescriptorGit):
         """
         return self._version
 
-    def download_local(self):
+    def _download_local(self, destination_path):
         """
-        Retrieves this version to local repo.
-        Will exit early if app already exists local.
-        """
-        if self.exists_local():
-            # nothing to do!
-            return
-
-        # cache into the primary location
-        target = self._get_cache_paths()[0]
+        Retrieves this version into the given folder.
 
-        # clone into temp location and extract tag
-        filesystem.ensure_folder_exists(target)
+        :param destination_path: Folder to download the item into.
+        """
 
-        # now first clone the repo into a tmp location
-        # then zip up the tag we are looking for
-        # finally, move that zip file into the target location
+        # archive the tag we are looking for from the local
+        # mirror of the repository into a temp zip file
+        filesystem.ensure_folder_exists(destination_path)
         zip_tmp = os.path.join(tempfile.gettempdir(), "%s_tank.zip" % uuid.uuid4().hex)
-        clone_tmp = os.path.join(tempfile.gettempdir(), "%s_tank_clone" % uuid.uuid4().hex)
-        filesystem.ensure_folder_exists(clone_tmp)
+        mirror_path = self._get_mirror_with(self._version)
 
-        # now clone and archive
-        cwd = os.getcwd()
-        try:
-            # clone the repo
-            self._clone_repo(clone_tmp)
-            os.chdir(clone_tmp)
-            log.debug("Extracting tag %s..." % self._version)
-            execute_git_command(
-                "archive --format zip --output %s %s" % (zip_tmp, self._version)
-            )
-        finally:
-            os.chdir(cwd)
+        log.debug("Extracting tag %s..." % self._version)
+        execute_git_command(
+            "archive --format zip --output \"%s\" %s" % (zip_tmp, self._version),
+            cwd=mirror_path
+        )
 
         # unzip core zip file to app target location
-        log.debug("Unpacking %s bytes to %s..." % (os.path.getsize(zip_tmp), target))
-        unzip_file(zip_tmp, target)
+        log.debug("Unpacking %s bytes to %s..." % (os.path.getsize(zip_tmp), destination_path))
+        unzip_file(zip_tmp, destination_path)
 
         # clear temp file
         filesystem.safe_delete_file(zip_tmp)
@@ -271,15 +233,8 @@ class IODescriptorGitTag(IODescriptorGit):
             # git repos are cloned into place to retain their
             # repository status
             log.debug("Copying %r -> %s" % (self, target_path))
-            # now clone and archive
-            cwd = os.getcwd()
-            try:
-                # clone the repo
-                self._clone_repo(target_path)
-                os.chdir(target_path)
-                execute_git_command("checkout %s -q" % self._version)
-            finally:
-                os.chdir(cwd)
+            self._clone_repo(target_path, self._version)
+            execute_git_command("checkout %s -q" % self._version, cwd=target_path)
         else:
             super(IODescriptorGitTag, self).copy(target_path, connected)
 
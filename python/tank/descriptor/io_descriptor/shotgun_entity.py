@@ -118,18 +118,13 @@ class IODescriptorShotgunEntity(IODescriptorBase):
         """
         return "v%s" % self._version
 
-    def download_local(self):
+    def _download_local(self, destination_path):
         """
-        Retrieves this version to local repo.
-        Will exit early if app already exists local.
-        """
-        if self.exists_local():
-            # nothing to do!
-            return
+        Retrieves this version into the given folder.
 
-        # cache into the primary location
-        target = self._get_cache_paths()[0]
-        filesystem.ensure_folder_exists(target)
+        :param destination_path: Folder to download the item into.
+        """
+        filesystem.ensure_folder_exists(destination_path)
 
         # and now for the download.
         # @todo: progress feedback here - when the SG api supports it!
@@ -148,8 +143,8 @@ class IODescriptorShotgunEntity(IODescriptorBase):
         fh.close()
 
         # unzip core zip file to app target location
-        log.debug("Unpacking %s bytes to %s..." % (os.path.getsize(zip_tmp), target))
-        unzip_file(zip_tmp, target)
+        log.debug("Unpacking %s bytes to %s..." % (os.path.getsize(zip_tmp), destination_path))
+        unzip_file(zip_tmp, destination_path)
 
         # clear temp file
         filesystem.safe_delete_file(zip_tmp)
@@ -11,17 +11,39 @@
 """
 Handles the creation of a configuration object structure based on the folder configuration on disk.
 
+Scanning the folder configuration on disk is expensive, so the result of the scan is compiled into
+a plain data structure which is cached in memory and written to the root of the pipeline
+configuration. The compiled schema is reused for as long as none of the folders and files it was
+compiled from have been modified.
 """
 
+from __future__ import with_statement
+
 import os
+import sys
+import uuid
 import fnmatch
+import cPickle
+import threading
 
 from .folder_types import Static, ListField, Entity, Project, UserWorkspace, ShotgunStep, ShotgunTask
 
 from ..errors import TankError, TankUnreadableFileError
 from . import constants
+from .. import constants as core_constants
+from .. import LogManager
 from ..util import yaml_cache
 
+log = LogManager.get_logger(__name__)
+
+# version of the compiled schema format. Compiled schemas written with a
+# different version are ignored and replaced.
+COMPILED_SCHEMA_FORMAT_VERSION = 1
+
+# compiled schemas for this process, keyed by schema location
+_compiled_schemas = {}
+_compiled_schemas_lock = threading.Lock()
+
 
 def read_ignore_files(schema_config_path):
     """
@@ -44,6 +66,106 @@ def read_ignore_files(schema_config_path):
             open_file.close()
     return ignore_files
 
+def _get_file_state(path):
+    """
+    Returns a value which changes whenever a file or folder is modified.
+
+    :param path: Path to a file or folder.
+    :returns: Tuple of inode number, size and modification time or None
+              if the path doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime)
+
+
+def _is_compiled_schema_valid(compiled_schema, schema_config_path):
+    """
+    Checks that a compiled schema is up to date with the folder configuration on disk.
+
+    Folders are modified whenever items are added, removed or renamed in them, so
+    checking the state of all the folders and files the schema was compiled from
+    is enough to detect any change.
+
+    :param compiled_schema: Compiled schema dictionary.
+    :param schema_config_path: Location of the folder configuration.
+    :returns: True if the compiled schema can be used, False otherwise.
+    """
+    if compiled_schema.get("schema_config_path") != schema_config_path:
+        return False
+
+    for (path, state) in compiled_schema["fingerprint"]:
+        if _get_file_state(path) != state:
+            return False
+
+    return True
+
+
+def _read_compiled_schema(compiled_schema_path):
+    """
+    Reads a compiled schema file. Missing, corrupt or outdated files are ignored.
+
+    :param compiled_schema_path: Path to the compiled schema file.
+    :returns: Compiled schema dictionary or None.
+    """
+    try:
+        fh = open(compiled_schema_path, "rb")
+    except IOError:
+        # not compiled yet
+        return None
+
+    try:
+        try:
+            (version, compiled_schema) = cPickle.load(fh)
+        except Exception, e:
+            log.debug("Ignoring compiled folder schema %s: %s" % (compiled_schema_path, e))
+            return None
+    finally:
+        fh.close()
+
+    if version != COMPILED_SCHEMA_FORMAT_VERSION:
+        log.debug("Ignoring compiled folder schema %s: unsupported format" % compiled_schema_path)
+        return None
+
+    return compiled_schema
+
+
+def _write_compiled_schema(compiled_schema_path, compiled_schema):
+    """
+    Writes a compiled schema file. Errors are logged and otherwise ignored,
+    the pipeline configuration may not be writable by all users.
+
+    :param compiled_schema_path: Path to the compiled schema file.
+    :param compiled_schema: Compiled schema dictionary.
+    """
+    temp_path = "%s.%s.tmp" % (compiled_schema_path, uuid.uuid4().hex)
+    try:
+        try:
+            fh = open(temp_path, "wb")
+            try:
+                cPickle.dump(
+                    (COMPILED_SCHEMA_FORMAT_VERSION, compiled_schema),
+                    fh,
+                    cPickle.HIGHEST_PROTOCOL
+                )
+            finally:
+                fh.close()
+
+            if sys.platform == "win32" and os.path.exists(compiled_schema_path):
+                # files can't be renamed over existing ones on Windows
+                os.remove(compiled_schema_path)
+            os.rename(temp_path, compiled_schema_path)
+
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    except Exception, e:
+        log.debug("Could not write compiled folder schema %s: %s" % (compiled_schema_path, e))
+
+
 class FolderConfiguration(object):
     """
     Class that loads the schema from disk and constructs folder objects.
@@ -61,11 +183,13 @@ class FolderConfiguration(object):
         # maintain a list of all Step nodes for special introspection
         self._step_fields = []
         
-        # read skip files config
-        self._ignore_files = read_ignore_files(schema_config_path)
+        # paths and states of all the folders and files read while compiling the schema
+        self._fingerprint = []
         
         # load schema
-        self._load_schema(schema_config_path)
+        compiled_schema = self._get_compiled_schema(schema_config_path)
+        self._ignore_files = compiled_schema["ignore_files"]
+        self._load_schema(compiled_schema)
 
 
     ##########################################################################################
@@ -165,6 +289,7 @@ class FolderConfiguration(object):
                 metadata = yaml_cache.g_yaml_cache.get(full_path, deepcopy_data=False)
             except Exception, error:
                 raise TankError("Cannot load config file '%s'. Error: %s" % (full_path, error))
+            self._fingerprint.append((full_path, _get_file_state(full_path)))
 
             if "target" not in metadata:
                 raise TankError("Did not find required 'target' parameter in "
@@ -196,27 +321,118 @@ class FolderConfiguration(object):
             pass
         except Exception, error:
             raise TankError("Cannot load config file '%s'. Error: %s" % (yml_file, error))
+        else:
+            self._fingerprint.append((yml_file, _get_file_state(yml_file)))
 
         return metadata
 
     ##########################################################################################
     # internal stuff
 
+    def _get_compiled_schema(self, schema_config_path):
+        """
+        Returns the compiled schema for a folder configuration, from memory or
+        from the compiled schema file if they are up to date. Otherwise, the folder
+        configuration is scanned and the compiled schema is cached again.
 
-    def _load_schema(self, schema_config_path):
+        :param schema_config_path: Location of the folder configuration.
+        :returns: Compiled schema dictionary.
         """
-        Scan the config and build objects structure
+        with _compiled_schemas_lock:
+            compiled_schema = _compiled_schemas.get(schema_config_path)
+        if compiled_schema and _is_compiled_schema_valid(compiled_schema, schema_config_path):
+            return compiled_schema
+
+        compiled_schema_path = os.path.join(
+            self._tk.pipeline_configuration.get_path(),
+            core_constants.COMPILED_FOLDER_SCHEMA_FILE
+        )
+        compiled_schema = _read_compiled_schema(compiled_schema_path)
+        if compiled_schema and _is_compiled_schema_valid(compiled_schema, schema_config_path):
+            log.debug("Using compiled folder schema %s" % compiled_schema_path)
+        else:
+            compiled_schema = self._compile_schema(schema_config_path)
+            _write_compiled_schema(compiled_schema_path, compiled_schema)
+
+        with _compiled_schemas_lock:
+            _compiled_schemas[schema_config_path] = compiled_schema
+        return compiled_schema
+
+    def _compile_schema(self, schema_config_path):
         """
+        Scans the folder configuration on disk.
+
+        The compiled schema is a dictionary with the following keys:
 
-        project_folders = self._get_sub_directories(schema_config_path)
+        - schema_config_path: Location of the folder configuration.
+        - ignore_files: List of patterns of files to ignore.
+        - projects: List of nodes for the project folders.
+        - fingerprint: List of (path, state) for all the folders and files read.
+
+        :param schema_config_path: Location of the folder configuration.
+        :returns: Compiled schema dictionary.
+        """
+        self._fingerprint = []
+
+        # read skip files config
+        self._ignore_files = read_ignore_files(schema_config_path)
+        ignore_files_path = os.path.join(schema_config_path, "ignore_files")
+        self._fingerprint.append((ignore_files_path, _get_file_state(ignore_files_path)))
+
+        projects = [
+            self._compile_node_r(project_folder)
+            for project_folder in self._compile_sub_directories(schema_config_path)
+        ]
+
+        return {
+            "schema_config_path": schema_config_path,
+            "ignore_files": self._ignore_files,
+            "projects": projects,
+            "fingerprint": self._fingerprint,
+        }
+
+    def _compile_sub_directories(self, parent_path):
+        """
+        Returns all the directories for a given path, recording the state
+        of the given path.
+        """
+        self._fingerprint.append((parent_path, _get_file_state(parent_path)))
+        return self._get_sub_directories(parent_path)
+
+    def _compile_node_r(self, full_path):
+        """
+        Recursively scans the file system and constructs a compiled node
+        for a folder and all its children.
+
+        :param full_path: Path to the folder.
+        :returns: Dictionary with keys path, metadata (None for folders without
+                  metadata), children, symlinks and files.
+        """
+        return {
+            "path": full_path,
+            "metadata": self._read_metadata(full_path),
+            "children": [
+                self._compile_node_r(child_path)
+                for child_path in self._compile_sub_directories(full_path)
+            ],
+            "symlinks": self._get_symlinks_in_folder(full_path),
+            "files": self._get_files_in_folder(full_path),
+        }
+
+    def _load_schema(self, compiled_schema):
+        """
+        Build objects structure from the compiled config
+        """
 
         # make some space in our obj/entity type mapping
         self._entity_nodes_by_type["Project"] = []
 
-        for project_folder in project_folders:
+        for project_node in compiled_schema["projects"]:
+
+            project_folder = project_node["path"]
 
             # read metadata to determine root path
-            metadata = self._read_metadata(project_folder)
+            metadata = project_node["metadata"]
 
             if metadata is None:
                 if os.path.basename(project_folder) == "project":
@@ -235,19 +451,20 @@ class FolderConfiguration(object):
             self._entity_nodes_by_type["Project"].append(project_obj)
 
             # recursively process the rest
-            self._process_config_r(project_obj, project_folder)
+            self._process_config_r(project_obj, project_node)
 
 
-    def _process_config_r(self, parent_node, parent_path):
+    def _process_config_r(self, parent_node, parent_compiled_node):
         """
-        Recursively scan the file system and construct an object
+        Recursively walk the compiled config and construct an object
         hierarchy.
 
         Factory method for Folder objects.
         """
-        for full_path in self._get_sub_directories(parent_path):
+        for compiled_node in parent_compiled_node["children"]:
+            full_path = compiled_node["path"]
             # check for metadata (non-static folder)
-            metadata = self._read_metadata(full_path)
+            metadata = compiled_node["metadata"]
             if metadata:
                 node_type = metadata.get("type", "undefined")
 
@@ -286,25 +503,13 @@ class FolderConfiguration(object):
                 cur_node = Static.create(self._tk, parent_node, full_path, {"type": "static"})
 
             # and process children
-            self._process_config_r(cur_node, full_path)
+            self._process_config_r(cur_node, compiled_node)
 
         # process symlinks
-        for (path, target, metadata) in self._get_symlinks_in_folder(parent_path):
+        for (path, target, metadata) in parent_compiled_node["symlinks"]:
             parent_node.add_symlink(path, target, metadata)
         
 
         # now process all files and add them to the parent_node token
-        for f in self._get_files_in_folder(parent_path):
+        for f in parent_compiled_node["files"]:
             parent_node.add_file(f)
-
-
-
-
-
-
-
-
-
-
-
-
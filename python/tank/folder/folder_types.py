@@ -71,13 +71,50 @@ class Folder(object):
         Extract data from shotgun for a specific pathway upwards through the
         schema. 
         
+        For more information, see the Entity implementation of
+        extract_shotgun_data_upwards_batch().
+        
+        :raises: EntityLinkTypeMismatch if the seed data does not satisfy the
+                 link path from this folder up to the root.
+        """
+        tokens = self.extract_shotgun_data_upwards_batch(sg, [shotgun_data])[0]
+        if tokens is None:
+            raise EntityLinkTypeMismatch()
+        return tokens
+    
+    def extract_shotgun_data_upwards_batch(self, sg, shotgun_data_items):
+        """
+        Extract data from shotgun for a specific pathway upwards through the
+        schema, for several seeds at once.
+        
         This is subclassed by deriving classes which process Shotgun data.
         For more information, see the Entity implementation.
+        
+        :param sg: Shotgun API instance
+        :param shotgun_data_items: List of seed dictionaries.
+        :returns: List of extracted data dictionaries, in the same order as the seeds.
+                  Seeds which don't satisfy the link path from this folder up to the
+                  root are returned as None.
         """
         if self._parent is None:
-            return shotgun_data
+            return list(shotgun_data_items)
         else:
-            return self._parent.extract_shotgun_data_upwards(sg, shotgun_data)
+            return self._parent.extract_shotgun_data_upwards_batch(sg, shotgun_data_items)
+    
+    def prefetch_shotgun_data(self, sg, shotgun_data_items):
+        """
+        Retrieves the Shotgun data needed to create this folder for all the given
+        data dictionaries at once, so that folders can then be created one data
+        dictionary at a time without querying Shotgun again.
+        
+        This is subclassed by deriving classes which process Shotgun data.
+        For more information, see the Entity implementation.
+        
+        :param sg: Shotgun API instance
+        :param shotgun_data_items: List of data dictionaries, as returned by
+                                   extract_shotgun_data_upwards_batch()
+        """
+        pass
             
     def get_parents(self):
         """
@@ -1005,6 +1042,10 @@ class Entity(Folder):
         self._entity_expression = shotgun_entity.EntityExpression(self._tk, self._entity_type, field_name_expression)
         self._filters = filters
         self._create_with_parent = create_with_parent    
+        
+        # entities retrieved from shotgun, keyed by query. Folder objects only
+        # live for the duration of a folder creation run.
+        self._entities_cache = {}
     
     def __get_name_field_for_et(self, entity_type):
         """
@@ -1091,6 +1132,69 @@ class Entity(Folder):
             entity_link = entity[lf]
             io_receiver.register_secondary_entity(path, entity_link, self._config_metadata)
 
+    def prefetch_shotgun_data(self, sg, shotgun_data_items):
+        """
+        Retrieves the entities needed to create this folder for all the given data
+        dictionaries at once.
+        
+        Data dictionaries constraining this folder to a single entity are grouped
+        by their remaining filters and a single query with an "id in" constraint
+        is issued for each group. The results are stored so that the folder creation
+        of each individual data dictionary is served from memory.
+        
+        :param sg: Shotgun API instance
+        :param shotgun_data_items: List of data dictionaries, as returned by
+                                   extract_shotgun_data_upwards_batch()
+        """
+        my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
+        fields_list = self.__get_fields()
+        
+        # group the entity ids by query
+        queries = {}
+        for sg_data in shotgun_data_items:
+            if my_sg_data_key not in sg_data:
+                continue
+            try:
+                resolved_filters = _resolve_shotgun_filters(self._filters, sg_data)
+            except TankError:
+                # some of the data needed is only available once the folders above
+                # have been created, leave it to the folder creation.
+                continue
+            query_key = _get_filters_cache_key(resolved_filters)
+            if query_key not in queries:
+                queries[query_key] = (resolved_filters, set())
+            queries[query_key][1].add(sg_data[my_sg_data_key]["id"])
+        
+        for (resolved_filters, entity_ids) in queries.values():
+            entity_ids = sorted(entity_ids)
+            
+            bulk_filters = copy.deepcopy(resolved_filters)
+            bulk_filters["conditions"].append({ "path": "id", "relation": "in", "values": entity_ids })
+            entities = sg.find(self._entity_type, bulk_filters, fields_list)
+            
+            # store the results as if they had been retrieved one id at a time
+            for entity_id in entity_ids:
+                id_filters = copy.deepcopy(resolved_filters)
+                id_filters["conditions"].append({ "path": "id", "relation": "is", "values": [entity_id] })
+                self._entities_cache[_get_filters_cache_key(id_filters)] = [
+                    entity for entity in entities if entity["id"] == entity_id
+                ]
+    
+    def __get_fields(self):
+        """
+        Returns the list of fields to retrieve from shotgun for folder creation
+        """
+        fields = self._entity_expression.get_shotgun_fields()
+        
+        # add any shotgun link fields used in the expression
+        fields.update( self._entity_expression.get_shotgun_link_fields() )
+        
+        # always retrieve the name field for the entity
+        fields.add( self.__get_name_field_for_et(self._entity_type) )        
+        
+        # convert to a list - sets wont work with the SG API
+        return list(fields)
+    
     def __get_entities(self, sg_data):
         """
         Returns shotgun data for folder creation
@@ -1110,27 +1214,22 @@ class Entity(Folder):
             resolved_filters["conditions"].append({ "path": "id", "relation": "is", "values": [entity_id] })
             # get data - can be None depending on external filters
 
-        # figure out which fields to retrieve
-        fields = self._entity_expression.get_shotgun_fields()
+        # the same queries are typically issued for all the entities sharing 
+        # a parent, and the entities may have been prefetched already.
+        query_key = _get_filters_cache_key(resolved_filters)
+        if query_key not in self._entities_cache:
+            # now find all the items (e.g. shots) matching this query
+            self._entities_cache[query_key] = self._tk.shotgun.find(self._entity_type, 
+                                                                    resolved_filters, 
+                                                                    self.__get_fields())
         
-        # add any shotgun link fields used in the expression
-        fields.update( self._entity_expression.get_shotgun_link_fields() )
-        
-        # always retrieve the name field for the entity
-        fields.add( self.__get_name_field_for_et(self._entity_type) )        
-        
-        # convert to a list - sets wont work with the SG API
-        fields_list = list(fields)
-        
-        # now find all the items (e.g. shots) matching this query
-        entities = self._tk.shotgun.find(self._entity_type, resolved_filters, fields_list)
-        
-        return entities
+        return copy.deepcopy(self._entities_cache[query_key])
 
-    def extract_shotgun_data_upwards(self, sg, shotgun_data):
+    def extract_shotgun_data_upwards_batch(self, sg, shotgun_data_items):
         """
         Extracts the shotgun data necessary to create this object and all its parents.
-        The shotgun_data input needs to contain a dictionary with a "seed". For example:
+        Each item of the shotgun_data_items input needs to contain a dictionary with a 
+        "seed". For example:
         { "Shot": {"type": "Shot", "id": 1234 } }
         
         
@@ -1146,20 +1245,25 @@ class Entity(Folder):
         get all the fields that are represented by $tokens. These will form the 'seed' for
         when we recurse to the parent level and do the same thing there.
         
+        The data for all the items is retrieved with a single query per level, so 
+        resolving the data for a large number of seeds only takes a handful of queries.
         
-        The return data is on the form:
+        The return data is a list with one item per seed, on the form:
         {
             'Project':   {'id': 4, 'name': 'Demo Project', 'type': 'Project'},
             'Sequence':  {'code': 'Sequence1', 'id': 2, 'name': 'Sequence1', 'type': 'Sequence'},
             'Shot':      {'code': 'shot_010', 'id': 2, 'type': 'Shot'}
         }        
         
+        Items are None for seeds which do not satisfy the link path from this folder up 
+        to the root, see EntityLinkTypeMismatch.
+        
         NOTE! Because we are using a dictionary where we key by type, it would not be possible
         to have a pathway where the same entity type exists multiple times. For example an 
         asset / sub asset relationship.
         """
         
-        tokens = copy.deepcopy(shotgun_data)
+        all_tokens = [copy.deepcopy(shotgun_data) for shotgun_data in shotgun_data_items]
         
         # If we don't have an entry in tokens for the current entity type, then we can't
         # extract any tokens. Used by #17726. Typically, we start with a "seed", and then go
@@ -1171,11 +1275,12 @@ class Entity(Folder):
         # however, if we have a free-floating item in the hierarchy, this will not be 'seeded' 
         # by its children as we move upwards - for example a step.
         my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
-        if my_sg_data_key in tokens:
+        seeded_indices = [idx for (idx, tokens) in enumerate(all_tokens) if my_sg_data_key in tokens]
+        if seeded_indices:
 
             
             link_map = {}
-            fields_to_retrieve = []
+            fields_to_retrieve = ["id"]
             additional_filters = []
             
             # TODO: Support nested conditions
@@ -1212,99 +1317,101 @@ class Entity(Folder):
             
             # add some extra fields apart from the stuff in the config
             if self._entity_type == "Project":
-                fields_to_retrieve.append("name")
+                name_field = "name"
             elif self._entity_type == "Task":
-                fields_to_retrieve.append("content")
+                name_field = "content"
             elif self._entity_type == "HumanUser":
-                fields_to_retrieve.append("login")
+                name_field = "login"
             else:
-                fields_to_retrieve.append("code")
+                name_field = "code"
+            fields_to_retrieve.append(name_field)
             
             # TODO: AND the id query with this folder's query to make sure this path is
             # valid for the current entity. Throw error if not so driver code knows to 
             # stop processing. This would be needed in a setup where (for example) Asset
             # appears in several locations in the filesystem and that the filters are responsible
             # for determining which location to use for a particular asset.
-            my_id = tokens[ my_sg_data_key ]["id"]
-            additional_filters.append( {"path": "id", "relation": "is", "values": [my_id]})
+            my_ids = sorted(set(all_tokens[idx][my_sg_data_key]["id"] for idx in seeded_indices))
+            additional_filters.append( {"path": "id", "relation": "in", "values": my_ids})
             
             # append additional filter cruft
             filter_dict = { "logical_operator": "and", "conditions": additional_filters }
             
             # carry out find
-            rec = sg.find_one(self._entity_type, filter_dict, fields_to_retrieve)
+            recs = dict((rec["id"], rec) for rec in sg.find(self._entity_type, filter_dict, fields_to_retrieve))
             
-            # there are now two reasons why find_one did not return:
+            # there are now two reasons why an id was not returned:
             # - the specified entity id does not exist or has been deleted
             # - there are filters which has filtered it out. For example imagine that you 
             #   have one folder structure for all assets starting with A and a second structure
             #   for the rest. This would be a filter condition (code does not start with A, and
             #   code starts with A respectively). In these cases, the object does exist but has been
             #   explicitly filtered out - which is not an error!
-            
-            if not rec:
+            missing_ids = [my_id for my_id in my_ids if my_id not in recs]
+            if missing_ids:
                 
                 # check if it is a missing id or just a filtered out thing
-                if sg.find_one(self._entity_type, [["id", "is", my_id]]) is None:                
-                    raise TankError("Could not find Shotgun %s with id %s as required by "
-                                    "the folder creation setup." % (self._entity_type, my_id))
-                else:
-                    raise EntityLinkTypeMismatch()
-            
-            # and append the 'name field' which is always needed.
-            name = None # used for error reporting
-            if self._entity_type == "Project":
-                name = rec["name"]
-                tokens[ my_sg_data_key ]["name"] = rec["name"]
-            elif self._entity_type == "Task":
-                name = rec["content"]
-                tokens[ my_sg_data_key ]["content"] = rec["content"]
-            elif self._entity_type == "HumanUser":
-                name = rec["login"]
-                tokens[ my_sg_data_key ]["login"] = rec["login"]
-            else:
-                name = rec["code"]
-                tokens[ my_sg_data_key ]["code"] = rec["code"]
-            
-            
-            # Step through our token key map and process
-            #
-            # This is on the form
-            # link_map['sg_sequence'] = link_obj
-            #
-            for field in link_map:
+                existing = sg.find(self._entity_type, [["id", "in", missing_ids]])
+                existing_ids = set(rec["id"] for rec in existing)
+                for my_id in missing_ids:
+                    if my_id not in existing_ids:
+                        raise TankError("Could not find Shotgun %s with id %s as required by "
+                                        "the folder creation setup." % (self._entity_type, my_id))
+            
+            for idx in seeded_indices:
+                tokens = all_tokens[idx]
+                rec = recs.get(tokens[ my_sg_data_key ]["id"])
+                if rec is None:
+                    # filtered out, see above
+                    all_tokens[idx] = None
+                    continue
                 
-                # do some juggling to make sure we don't double process the 
-                # name fields.
-                value = rec[field]
-                link_obj = link_map[field]
+                # and append the 'name field' which is always needed.
+                name = rec[name_field] # used for error reporting
+                tokens[ my_sg_data_key ][name_field] = name
                 
-                if value is None:
-                    # field was none! - cannot handle that!
-                    raise TankError("The %s %s has a required field %s that \ndoes not have a value "
-                                    "set in Shotgun. \nDouble check the values and try "
-                                    "again!\n" % (self._entity_type, name, field))
-    
-                if isinstance(value, dict):
-                    # If the value is a dict, assume it comes from a entity link.
+                # Step through our token key map and process
+                #
+                # This is on the form
+                # link_map['sg_sequence'] = link_obj
+                #
+                for field in link_map:
                     
-                    # now make sure that this link is actually relevant for us,
-                    # e.g. that it points to an entity of the right type.
-                    # this may be a problem whenever a link can link to more
-                    # than one type. See the EntityLinkTypeMismatch docs for example.
-                    if value["type"] != link_obj.get_entity_type():
-                        raise EntityLinkTypeMismatch()
+                    # do some juggling to make sure we don't double process the 
+                    # name fields.
+                    value = rec[field]
+                    link_obj = link_map[field]
                     
-                
-                # store it in our sg_data prefetch chunk
-                tokens[ link_obj.get_sg_data_key() ] = value
+                    if value is None:
+                        # field was none! - cannot handle that!
+                        raise TankError("The %s %s has a required field %s that \ndoes not have a value "
+                                        "set in Shotgun. \nDouble check the values and try "
+                                        "again!\n" % (self._entity_type, name, field))
+        
+                    if isinstance(value, dict):
+                        # If the value is a dict, assume it comes from a entity link.
+                        
+                        # now make sure that this link is actually relevant for us,
+                        # e.g. that it points to an entity of the right type.
+                        # this may be a problem whenever a link can link to more
+                        # than one type. See the EntityLinkTypeMismatch docs for example.
+                        if value["type"] != link_obj.get_entity_type():
+                            all_tokens[idx] = None
+                            break
+                        
+                    
+                    # store it in our sg_data prefetch chunk
+                    tokens[ link_obj.get_sg_data_key() ] = value
                 
         # now keep recursing upwards
         if self._parent is None:
-            return tokens
+            return all_tokens
         
-        else:
-            return self._parent.extract_shotgun_data_upwards(sg, tokens)
+        # only items which satisfied the links so far are passed upwards
+        parent_tokens = iter(self._parent.extract_shotgun_data_upwards_batch(
+            sg, [tokens for tokens in all_tokens if tokens is not None]
+        ))
+        return [None if tokens is None else parent_tokens.next() for tokens in all_tokens]
     
     
 class UserWorkspace(Entity):
@@ -1779,6 +1886,26 @@ def _resolve_shotgun_filters(filters, sg_data):
     return resolved_filters
 
 
+def _get_filters_cache_key(value):
+    """
+    Returns a hashable representation of a resolved filter dictionary, suitable
+    for use as a cache key. 
+    
+    Entity links are only represented by their type and id since this is all
+    shotgun takes into account, and the folder data dictionaries hold entity 
+    links with varying sets of fields depending on where they were extracted.
+    """
+    if isinstance(value, dict):
+        if "type" in value and "id" in value:
+            return (value["type"], value["id"])
+        return tuple(sorted((k, _get_filters_cache_key(v)) for (k, v) in value.iteritems()))
+    
+    if isinstance(value, (list, tuple)):
+        return tuple(_get_filters_cache_key(v) for v in value)
+    
+    return value
+
+
 def _translate_filter_tokens(filter_list, parent, yml_path):
     """
     Helper method to translate dynamic filter tokens into FilterExpressionTokens.
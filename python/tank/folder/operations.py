@@ -15,78 +15,117 @@ Main entry points for folder creation.
 
 from .configuration import FolderConfiguration
 from .folder_io import FolderIOReceiver
-from .folder_types import EntityLinkTypeMismatch
 from ..errors import TankError
 
 
-def create_single_folder_item(tk, config_obj, io_receiver, entity_type, entity_id, sg_task_data, engine):
+def create_folder_items(tk, config_obj, io_receiver, items, engine):
     """
-    Creates folders for an entity type and an entity id.
+    Creates folders for a list of entities.
+    
+    The Shotgun data needed for all the entities is retrieved up front, walking
+    the folder configuration once for the whole list of entities, so that the
+    number of Shotgun queries doesn't grow with the number of entities for the 
+    levels leading to them.
     
     :param config_obj: a FolderConfiguration object representing the folder configuration
     :param io_receiver: a FolderIOReceiver representing the folder operation callbacks
-    :param entity_type: Shotgun entity type
-    :param entity_id: Shotgun entity id
-    :param sg_task_data: shotgun task id if this folder creation is associated with a particular task
+    :param items: List of dictionaries with keys type (Shotgun entity type), id (Shotgun 
+                  entity id) and sg_task_data (shotgun task data if the folder creation 
+                  is associated with a particular task, None otherwise).
     :param engine: Engine to create folders for / indicate second pass if not None.
     """
-    # TODO: Confirm this entity exists and is in this project
-    # Recurse over entire tree and find find all Entity folders of this type
-    folder_objects = config_obj.get_folder_objs_for_entity_type(entity_type)
+    # TODO: Confirm these entities exist and are in this project
+    
+    # the shotgun data for each item and folder object pair, keyed by folder
+    # object and listed in the same order as the items
+    shotgun_entity_data = {}
     
-    # now we have folder objects representing the entity type we are after.
-    # (for example there may be 3 SHOT nodes in the folder config tree)
-    # For each folder, find the list of entities needed to build the full path and
-    # ensure its parent folders exist. Then, create the folder for this entity with
-    # all its children.
-    for folder_obj in folder_objects:
+    entity_types = []
+    for item in items:
+        if item["type"] not in entity_types:
+            entity_types.append(item["type"])
+    
+    for entity_type in entity_types:
         
-        # fill in the information we know about this entity now
-        entity_id_seed = { 
-            entity_type: { "type": entity_type, "id": entity_id },
-            "current_task_data": sg_task_data 
-        }
+        entity_items = [item for item in items if item["type"] == entity_type]
         
-        # now go from the folder object, deep inside the hierarchy,
-        # up the tree and resolve all the entity ids that are required 
-        # in order to create folders.
-        try:
-            shotgun_entity_data = folder_obj.extract_shotgun_data_upwards(tk.shotgun, entity_id_seed)
-        except EntityLinkTypeMismatch:
-            # the seed entity id object does not satisfy the link
-            # path from folder_obj up to the root. 
-            continue
+        # Recurse over entire tree and find find all Entity folders of this type
+        folder_objects = config_obj.get_folder_objs_for_entity_type(entity_type)
         
-        # now get all the parents, the list goes from the bottom up
-        # parents:
-        # [Entity /Project/sequences/Sequence/Shot, 
-        #  Entity /Project/sequences/Sequence, 
-        #  Static /Project/sequences, Project /Project ]
-        #
-        # the last element is now always the project object
-        folder_objects_to_recurse = [folder_obj] + folder_obj.get_parents()
+        # now we have folder objects representing the entity type we are after.
+        # (for example there may be 3 SHOT nodes in the folder config tree)
+        # For each folder, find the list of entities needed to build the full path and
+        # ensure its parent folders exist.
+        for folder_obj in folder_objects:
+        
+            # fill in the information we know about these entities now
+            entity_id_seeds = []
+            for item in entity_items:
+                entity_id_seeds.append({
+                    entity_type: { "type": entity_type, "id": item["id"] },
+                    "current_task_data": item["sg_task_data"]
+                })
+            
+            # now go from the folder object, deep inside the hierarchy,
+            # up the tree and resolve all the entity ids that are required 
+            # in order to create folders. Seeds which do not satisfy the link
+            # path from folder_obj up to the root are returned as None.
+            folder_entity_data = folder_obj.extract_shotgun_data_upwards_batch(tk.shotgun, entity_id_seeds)
+            shotgun_entity_data[folder_obj] = folder_entity_data
+            
+            # and retrieve the data needed to create the folders down this
+            # recursion path for all the entities at once.
+            valid_entity_data = [data for data in folder_entity_data if data is not None]
+            if valid_entity_data:
+                for recursion_folder_obj in [folder_obj] + folder_obj.get_parents():
+                    recursion_folder_obj.prefetch_shotgun_data(tk.shotgun, valid_entity_data)
+    
+    # now create the folders for each item, with all its children.
+    entity_type_indices = dict((entity_type, 0) for entity_type in entity_types)
+    for item in items:
         
-        # get the project object and take it out of the list
-        # we will use the project object to start the recursion down
-        project_folder = folder_objects_to_recurse.pop()
+        entity_type = item["type"]
+        item_index = entity_type_indices[entity_type]
+        entity_type_indices[entity_type] += 1
         
-        # get the parent path of the project folder
-        storage_root_path = project_folder.get_storage_root()
-                
-        # now walk down, starting from the project level until we reach our entity 
-        # and create all the structure.
-        #
-        # we pass a list of folder objects to create, so that in the case an object has multiple
-        # children, the folder creation knows which object to create at that point.
-        #
-        # the shotgun_entity_data dictionary contains all the shotgun data needed in order to create
-        # all the folders down this particular recursion path
-        project_folder.create_folders(io_receiver, 
-                                      storage_root_path, 
-                                      shotgun_entity_data, 
-                                      True,
-                                      folder_objects_to_recurse,
-                                      engine)
+        for folder_obj in config_obj.get_folder_objs_for_entity_type(entity_type):
+            
+            item_entity_data = shotgun_entity_data[folder_obj][item_index]
+            if item_entity_data is None:
+                # the seed entity id object does not satisfy the link
+                # path from folder_obj up to the root. 
+                continue
+        
+            # now get all the parents, the list goes from the bottom up
+            # parents:
+            # [Entity /Project/sequences/Sequence/Shot, 
+            #  Entity /Project/sequences/Sequence, 
+            #  Static /Project/sequences, Project /Project ]
+            #
+            # the last element is now always the project object
+            folder_objects_to_recurse = [folder_obj] + folder_obj.get_parents()
+            
+            # get the project object and take it out of the list
+            # we will use the project object to start the recursion down
+            project_folder = folder_objects_to_recurse.pop()
+            
+            # get the parent path of the project folder
+            storage_root_path = project_folder.get_storage_root()
+                    
+            # now walk down, starting from the project level until we reach our entity 
+            # and create all the structure.
+            #
+            # we pass a list of folder objects to create, so that in the case an object has multiple
+            # children, the folder creation knows which object to create at that point.
+            #
+            # the shotgun_entity_data dictionary contains all the shotgun data needed in order to create
+            # all the folders down this particular recursion path
+            project_folder.create_folders(io_receiver, 
+                                          storage_root_path, 
+                                          item_entity_data, 
+                                          True,
+                                          folder_objects_to_recurse,
+                                          engine)
         
 
 
@@ -195,15 +234,8 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
     # create an object to receive all IO requests
     io_receiver = FolderIOReceiver(tk, preview, entity_type, entity_ids)
 
-    # now loop over all individual objects and create folders
-    for i in items:        
-        create_single_folder_item(tk, 
-                                  config, 
-                                  io_receiver, 
-                                  i["type"], 
-                                  i["id"], 
-                                  i["sg_task_data"],
-                                  engine)
+    # now create folders for all the objects
+    create_folder_items(tk, config, io_receiver, items, engine)
 
     folders_created = io_receiver.execute_folder_creation()
     
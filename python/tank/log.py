@@ -171,6 +171,13 @@ automatically enabled and end users do not need to worry about this.
 If you want debug logging to be written to these files, enable the
 global debug flag.
 
+Log files are written as messages are emitted. To write them from a
+background thread instead, set the ``TK_ASYNC_FILE_LOGGING`` environment
+variable to ``block`` or ``drop_oldest``, which controls what happens when
+messages are logged faster than they can be written: either wait for them
+to be written or discard the oldest ones. Messages waiting to be written
+are flushed to disk when an engine is destroyed and when the interpreter exits.
+
     .. note:: If you are writing a toolkit plugin, we recommend
               that you initialize logging early on in your code by
               calling :meth:`LogManager.initialize_base_file_handler`.
@@ -212,14 +219,174 @@ For more information, see https://docs.python.org/2/library/logging.handlers.htm
 """
 
 
+import copy
 import logging
 import logging.handlers
 import os
+import Queue
+import threading
 import time
 import weakref
 from functools import wraps
 from . import constants
 
+
+class _BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler which doesn't flush its file after every
+    message while a batch of messages is being written.
+    """
+
+    def __init__(self, *args, **kwargs):
+        logging.handlers.RotatingFileHandler.__init__(self, *args, **kwargs)
+        self.batching = False
+
+    def flush(self):
+        """
+        Flushes the file, unless a batch is being written.
+        """
+        if not self.batching:
+            logging.handlers.RotatingFileHandler.flush(self)
+
+
+class _AsyncFileHandler(logging.Handler):
+    """
+    Log handler queueing messages for a background thread,
+    which writes them in batches to a file handler.
+
+    Queued messages are written to disk when the handler is flushed
+    or closed, which the logging module does at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        target,
+        overflow_policy,
+        queue_size=constants.ASYNC_FILE_LOGGING_QUEUE_SIZE,
+        batch_size=constants.ASYNC_FILE_LOGGING_BATCH_SIZE
+    ):
+        """
+        :param target: :class:`_BatchedRotatingFileHandler` writing the messages.
+        :param overflow_policy: What to do when the queue is full, either
+            ``constants.ASYNC_FILE_LOGGING_BLOCK`` or ``constants.ASYNC_FILE_LOGGING_DROP_OLDEST``.
+        :param queue_size: Maximum number of messages waiting to be written.
+        :param batch_size: Maximum number of messages written between flushes.
+        """
+        logging.Handler.__init__(self)
+        self._target = target
+        self._overflow_policy = overflow_policy
+        self._batch_size = batch_size
+        self._queue = Queue.Queue(queue_size)
+        # number of messages discarded because the queue was full
+        self.num_dropped = 0
+        # set once the handler doesn't accept messages anymore
+        self._closed = False
+
+        self._writer = threading.Thread(target=self._write_records, name="sgtk log file writer")
+        self._writer.daemon = True
+        self._writer.start()
+
+    @property
+    def baseFilename(self):
+        """
+        Path to the log file, as for standard file handlers.
+        """
+        return self._target.baseFilename
+
+    def setFormatter(self, fmt):
+        """
+        Sets the formatter of the handler and of the file handler writing the messages.
+        """
+        logging.Handler.setFormatter(self, fmt)
+        self._target.setFormatter(fmt)
+
+    def emit(self, record):
+        """
+        Queues a message to be written by the background thread.
+        """
+        if self._closed:
+            return
+
+        try:
+            # the record is shared with the other handlers, so work on a copy.
+            # Resolve the message now since its arguments may be modified
+            # before the message is written.
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = (self.formatter or logging.Formatter()).formatException(record.exc_info)
+                record.exc_info = None
+        except Exception:
+            self.handleError(record)
+            return
+
+        if self._overflow_policy == constants.ASYNC_FILE_LOGGING_DROP_OLDEST:
+            while True:
+                try:
+                    self._queue.put_nowait(record)
+                    return
+                except Queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                    except Queue.Empty:
+                        continue
+                    self._queue.task_done()
+                    self.num_dropped += 1
+        else:
+            self._queue.put(record)
+
+    def flush(self):
+        """
+        Waits until all the queued messages have been written to disk.
+        """
+        if self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """
+        Writes the queued messages, stops the background thread and closes the file.
+        """
+        self._closed = True
+        if self._writer.is_alive():
+            # None tells the writer to stop once everything before it is written
+            self._queue.put(None)
+            self._writer.join()
+        self._target.close()
+        logging.Handler.close(self)
+
+    def _write_records(self):
+        """
+        Writes the queued messages in batches, until told to stop.
+        """
+        while True:
+            records = [self._queue.get()]
+            try:
+                while len(records) < self._batch_size:
+                    records.append(self._queue.get_nowait())
+            except Queue.Empty:
+                pass
+
+            self._target.batching = True
+            try:
+                for record in records:
+                    if record is not None:
+                        self._target.handle(record)
+            finally:
+                self._target.batching = False
+                try:
+                    self._target.flush()
+                except (EnvironmentError, ValueError):
+                    # nothing can be reported from here, the messages
+                    # will be flushed with the next batch.
+                    pass
+                for _ in records:
+                    self._queue.task_done()
+
+            if None in records:
+                return
+
+
 class LogManager(object):
     """
     Main interface for logging in Toolkit.
@@ -527,6 +694,9 @@ class LogManager(object):
                 "Tearing down existing log handler '%s' (%s)" % (base_log_name, self._std_file_handler)
             )
             self._root_logger.removeHandler(self._std_file_handler)
+            # make sure everything logged so far is written before the
+            # file is used by another handler.
+            self._std_file_handler.close()
             self._std_file_handler = None
             self._std_file_handler_log_name = None
 
@@ -577,13 +747,34 @@ class LogManager(object):
             "%s.log" % filesystem.create_valid_filename(log_name)
         )
 
+        overflow_policy = os.environ.get(constants.ASYNC_FILE_LOGGING_ENV_VAR)
+        if overflow_policy and overflow_policy not in (
+            constants.ASYNC_FILE_LOGGING_BLOCK, constants.ASYNC_FILE_LOGGING_DROP_OLDEST
+        ):
+            log.warning(
+                "Unknown value '%s' for the %s environment variable, using '%s'." % (
+                    overflow_policy,
+                    constants.ASYNC_FILE_LOGGING_ENV_VAR,
+                    constants.ASYNC_FILE_LOGGING_BLOCK
+                )
+            )
+            overflow_policy = constants.ASYNC_FILE_LOGGING_BLOCK
+
         # create a rotating log file with a max size of 5 megs -
         # this should make all log files easily attachable to support tickets.
-        self._std_file_handler = logging.handlers.RotatingFileHandler(
-            log_file,
+        file_handler_args = dict(
+            filename=log_file,
             maxBytes=1024*1024*5,  # 5 MiB
             backupCount=1          # Need at least one backup in order to rotate
         )
+        if overflow_policy:
+            # write the file from a background thread
+            self._std_file_handler = _AsyncFileHandler(
+                _BatchedRotatingFileHandler(**file_handler_args),
+                overflow_policy
+            )
+        else:
+            self._std_file_handler = logging.handlers.RotatingFileHandler(**file_handler_args)
 
         # set the level based on global debug flag
         if self.global_debug:
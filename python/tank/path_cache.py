@@ -15,9 +15,14 @@ all Tank items in the file system are kept.
 """
 
 import collections
+import copy
 import sqlite3
+import shutil
 import sys
 import os
+import re
+import threading
+import uuid
 
 # use api json to cover py 2.5
 # todo - replace with proper external library  
@@ -29,6 +34,9 @@ from . import constants
 from .errors import TankError
 from . import LogManager
 from .util.login import get_current_user
+from .util.lru_cache import LRUCache
+from .util import concurrency
+from .util import filesystem
 
 # Shotgun field definitions to store the path cache data
 SHOTGUN_ENTITY = "FilesystemLocation"
@@ -41,8 +49,222 @@ SG_ENTITY_TYPE_FIELD = "linked_entity_type"
 SG_ENTITY_NAME_FIELD = "code"
 SG_PIPELINE_CONFIG_FIELD = "pipeline_configuration"
 
+# FilesystemLocation fields needed to replay folders into the path cache
+SG_REPLAY_FIELDS = [
+    "id",
+    SG_METADATA_FIELD,
+    SG_IS_PRIMARY_FIELD,
+    SG_ENTITY_ID_FIELD,
+    SG_PATH_FIELD,
+    SG_ENTITY_TYPE_FIELD,
+    SG_ENTITY_NAME_FIELD,
+]
+
+# file name of path cache snapshots, from their format version
+# and the event log id they are synchronized up to.
+SNAPSHOT_FILE_NAME = "path_cache_snapshot.v%d.%d.db"
+SNAPSHOT_FILE_REGEX = re.compile(r"^path_cache_snapshot\.v(\d+)\.(\d+)\.db$")
+
+# indices of the path_cache table, as (name, definition) tuples. These are
+# dropped while a full sync loads records and rebuilt afterwards.
+PATH_CACHE_INDICES = [
+    ("path_cache_entity", "CREATE INDEX path_cache_entity ON path_cache(entity_type, entity_id)"),
+    ("path_cache_path", "CREATE INDEX path_cache_path ON path_cache(root, path, primary_entity)"),
+    ("path_cache_all", "CREATE UNIQUE INDEX path_cache_all ON path_cache(entity_type, entity_id, root, path, primary_entity)"),
+]
+
 log = LogManager.get_logger(__name__)
 
+# lookup caches shared by all the path cache objects of this
+# process, keyed by database file and storage roots.
+_lookup_caches = {}
+_lookup_caches_lock = threading.Lock()
+
+# number of times each database file has been modified by this process
+_modification_counts = {}
+_modification_counts_lock = threading.Lock()
+
+
+def _get_file_id(path):
+    """
+    Returns a value identifying a file on disk, which changes if
+    the file is removed and created again.
+
+    Note that file systems may reuse the identifier of a removed file, unless
+    that file is still held open, like a pooled database connection does.
+
+    :param path: Path to a file.
+    :returns: Tuple of device and inode numbers, or None if the file doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+def _get_sync_marker(path_cache_file):
+    """
+    Returns the id of the last event log entry a path cache database file
+    has been synchronized with.
+
+    :param path_cache_file: Path to the path cache database file.
+    :returns: The event log id or None if the database has never been
+              synchronized or can't be read.
+    """
+    try:
+        connection = sqlite3.connect(path_cache_file)
+        try:
+            return connection.execute("SELECT max(last_id) FROM event_log_sync").fetchone()[0]
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        # empty file, or a database created before event log syncing
+        return None
+
+
+def _get_file_state(path):
+    """
+    Returns a value which changes whenever a file is modified.
+
+    :param path: Path to a file.
+    :returns: Tuple of inode number, size and modification time or None
+              if the file doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime)
+
+
+def get_path_cache_state(path_cache_file):
+    """
+    Returns a value which changes whenever a path cache database is modified,
+    either by this process or by another one. Data derived from the database
+    can be kept for as long as this value doesn't change.
+
+    :param path_cache_file: Path to the path cache database file.
+    :returns: Hashable value.
+    """
+    with _modification_counts_lock:
+        modification_count = _modification_counts.get(path_cache_file, 0)
+    return (modification_count, _get_file_state(path_cache_file))
+
+
+def _get_lookup_cache(path_cache_file, roots):
+    """
+    Returns the lookup cache to use for a path cache database, if
+    lookup caching is enabled via the environment.
+
+    :param path_cache_file: Path to the path cache database file.
+    :param roots: Dictionary of storage root names to paths.
+    :returns: A :class:`_LookupCache` or None if lookups shouldn't be cached.
+    """
+    value = os.environ.get(constants.PATH_CACHE_LOOKUP_CACHE_SIZE_ENV_VAR)
+    if not value:
+        return None
+
+    try:
+        max_size = int(value)
+    except ValueError:
+        log.warning(
+            "Invalid value '%s' for the %s environment variable. Path cache lookups "
+            "will not be cached." % (value, constants.PATH_CACHE_LOOKUP_CACHE_SIZE_ENV_VAR)
+        )
+        return None
+
+    if max_size <= 0:
+        return None
+
+    # lookup results depend on the roots the paths are resolved against
+    key = (path_cache_file, tuple(sorted(roots.items())))
+    with _lookup_caches_lock:
+        lookup_cache = _lookup_caches.get(key)
+        if lookup_cache is None or lookup_cache.max_size != max_size:
+            lookup_cache = _LookupCache(max_size)
+            _lookup_caches[key] = lookup_cache
+    return lookup_cache
+
+
+class _LookupCache(object):
+    """
+    In memory cache of the results of path cache lookups, shared by all the
+    path cache objects reading from the same database in a process.
+
+    Each cached result is tagged with the generation of the cache at the time
+    the database was queried. Bumping the generation invalidates all the
+    results, including the ones from queries running while it was bumped.
+    """
+
+    def __init__(self, max_size):
+        """
+        :param int max_size: Maximum number of lookup results to keep in memory.
+        """
+        self._results = LRUCache(max_size)
+        self._generation = 0
+        self._file_state = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        """
+        Maximum number of lookup results kept in memory.
+        """
+        return self._results.max_size
+
+    def invalidate(self, path_cache_file):
+        """
+        Invalidates all the cached lookup results after the database has been modified.
+
+        :param path_cache_file: Path to the path cache database file.
+        """
+        file_state = _get_file_state(path_cache_file)
+        with self._lock:
+            self._generation += 1
+            self._file_state = file_state
+        self._results.clear()
+
+    def check_file_state(self, path_cache_file):
+        """
+        Invalidates the cached lookup results if the database file has been
+        modified since it was last checked, for example by another process.
+
+        :param path_cache_file: Path to the path cache database file.
+        """
+        if _get_file_state(path_cache_file) != self._file_state:
+            self.invalidate(path_cache_file)
+
+    def get(self, key, lookup):
+        """
+        Returns the result of a lookup, from memory if available.
+
+        :param key: Hashable value identifying the lookup.
+        :param lookup: Callable running the lookup against the database.
+        :returns: A copy of the lookup result.
+        """
+        entry = self._results.get(key)
+        if entry is not None and entry[0] == self._generation:
+            return copy.deepcopy(entry[1])
+
+        generation = self._generation
+        result = lookup()
+        if generation == self._generation:
+            self._results.set(key, (generation, copy.deepcopy(result)))
+        return result
+
+    def get_stats(self):
+        """
+        Returns statistics about the cache usage.
+
+        :returns: Dictionary with keys ``hits``, ``misses``, ``size``,
+                  ``max_size`` and ``generation``.
+        """
+        stats = self._results.get_stats()
+        stats["generation"] = self._generation
+        return stats
+
+
 class PathCache(object):
     """
     A global cache which holds the mapping between a shotgun entity and a location on disk.
@@ -58,6 +280,7 @@ class PathCache(object):
         :param tk: Toolkit API instance
         """
         self._connection = None
+        self._lookup_cache = None
         self._tk = tk
         self._sync_with_sg = tk.pipeline_configuration.get_shotgun_path_cache_enabled()
 
@@ -65,6 +288,7 @@ class PathCache(object):
             self._path_cache_disabled = False
             self._init_db()
             self._roots = tk.pipeline_configuration.get_data_roots()
+            self._init_lookup_cache()
         else:
             # no primary location found. Path cache therefore does not exist!
             # go into a no-path-cache-mode
@@ -72,14 +296,262 @@ class PathCache(object):
     
     def _init_db(self):
         """
-        Sets up the database
+        Sets up the database connection.
+
+        Connections are pooled per Toolkit instance and per thread, meaning that
+        the database file is only opened and its schema only checked the first time
+        a path cache is created. Subsequent path cache objects reuse that connection
+        for as long as the database file on disk is not removed or replaced.
         """
         # first, make way for the path cache file. This call
         # will ensure that there is a valid folder and file on
         # disk, created with all the right permissions etc.
         path_cache_file = self._get_path_cache_location()
-        
-        self._connection = sqlite3.connect(path_cache_file)
+        self._path_cache_file = path_cache_file
+
+        connections = self._tk._get_path_cache_connections()
+        file_id = _get_file_id(path_cache_file)
+
+        if path_cache_file in connections:
+            (connection, pooled_file_id) = connections[path_cache_file]
+            if file_id is not None and file_id == pooled_file_id:
+                self._connection = connection
+                return
+            # the file was removed or replaced since the connection
+            # was opened - discard the stale connection.
+            log.debug("Path cache file %s has changed on disk, reconnecting." % path_cache_file)
+            del connections[path_cache_file]
+            connection.close()
+
+        if self._sync_with_sg:
+            self._seed_from_snapshot(path_cache_file)
+
+        self._connection = self._connect(path_cache_file)
+
+        # the database file is created on disk by sqlite if it didn't exist
+        file_id = _get_file_id(path_cache_file)
+        if file_id is not None:
+            connections[path_cache_file] = (self._connection, file_id)
+
+    def _seed_from_snapshot(self, path_cache_file):
+        """
+        Replaces the path cache file with a copy of the newest path cache snapshot
+        if the file has never been synchronized or is older than the snapshot. The
+        next synchronization then only has to replay the events which happened
+        after the snapshot was written.
+
+        Failing to copy the snapshot is not an error, the path cache will then
+        be synchronized with Shotgun as usual.
+
+        :param path_cache_file: Path to the path cache database file.
+        """
+        (snapshot_path, snapshot_event_log_id) = self._get_newest_snapshot()
+        if snapshot_path is None:
+            return
+
+        event_log_id = _get_sync_marker(path_cache_file)
+        if event_log_id is not None and event_log_id >= snapshot_event_log_id:
+            return
+
+        log.debug(
+            "Path cache %s is synchronized up to event %s, seeding it from snapshot %s." %
+            (path_cache_file, event_log_id, snapshot_path)
+        )
+        temp_path = "%s.%s.tmp" % (path_cache_file, uuid.uuid4().hex)
+        try:
+            try:
+                shutil.copyfile(snapshot_path, temp_path)
+                if sys.platform == "win32" and os.path.exists(path_cache_file):
+                    # files can't be renamed over existing ones on windows
+                    os.remove(path_cache_file)
+                os.rename(temp_path, path_cache_file)
+            except (IOError, OSError), e:
+                log.debug("Could not seed path cache from snapshot %s: %s" % (snapshot_path, e))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _get_snapshot_folder(self):
+        """
+        Returns the folder path cache snapshots are stored in, as determined
+        by the cache location core hook.
+
+        :returns: Path to a folder, which may not exist, or None if
+                  snapshots are disabled.
+        """
+        return self._tk.execute_core_hook_method(
+            constants.CACHE_LOCATION_HOOK_NAME,
+            "get_path_cache_snapshot_folder",
+            project_id=self._tk.pipeline_configuration.get_project_id(),
+            entry_point=self._tk.pipeline_configuration.get_entry_point(),
+            pipeline_configuration_id=self._tk.pipeline_configuration.get_shotgun_id()
+        )
+
+    def _get_snapshots(self):
+        """
+        Lists the path cache snapshots of the current format version.
+
+        :returns: List of (event log id, path) tuples, oldest snapshot first.
+        """
+        snapshot_folder = self._get_snapshot_folder()
+        if not snapshot_folder:
+            return []
+
+        try:
+            file_names = os.listdir(snapshot_folder)
+        except OSError:
+            # no snapshots were written yet
+            return []
+
+        snapshots = []
+        for file_name in file_names:
+            match = SNAPSHOT_FILE_REGEX.match(file_name)
+            if match and int(match.group(1)) == constants.PATH_CACHE_SNAPSHOT_FORMAT_VERSION:
+                snapshots.append((int(match.group(2)), os.path.join(snapshot_folder, file_name)))
+        return sorted(snapshots)
+
+    def _get_newest_snapshot(self):
+        """
+        Finds the most recent path cache snapshot.
+
+        :returns: Tuple (path, event log id) or (None, None) if there are no snapshots.
+        """
+        snapshots = self._get_snapshots()
+        if not snapshots:
+            return (None, None)
+        (event_log_id, snapshot_path) = snapshots[-1]
+        return (snapshot_path, event_log_id)
+
+    def write_snapshot(self):
+        """
+        Writes a compacted copy of the path cache to the path cache snapshot folder,
+        as determined by the cache location core hook. Path caches on other machines
+        which are empty or older than the snapshot are seeded from it the next time
+        they are opened, so only the events which happened after it was written need
+        synchronizing. Older snapshots are removed.
+
+        The path cache should be synchronized before writing a snapshot.
+
+        :returns: Path to the snapshot file.
+        :raises: TankError if the project doesn't synchronize its folders with
+                 Shotgun or if the path cache has never been synchronized.
+        """
+        if self._path_cache_disabled or not self._sync_with_sg:
+            raise TankError("Path cache snapshots can only be written for projects "
+                            "synchronizing their folders with Shotgun.")
+
+        snapshot_folder = self._get_snapshot_folder()
+        if not snapshot_folder:
+            raise TankError("Path cache snapshots have been disabled in the %s core hook." %
+                            constants.CACHE_LOCATION_HOOK_NAME)
+        filesystem.ensure_folder_exists(snapshot_folder)
+
+        temp_path = os.path.join(snapshot_folder, "path_cache_snapshot.%s.tmp" % uuid.uuid4().hex)
+        try:
+            connection = sqlite3.connect(temp_path)
+            try:
+                # copy all the tables into a fresh database within a single
+                # transaction, so that they are consistent with each other.
+                self._ensure_schema(connection)
+                connection.execute("ATTACH DATABASE ? AS local", (self._path_cache_file,))
+                connection.execute("""INSERT INTO main.path_cache(rowid,
+                                                                  entity_type,
+                                                                  entity_id,
+                                                                  entity_name,
+                                                                  root,
+                                                                  path,
+                                                                  primary_entity)
+                                      SELECT rowid, entity_type, entity_id, entity_name, root, path, primary_entity
+                                      FROM local.path_cache ORDER BY rowid""")
+                connection.execute("""INSERT INTO main.shotgun_status(path_cache_id, shotgun_id)
+                                      SELECT path_cache_id, shotgun_id FROM local.shotgun_status""")
+                res = connection.execute("SELECT max(last_id) FROM local.event_log_sync")
+                event_log_id = res.fetchone()[0]
+                if event_log_id is None:
+                    raise TankError("The path cache needs to be synchronized with Shotgun "
+                                    "before a snapshot can be written.")
+                connection.execute("INSERT INTO main.event_log_sync(last_id) VALUES(?)", (event_log_id, ))
+                connection.commit()
+                connection.execute("DETACH DATABASE local")
+            finally:
+                connection.close()
+
+            # snapshots are read by all the machines using this configuration
+            os.chmod(temp_path, 0666)
+            snapshot_path = os.path.join(
+                snapshot_folder,
+                SNAPSHOT_FILE_NAME % (constants.PATH_CACHE_SNAPSHOT_FORMAT_VERSION, event_log_id)
+            )
+            if sys.platform == "win32" and os.path.exists(snapshot_path):
+                # files can't be renamed over existing ones on windows
+                os.remove(snapshot_path)
+            os.rename(temp_path, snapshot_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        log.debug("Wrote path cache snapshot %s" % snapshot_path)
+
+        for (_, old_snapshot_path) in self._get_snapshots()[:-constants.PATH_CACHE_SNAPSHOTS_TO_KEEP]:
+            log.debug("Removing old path cache snapshot %s" % old_snapshot_path)
+            filesystem.safe_delete_file(old_snapshot_path)
+
+        return snapshot_path
+
+    def _init_lookup_cache(self):
+        """
+        Sets up the in memory cache of lookup results, if enabled.
+        """
+        self._lookup_cache = _get_lookup_cache(self._path_cache_file, self._roots)
+        if self._lookup_cache:
+            self._lookup_cache.check_file_state(self._path_cache_file)
+
+    def get_state(self):
+        """
+        Returns a value which changes whenever the path cache is modified, either
+        by this process or by another one. Data derived from the path cache can
+        be kept for as long as this value doesn't change.
+
+        :returns: Hashable value, which is None if there is no path cache.
+        """
+        if self._path_cache_disabled:
+            return None
+        return get_path_cache_state(self._path_cache_file)
+
+    def get_lookup_cache_stats(self):
+        """
+        Returns statistics about the in memory cache of lookup results. This cache is
+        enabled by setting the ``TK_PATH_CACHE_LOOKUP_CACHE_SIZE`` environment variable
+        to the maximum number of lookup results to keep in memory.
+
+        :returns: Dictionary with keys ``hits``, ``misses``, ``size``, ``max_size``
+                  and ``generation``, or None if lookups are not cached.
+        """
+        if self._lookup_cache is None:
+            return None
+        return self._lookup_cache.get_stats()
+
+    def _invalidate_lookup_cache(self):
+        """
+        Invalidates the cached lookup results after the database has been
+        modified, and records the modification, see :meth:`get_state`.
+        """
+        with _modification_counts_lock:
+            _modification_counts[self._path_cache_file] = (
+                _modification_counts.get(self._path_cache_file, 0) + 1
+            )
+        if self._lookup_cache:
+            self._lookup_cache.invalidate(self._path_cache_file)
+
+    def _connect(self, path_cache_file):
+        """
+        Opens a connection to the database, set up for fast lookups, and makes
+        sure the database schema is up to date.
+
+        :param path_cache_file: Path to the path cache database file.
+        :returns: A sqlite3 connection.
+        """
+        connection = sqlite3.connect(path_cache_file)
         
         # this is to handle unicode properly - make sure that sqlite returns 
         # str objects for TEXT fields rather than unicode. Note that any unicode
@@ -88,9 +560,33 @@ class PathCache(object):
         # representation will work for any language, as long as data is either input
         # as UTF-8 (byte string) or unicode. And in the latter case, the returned data
         # will always be unicode.
-        self._connection.text_factory = str
-        
-        c = self._connection.cursor()
+        connection.text_factory = str
+
+        # the path cache is mostly read from, so keep a large number of pages
+        # in memory. Note that sqlite drops these pages whenever another
+        # connection modifies the file, so this is safe for shared databases.
+        connection.execute("PRAGMA cache_size = %d" % constants.PATH_CACHE_DB_CACHE_PAGES)
+
+        # The rollback journal is kept rather than switching to WAL: the legacy
+        # path cache lives on shared network storage where WAL isn't supported,
+        # and journal modes are persisted in the file itself. Memory mapping is
+        # also unreliable over NFS, so it is only enabled for the Shotgun synced
+        # path cache which is stored in the local cache location.
+        if self._sync_with_sg:
+            connection.execute("PRAGMA mmap_size = %d" % constants.PATH_CACHE_DB_MMAP_SIZE)
+
+        self._ensure_schema(connection)
+
+        return connection
+
+    def _ensure_schema(self, connection):
+        """
+        Creates the database tables, or migrates them if they were created by
+        an older version of the path cache.
+
+        :param connection: sqlite3 connection to the database.
+        """
+        c = connection.cursor()
         try:
         
             # get a list of tables in the current database
@@ -113,8 +609,10 @@ class PathCache(object):
                     CREATE TABLE shotgun_status (path_cache_id integer, shotgun_id integer);
                     
                     CREATE UNIQUE INDEX shotgun_status_id ON shotgun_status(path_cache_id);
+
+                    CREATE INDEX shotgun_status_sg_id ON shotgun_status(shotgun_id);
                     """)
-                self._connection.commit()
+                connection.commit()
                 
             else:
                 
@@ -122,13 +620,20 @@ class PathCache(object):
                 if "event_log_sync" not in table_names:
                     # this is a pre-0.15 setup where the path cache does not have event log sync
                     c.executescript("CREATE TABLE event_log_sync (last_id integer);")
-                    self._connection.commit()
+                    connection.commit()
                 
                 if "shotgun_status" not in table_names:
                     # this is a pre-0.15 setup where the path cache does not have the shotgun_status table
                     c.executescript("""CREATE TABLE shotgun_status (path_cache_id integer, shotgun_id integer);
                                        CREATE UNIQUE INDEX shotgun_status_id ON shotgun_status(path_cache_id);""")
-                    self._connection.commit()
+                    connection.commit()
+
+                # the shotgun id index was added to replay deletions incrementally
+                ret = c.execute("SELECT name FROM main.sqlite_master WHERE type='index'")
+                index_names = [x[0] for x in ret.fetchall()]
+                if "shotgun_status_sg_id" not in index_names:
+                    c.executescript("CREATE INDEX IF NOT EXISTS shotgun_status_sg_id ON shotgun_status(shotgun_id);")
+                    connection.commit()
 
                 
                 # now ensure that some key fields that have been added during the dev cycle are there
@@ -148,7 +653,7 @@ class PathCache(object):
                         CREATE UNIQUE INDEX IF NOT EXISTS path_cache_all ON path_cache(entity_type, entity_id, root, path, primary_entity);
                         """)
         
-                    self._connection.commit()
+                    connection.commit()
         
         finally:
             c.close()
@@ -267,11 +772,29 @@ class PathCache(object):
 
     def close(self):
         """
-        Close the database connection.
+        Releases the database connection.
+
+        The connection itself is kept open so that it can be reused by other
+        path cache instances created from the same Toolkit instance and thread.
+        Any uncommitted changes are rolled back.
         """
         if self._connection is not None:
-            self._connection.close()
+            self._connection.rollback()
             self._connection = None
+
+    @staticmethod
+    def close_pooled_connections(tk):
+        """
+        Closes all the path cache database connections pooled by the current
+        thread for a Toolkit instance. This should be called prior to removing
+        or replacing a path cache file on disk.
+
+        :param tk: Toolkit API instance
+        """
+        connections = tk._get_path_cache_connections()
+        for (connection, _) in connections.values():
+            connection.close()
+        connections.clear()
                 
     ############################################################################################
     # shotgun synchronization (SG data pushed into path cache database)
@@ -387,12 +910,7 @@ class PathCache(object):
                 log.debug("Path cache syncing not necessary - local folders already up to date!")
                 return []
             
-            elif num_deletions > 0:
-                # some stuff was deleted. fall back on full sync
-                log.debug("Deletions detected, doing full sync")
-                return self._do_full_sync(c)
-            
-            elif num_creations > 0:
+            elif num_creations > 0 or num_deletions > 0:
                 # we have a complete trail of increments. 
                 # note that we skip the current entity.
                 log.debug("Full event log history traced. Running incremental sync.")
@@ -580,7 +1098,8 @@ class PathCache(object):
         
         Assumptions:
         - sg_data list always contains some entries
-        - sg_data list only contains Toolkit_Folders_Create records
+        - sg_data list only contains Toolkit_Folders_Create and
+          Toolkit_Folders_Delete records
         
         This is a list of dicts ordered by id from low to high (old to new), 
         each with keys
@@ -614,15 +1133,28 @@ class PathCache(object):
         max_event_log_id = max( [x["id"] for x in sg_data] )
         
         created_folder_ids = []
+        deleted_folder_ids = set()
         for d in sg_data:
             log.debug("Looking at event log entry %s" % d)
             if d["event_type"] == "Toolkit_Folders_Create":
                 # this is a creation request! Replay it on our database
                 created_folder_ids.extend( d["meta"]["sg_folder_ids"] )
+            elif d["event_type"] == "Toolkit_Folders_Delete":
+                # folders were unregistered. Remove them from our database
+                deleted_folder_ids.update( d["meta"]["sg_folder_ids"] )
             else:
                 # should never come here
                 raise Exception("Unsupported event type '%s'" % d)
         log.debug("Event log analysis complete.")
+
+        # FilesystemLocation ids are never reused, so folders which were created
+        # and then unregistered since the last sync don't need replaying. Deletions
+        # are applied first, so that paths unregistered and then registered again
+        # for another entity don't conflict.
+        created_folder_ids = [x for x in created_folder_ids if x not in deleted_folder_ids]
+        if deleted_folder_ids:
+            log.debug("The following FilesystemLocation ids need removing: %s" % sorted(deleted_folder_ids))
+            self._remove_folder_entities(cursor, sorted(deleted_folder_ids))
         
         log.debug("The following FilesystemLocation ids need replaying: %s" % created_folder_ids)
         
@@ -631,6 +1163,22 @@ class PathCache(object):
         return self._replay_folder_entities(cursor, max_event_log_id, created_folder_ids)
 
 
+    def _remove_folder_entities(self, cursor, ids):
+        """
+        Removes the path cache entries associated with the given FilesystemLocation
+        ids. Entries which aren't in the path cache are ignored. The changes are
+        not committed.
+
+        :param cursor: Sqlite database cursor
+        :param ids: List of FilesystemLocation ids to remove.
+        """
+        for chunk in concurrency.split_in_chunks(ids, constants.PATH_CACHE_SQL_CHUNK_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute("""DELETE FROM path_cache WHERE rowid IN
+                              (SELECT path_cache_id FROM shotgun_status WHERE shotgun_id IN (%s))""" % placeholders,
+                           chunk)
+            cursor.execute("DELETE FROM shotgun_status WHERE shotgun_id IN (%s)" % placeholders, chunk)
+
     def _replay_folder_entities(self, cursor, max_event_log_id, ids=None):
         """
         Does the actual download from shotgun and pushes those changes
@@ -654,26 +1202,14 @@ class PathCache(object):
                     - path
         
         """
+        if ids is None:
+            return self._replay_all_folder_entities(cursor, max_event_log_id)
+
         log.debug("Fetching already registered folders from Shotgun...")
         
         sg_data = []
         
-        if ids is None:
-            # get all folder data from shotgun
-            log.debug(
-                "Doing a full sync, so getting all the FilesystemLocations for the current project..."
-            )
-            sg_data = self._tk.shotgun.find(SHOTGUN_ENTITY, 
-                                  [["project", "is", self._get_project_link()]],
-                                  ["id",
-                                   SG_METADATA_FIELD, 
-                                   SG_IS_PRIMARY_FIELD, 
-                                   SG_ENTITY_ID_FIELD,
-                                   SG_PATH_FIELD,
-                                   SG_ENTITY_TYPE_FIELD, 
-                                   SG_ENTITY_NAME_FIELD],
-                                  [{"field_name": "id", "direction": "asc"},])
-        elif ids == []:
+        if ids == []:
             # incremental sync but with no folders
             log.debug("No folders need to be replayed, won't fetch anything from Shotgun...")
         
@@ -689,101 +1225,20 @@ class PathCache(object):
             id_in_filter.extend(ids)
             sg_data = self._tk.shotgun.find(SHOTGUN_ENTITY, 
                                   [id_in_filter],
-                                  ["id",
-                                   SG_METADATA_FIELD, 
-                                   SG_IS_PRIMARY_FIELD, 
-                                   SG_ENTITY_ID_FIELD,
-                                   SG_PATH_FIELD,
-                                   SG_ENTITY_TYPE_FIELD, 
-                                   SG_ENTITY_NAME_FIELD],
+                                  SG_REPLAY_FIELDS,
                                   [{"field_name": "id", "direction": "asc"},])
         
         log.debug("...Retrieved %s records." % len(sg_data))
             
-        # now start a single transaction in which we do all our work
-        if ids is None:
-            # complete sync - clear our tables first
-            log.debug("Full sync - clearing local sqlite path cache tables...")
-            cursor.execute("DELETE FROM event_log_sync")
-            cursor.execute("DELETE FROM shotgun_status")
-            cursor.execute("DELETE FROM path_cache")
-            
         return_data = []
             
         for x in sg_data:
             
-            # get entity data from our entry            
-            entity = {"id":   x[SG_ENTITY_ID_FIELD],
-                      "name": x[SG_ENTITY_NAME_FIELD],
-                      "type": x[SG_ENTITY_TYPE_FIELD]}
-            is_primary = x[SG_IS_PRIMARY_FIELD]
-            
-            # note! If a local storage which is associated with a path is retired,
-            # parts of the entity data returned by shotgun will be omitted.
-            # 
-            # A valid, active path entry will be on the form:
-            #  {'id': 653,
-            #   'path': {'content_type': None,
-            #            'id': 2186,
-            #            'link_type': 'local',
-            #            'local_path': '/Volumes/xyz/proj1/sequences/aaa',
-            #            'local_path_linux': '/Volumes/xyz/proj1/sequences/aaa',
-            #            'local_path_mac': '/Volumes/xyz/proj1/sequences/aaa',
-            #            'local_path_windows': None,
-            #            'local_storage': {'id': 2,
-            #                              'name': 'primary',
-            #                              'type': 'LocalStorage'},
-            #            'name': '[primary] /sequences/aaa',
-            #            'type': 'Attachment',
-            #            'url': 'file:///Volumes/xyz/proj1/sequences/aaa'},
-            #   'type': 'FilesystemLocation'},
-            #
-            # With a retired storage, the returned data from the SG API is
-            #  {'id': 646,
-            #   'path': {'content_type': None,
-            #            'id': 2141,
-            #            'link_type': 'local',
-            #            'local_storage': None,
-            #            'name': '[primary] /sequences/aaa/missing',
-            #            'type': 'Attachment'},
-            #   'type': 'FilesystemLocation'},
-            #
-            
-            # no path at all - this is an anomaly but handle it gracefully regardless
-            if x[SG_PATH_FIELD] is None:
-                log.debug("No path associated with entry for %s. Skipping." % entity)
-                continue
-            
-            # retired storage case - see above for details
-            if x[SG_PATH_FIELD].get("local_storage") is None:
-                log.debug("The storage for the path for %s has been deleted. Skipping." % entity)
-                continue
-                
-            # get the local path from our attachment entity dict
-            sg_local_storage_os_map = {"linux2": "local_path_linux", 
-                                       "win32": "local_path_windows", 
-                                       "darwin": "local_path_mac" }
-            local_os_path_field = sg_local_storage_os_map[sys.platform]
-            local_os_path = x[SG_PATH_FIELD].get(local_os_path_field)
-
-            # if the storage is not correctly configured for an OS, it is possible
-            # that the path comes back as null. Skip such paths and report them in the log.
-            if local_os_path is None:
-                log.debug("No local os path associated with entry for %s. Skipping." % entity)
+            mapping = self._get_folder_mapping(x)
+            if mapping is None:
                 continue
+            (entity, is_primary, local_os_path, _, _) = mapping
 
-            # if the path cannot be split up into a root_name and a leaf path
-            # using the roots.yml file, log a warning and continue. This can happen
-            # if roots files and storage setups change half-way through a project,
-            # or if roots files are not in sync with the main storage definition
-            # in this case, we want to just warn and skip rather than raise
-            # an exception which will stop execution entirely.
-            try:
-                root_name, relative_path = self._separate_root(local_os_path)
-            except TankError, e:
-                log.debug("Could not resolve storages - skipping: %s" % e)
-                continue
-            
             # all validation checks seem ok - go ahead and make the changes.
             new_rowid = self._add_db_mapping(cursor, local_os_path, entity, is_primary)
             if new_rowid:
@@ -813,6 +1268,314 @@ class PathCache(object):
         cursor.execute("INSERT INTO event_log_sync(last_id) VALUES(?)", (max_event_log_id, ))
             
         self._connection.commit()
+        self._invalidate_lookup_cache()
+
+        return return_data
+
+    def _get_folder_mapping(self, sg_location):
+        """
+        Validates a FilesystemLocation entity retrieved from Shotgun and extracts
+        the path cache mapping it represents.
+
+        :param sg_location: FilesystemLocation entity dictionary, with the
+                            fields listed in SG_REPLAY_FIELDS.
+        :returns: None if the entity should be skipped, otherwise a tuple
+                  (entity, is_primary, local_os_path, root_name, relative_path)
+                  where entity is a dictionary with keys type, id and name.
+        """
+        x = sg_location
+
+        # get entity data from our entry            
+        entity = {"id":   x[SG_ENTITY_ID_FIELD],
+                  "name": x[SG_ENTITY_NAME_FIELD],
+                  "type": x[SG_ENTITY_TYPE_FIELD]}
+        is_primary = x[SG_IS_PRIMARY_FIELD]
+        
+        # note! If a local storage which is associated with a path is retired,
+        # parts of the entity data returned by shotgun will be omitted.
+        # 
+        # A valid, active path entry will be on the form:
+        #  {'id': 653,
+        #   'path': {'content_type': None,
+        #            'id': 2186,
+        #            'link_type': 'local',
+        #            'local_path': '/Volumes/xyz/proj1/sequences/aaa',
+        #            'local_path_linux': '/Volumes/xyz/proj1/sequences/aaa',
+        #            'local_path_mac': '/Volumes/xyz/proj1/sequences/aaa',
+        #            'local_path_windows': None,
+        #            'local_storage': {'id': 2,
+        #                              'name': 'primary',
+        #                              'type': 'LocalStorage'},
+        #            'name': '[primary] /sequences/aaa',
+        #            'type': 'Attachment',
+        #            'url': 'file:///Volumes/xyz/proj1/sequences/aaa'},
+        #   'type': 'FilesystemLocation'},
+        #
+        # With a retired storage, the returned data from the SG API is
+        #  {'id': 646,
+        #   'path': {'content_type': None,
+        #            'id': 2141,
+        #            'link_type': 'local',
+        #            'local_storage': None,
+        #            'name': '[primary] /sequences/aaa/missing',
+        #            'type': 'Attachment'},
+        #   'type': 'FilesystemLocation'},
+        #
+        
+        # no path at all - this is an anomaly but handle it gracefully regardless
+        if x[SG_PATH_FIELD] is None:
+            log.debug("No path associated with entry for %s. Skipping." % entity)
+            return None
+        
+        # retired storage case - see above for details
+        if x[SG_PATH_FIELD].get("local_storage") is None:
+            log.debug("The storage for the path for %s has been deleted. Skipping." % entity)
+            return None
+            
+        # get the local path from our attachment entity dict
+        sg_local_storage_os_map = {"linux2": "local_path_linux", 
+                                   "win32": "local_path_windows", 
+                                   "darwin": "local_path_mac" }
+        local_os_path_field = sg_local_storage_os_map[sys.platform]
+        local_os_path = x[SG_PATH_FIELD].get(local_os_path_field)
+
+        # if the storage is not correctly configured for an OS, it is possible
+        # that the path comes back as null. Skip such paths and report them in the log.
+        if local_os_path is None:
+            log.debug("No local os path associated with entry for %s. Skipping." % entity)
+            return None
+
+        # if the path cannot be split up into a root_name and a leaf path
+        # using the roots.yml file, log a warning and continue. This can happen
+        # if roots files and storage setups change half-way through a project,
+        # or if roots files are not in sync with the main storage definition
+        # in this case, we want to just warn and skip rather than raise
+        # an exception which will stop execution entirely.
+        try:
+            root_name, relative_path = self._separate_root(local_os_path)
+        except TankError, e:
+            log.debug("Could not resolve storages - skipping: %s" % e)
+            return None
+
+        return (entity, is_primary, local_os_path, root_name, relative_path)
+
+    def _iter_all_folder_entities(self):
+        """
+        Pages through all the FilesystemLocation entities of the current
+        project, in ascending id order, so that they never all have to be
+        held in memory.
+
+        :returns: Generator of FilesystemLocation entity dictionaries, with
+                  the fields listed in SG_REPLAY_FIELDS.
+        """
+        last_id = 0
+        while True:
+            sg_data = self._tk.shotgun.find(
+                SHOTGUN_ENTITY,
+                [["project", "is", self._get_project_link()],
+                 ["id", "greater_than", last_id]],
+                SG_REPLAY_FIELDS,
+                [{"field_name": "id", "direction": "asc"}],
+                limit=constants.PATH_CACHE_SYNC_PAGE_SIZE
+            )
+            log.debug("...Retrieved %s records." % len(sg_data))
+
+            for sg_location in sg_data:
+                yield sg_location
+
+            if len(sg_data) < constants.PATH_CACHE_SYNC_PAGE_SIZE:
+                return
+            last_id = sg_data[-1]["id"]
+
+    def _replay_all_folder_entities(self, cursor, max_event_log_id):
+        """
+        Replaces the content of the path cache with all the FilesystemLocation
+        entities of the current project.
+
+        The entities are streamed from Shotgun and bulk loaded into a staging
+        table. Duplicates are then weeded out and conflicts detected in SQL,
+        following the same rules as :meth:`_add_db_mapping` would when adding
+        records in id order, before the records are copied into the path cache
+        and its indices rebuilt. Lastly, the event_log_sync marker is updated.
+
+        Everything happens in a single transaction, which is rolled back if
+        anything fails.
+
+        :param cursor: Sqlite database cursor
+        :param max_event_log_id: max event log marker to write to the path
+                                 cache database after a full operation.
+        :returns: A list of remote items which were detected, created remotely
+                  and not existing in this path cache. These are returned as a list of
+                  dictionaries, each containing keys:
+                    - entity
+                    - metadata
+                    - path
+        """
+        log.debug(
+            "Doing a full sync, so getting all the FilesystemLocations for the current project..."
+        )
+
+        # python's sqlite module commits any pending transaction before running
+        # statements changing the schema, so the transaction is handled here
+        # instead for the whole sync to remain atomic. Note that changing the
+        # isolation level commits any pending transaction.
+        isolation_level = self._connection.isolation_level
+        self._connection.isolation_level = None
+        try:
+            cursor.execute("BEGIN")
+            try:
+                return_data = self._bulk_replay_folder_entities(cursor, max_event_log_id)
+            except:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+        finally:
+            self._connection.isolation_level = isolation_level
+
+        self._invalidate_lookup_cache()
+
+        return return_data
+
+    def _bulk_replay_folder_entities(self, cursor, max_event_log_id):
+        """
+        Bulk loads all the FilesystemLocation entities of the current project
+        into the path cache. See :meth:`_replay_all_folder_entities` for details.
+
+        :param cursor: Sqlite database cursor, within a transaction.
+        :param max_event_log_id: max event log marker to write to the path
+                                 cache database.
+        :returns: A list of remote items which were added to the path cache.
+        """
+        log.debug("Full sync - clearing local sqlite path cache tables...")
+        cursor.execute("DELETE FROM event_log_sync")
+        cursor.execute("DELETE FROM shotgun_status")
+        cursor.execute("DELETE FROM path_cache")
+        for (index_name, _) in PATH_CACHE_INDICES:
+            cursor.execute("DROP INDEX IF EXISTS %s" % index_name)
+
+        # records are staged in id order, the staging rowid
+        # is used as the path cache rowid for kept records.
+        cursor.execute("DROP TABLE IF EXISTS temp.path_cache_sync")
+        cursor.execute("""CREATE TEMP TABLE path_cache_sync (shotgun_id integer,
+                                                            entity_type text,
+                                                            entity_id integer,
+                                                            entity_name text,
+                                                            root text,
+                                                            path text,
+                                                            primary_entity integer,
+                                                            is_primary integer,
+                                                            local_path text)""")
+
+        insert_sql = """INSERT INTO path_cache_sync(shotgun_id,
+                                                    entity_type,
+                                                    entity_id,
+                                                    entity_name,
+                                                    root,
+                                                    path,
+                                                    primary_entity,
+                                                    is_primary,
+                                                    local_path)
+                        VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+        rows = []
+        num_records = 0
+        for sg_location in self._iter_all_folder_entities():
+            num_records += 1
+            mapping = self._get_folder_mapping(sg_location)
+            if mapping is None:
+                continue
+            (entity, is_primary, local_os_path, root_name, relative_path) = mapping
+
+            rows.append((
+                sg_location["id"],
+                entity["type"],
+                entity["id"],
+                entity["name"],
+                root_name,
+                self._path_to_dbpath(relative_path),
+                is_primary,
+                1 if is_primary else 0,
+                local_os_path
+            ))
+            if len(rows) >= constants.PATH_CACHE_SYNC_PAGE_SIZE:
+                cursor.executemany(insert_sql, rows)
+                rows = []
+        if rows:
+            cursor.executemany(insert_sql, rows)
+
+        log.debug("Retrieved %s records in total, indexing them..." % num_records)
+        cursor.execute("CREATE INDEX path_cache_sync_path ON path_cache_sync(root, path, is_primary)")
+        cursor.execute(
+            "CREATE INDEX path_cache_sync_entity ON path_cache_sync(entity_type, entity_id, root, path, is_primary)"
+        )
+
+        # a path can only be associated with a single primary entity: the first
+        # primary record for a path wins and must agree with all the other ones.
+        res = cursor.execute("""
+            SELECT s.local_path, f.entity_type, f.entity_id, f.entity_name
+            FROM path_cache_sync s, path_cache_sync f
+            WHERE s.is_primary = 1
+            AND f.rowid = (SELECT MIN(rowid) FROM path_cache_sync
+                           WHERE root = s.root AND path = s.path AND is_primary = 1)
+            AND (s.entity_type != f.entity_type OR s.entity_id != f.entity_id)
+            ORDER BY s.rowid
+            LIMIT 1""")
+        conflict = res.fetchone()
+        if conflict:
+            curr_entity = {"type": str(conflict[1]), "id": conflict[2], "name": str(conflict[3])}
+            raise TankError("Database concurrency problems: The path '%s' is "
+                            "already associated with Shotgun entity %s. Please re-run "
+                            "folder creation to try again." % (conflict[0], str(curr_entity)))
+
+        # keep the first primary record for each path, and secondary records
+        # unless the same association was already made by an earlier record.
+        cursor.execute("""
+            INSERT INTO path_cache(rowid,
+                                   entity_type,
+                                   entity_id,
+                                   entity_name,
+                                   root,
+                                   path,
+                                   primary_entity)
+            SELECT s.rowid, s.entity_type, s.entity_id, s.entity_name, s.root, s.path, s.primary_entity
+            FROM path_cache_sync s
+            WHERE (s.is_primary = 1 AND s.rowid = (SELECT MIN(rowid) FROM path_cache_sync
+                                                   WHERE root = s.root AND path = s.path
+                                                   AND is_primary = 1))
+            OR (s.is_primary = 0 AND NOT EXISTS (SELECT 1 FROM path_cache_sync e
+                                                 WHERE e.entity_type = s.entity_type
+                                                 AND e.entity_id = s.entity_id
+                                                 AND e.root = s.root
+                                                 AND e.path = s.path
+                                                 AND e.rowid < s.rowid))
+            ORDER BY s.rowid""")
+
+        # all these records come from shotgun, so flag them as such
+        cursor.execute("""
+            INSERT INTO shotgun_status(path_cache_id, shotgun_id)
+            SELECT s.rowid, s.shotgun_id FROM path_cache_sync s, path_cache p
+            WHERE p.rowid = s.rowid""")
+
+        log.debug("Rebuilding path cache indices...")
+        for (_, index_sql) in PATH_CACHE_INDICES:
+            cursor.execute(index_sql)
+
+        return_data = []
+        res = cursor.execute("""
+            SELECT s.entity_type, s.entity_id, s.entity_name, s.local_path
+            FROM path_cache_sync s, path_cache p
+            WHERE p.rowid = s.rowid
+            ORDER BY s.rowid""")
+        for (entity_type, entity_id, entity_name, local_path) in res:
+            return_data.append({"entity": {"id": entity_id, "name": entity_name, "type": entity_type},
+                                "path": local_path,
+                                "metadata": SG_METADATA_FIELD})
+        log.debug("Added %s records to the path cache." % len(return_data))
+
+        cursor.execute("DROP TABLE temp.path_cache_sync")
+
+        # lastly, id of this event log entry for purpose of future syncing
+        log.debug("Inserting path cache marker %s in the sqlite db" % max_event_log_id)
+        cursor.execute("INSERT INTO event_log_sync(last_id) VALUES(?)", (max_event_log_id, ))
 
         return return_data
 
@@ -973,6 +1736,7 @@ class PathCache(object):
         else:
             # Shotgun insert complete! Now we can commit path cache transaction
             self._connection.commit()
+            self._invalidate_lookup_cache()
         
         finally:
             c.close()
@@ -1158,7 +1922,19 @@ class PathCache(object):
         :param cursor: Database cursor to use. If none, a new cursor will be created.
         :returns: A path on disk
         """
-        
+        if cursor is None and self._lookup_cache:
+            # lookups made as part of a larger transaction are never cached
+            return self._lookup_cache.get(
+                ("paths", entity_type, entity_id, primary_only),
+                lambda: self._get_paths(entity_type, entity_id, primary_only)
+            )
+        return self._get_paths(entity_type, entity_id, primary_only, cursor)
+
+    def _get_paths(self, entity_type, entity_id, primary_only, cursor=None):
+        """
+        Looks up the paths for a shotgun entity in the database.
+        See :meth:`get_paths` for details.
+        """
         if self._path_cache_disabled:
             # no entries because we don't have a path cache
             return []
@@ -1208,6 +1984,16 @@ class PathCache(object):
         :returns: Shotgun entity dict, e.g. {"type": "Shot", "name": "xxx", "id": 123} 
                   or None if not found
         """
+        if cursor is None and self._lookup_cache:
+            # lookups made as part of a larger transaction are never cached
+            return self._lookup_cache.get(("entity", path), lambda: self._get_entity(path))
+        return self._get_entity(path, cursor)
+
+    def _get_entity(self, path, cursor=None):
+        """
+        Looks up the primary entity for a path in the database.
+        See :meth:`get_entity` for details.
+        """
         if self._path_cache_disabled:
             # no entries because we don't have a path cache
             return None
@@ -1254,7 +2040,18 @@ class PathCache(object):
         :returns: list of shotgun entity dicts, e.g. [{"type": "Shot", "name": "xxx", "id": 123}] 
                   or [] if no entities associated.
         """
-        
+        if self._lookup_cache:
+            return self._lookup_cache.get(
+                ("secondary_entities", path),
+                lambda: self._get_secondary_entities(path)
+            )
+        return self._get_secondary_entities(path)
+
+    def _get_secondary_entities(self, path):
+        """
+        Looks up the secondary entities for a path in the database.
+        See :meth:`get_secondary_entities` for details.
+        """
         if self._path_cache_disabled:
             # no entries because we don't have a path cache
             return []
@@ -1282,7 +2079,106 @@ class PathCache(object):
             matches.append( {"type": type_str, "id": d[1], "name": name_str } )
 
         return matches
-    
+
+    def get_entities_for_path_and_parents(self, path):
+        """
+        Returns the primary and secondary entities associated with a path and with
+        each of its parent paths, up to and including the project root.
+
+        This is equivalent to calling :meth:`get_entity` and :meth:`get_secondary_entities`
+        for the path and each of its parents, but only runs a single database query.
+
+        :param path: a path on disk
+        :returns: list of (path, entity, secondary entities) tuples, ordered from the
+                  given path up to the root. The entity is a shotgun entity dict,
+                  e.g. {"type": "Shot", "name": "xxx", "id": 123}, or None if no
+                  primary entity is associated with the path. The secondary entities
+                  are a list of shotgun entity dicts.
+        """
+        if self._lookup_cache:
+            return self._lookup_cache.get(
+                ("path_and_parents", path),
+                lambda: self._get_entities_for_path_and_parents(path)
+            )
+        return self._get_entities_for_path_and_parents(path)
+
+    def _get_entities_for_path_and_parents(self, path):
+        """
+        Looks up the entities for a path and its parents in the database.
+        See :meth:`get_entities_for_path_and_parents` for details.
+        """
+        # gather all roots as lower case
+        project_roots = [x.lower() for x in self._tk.pipeline_configuration.get_data_roots().values()]
+
+        # first collect the path and its parents
+        paths = []
+        curr_path = path
+        while True:
+            paths.append(curr_path)
+
+            if curr_path.lower() in project_roots:
+                # we have reached a root!
+                break
+
+            # and continue with parent path
+            parent_path = os.path.abspath(os.path.join(curr_path, ".."))
+
+            if curr_path == parent_path:
+                # We're at the disk root, probably a degenerate path
+                break
+            else:
+                curr_path = parent_path
+
+        # now resolve the location of all the paths in the database
+        db_locations = {}
+        if not self._path_cache_disabled:
+            for curr_path in paths:
+                try:
+                    root_name, relative_path = self._separate_root(curr_path)
+                except TankError:
+                    # fail gracefully if path is not a valid path
+                    # eg. doesn't belong to the project
+                    continue
+                db_locations[curr_path] = (root_name, self._path_to_dbpath(relative_path))
+
+        # and grab all the entities in a single query. Note that filtering on both the
+        # root and the path allows the path_cache_path index to be used.
+        matches = collections.defaultdict(list)
+        if db_locations:
+            root_names = list(set(x[0] for x in db_locations.values()))
+            db_paths = list(set(x[1] for x in db_locations.values()))
+            c = self._connection.cursor()
+            try:
+                res = c.execute(
+                    "SELECT root, path, primary_entity, entity_type, entity_id, entity_name "
+                    "FROM path_cache WHERE root IN (%s) AND path IN (%s) ORDER BY rowid" % (
+                        ",".join("?" * len(root_names)), ",".join("?" * len(db_paths))
+                    ),
+                    root_names + db_paths
+                )
+                for d in res:
+                    # convert to string, not unicode!
+                    entity = {"type": str(d[3]), "id": d[4], "name": str(d[5])}
+                    matches[(d[0], d[1], d[2])].append(entity)
+            finally:
+                c.close()
+
+        results = []
+        for curr_path in paths:
+            entity = None
+            secondary_entities = []
+            if curr_path in db_locations:
+                (root_name, db_path) = db_locations[curr_path]
+                primary_entities = matches.get((root_name, db_path, 1), [])
+                if len(primary_entities) > 1:
+                    # never supposed to happen!
+                    raise TankError("More than one entry in path database for %s!" % curr_path)
+                elif len(primary_entities) == 1:
+                    entity = primary_entities[0]
+                secondary_entities = matches.get((root_name, db_path, 0), [])
+            results.append((curr_path, entity, secondary_entities))
+
+        return results
 
     def ensure_all_entries_are_in_shotgun(self):
         """
@@ -110,7 +110,7 @@ class PipelineConfiguration(object):
             self._bundle_cache_fallback_paths = []
 
         # Populate the global yaml_cache if we find a pickled cache
-        # on disk.
+        # on disk and hook up the compiled cache for the config.
         # TODO: For immutable configs, move this into bootstrap
         self._populate_yaml_cache()
 
@@ -207,9 +207,19 @@ class PipelineConfiguration(object):
 
     def _populate_yaml_cache(self):
         """
-        Loads pickled yaml_cache items if they are found and merges them into
-        the global YamlCache.
+        Registers the compiled yaml cache of this configuration with the global
+        YamlCache, so that the yaml files of the configuration are only parsed
+        once each time they change. The compiled cache is kept up to date
+        automatically.
+
+        Pickled yaml_cache items written by older versions of the cache_yaml
+        command are also loaded if they are found and merged into the global
+        YamlCache.
         """
+        yaml_cache.g_yaml_cache.add_compiled_cache(
+            os.path.join(self._pc_root, constants.COMPILED_YAML_CACHE_FILE)
+        )
+
         cache_file = os.path.join(self._pc_root, "yaml_cache.pickle")
         if not os.path.exists(cache_file):
             return
@@ -819,7 +829,7 @@ class PipelineConfiguration(object):
         )
 
         try:
-            data = yaml_cache.g_yaml_cache.get(templates_file, deepcopy_data=False)
+            data = yaml_cache.g_yaml_cache.get_frozen(templates_file)
             data = template_includes.process_includes(templates_file, data)
         except TankUnreadableFileError:
             data = dict()
@@ -136,7 +136,8 @@ class Engine(TankBundle):
             tk,
             context,
             engine_schema,
-            settings
+            settings,
+            descriptor
         )
         
         # set up any frameworks defined
@@ -676,6 +677,10 @@ class Engine(TankBundle):
         LogManager().root_logger.removeHandler(self.__log_handler)
         self.__log_handler = None
 
+        # make sure everything logged so far is written to the log file
+        if LogManager().base_file_handler:
+            LogManager().base_file_handler.flush()
+
     def destroy_engine(self):
         """
         Called when the engine should tear down itself and all its apps.
@@ -1967,6 +1972,7 @@ class Engine(TankBundle):
                     self.context,
                     app_schema,
                     app_settings,
+                    descriptor,
                 )
 
             except TankError, e:
@@ -89,14 +89,15 @@ class Environment(object):
         # app settings are keyed by tuple (engine_name, app_name)
         self.__app_settings = {}
 
-        # populate the above data structures
-        # pass a copy of the data since process is destructive
-        d = copy.deepcopy(self._env_data)
-        self.__process_engines(d.get("engines"))
+        # populate the above data structures. The data is shared with the yaml
+        # cache, so the processing copies the settings of each item it modifies.
+        # The engines, apps and frameworks mappings are iterated through shallow
+        # copies, so that items are listed in the same order as with a full copy.
+        self.__process_engines(self._env_data.get("engines"))
 
         if "frameworks" in self._env_data:
             # there are frameworks defined! Process them
-            self.__process_frameworks(d.get("frameworks"))
+            self.__process_frameworks(self._env_data.get("frameworks"))
 
         # now extract the location key for all the configs
         # these two dicts are keyed in the same way as the settings dicts
@@ -132,9 +133,10 @@ class Environment(object):
         if data is None:
             return
         # iterate over the apps dict
-        for app, app_settings in data.items():
+        for app, app_settings in dict(data).items():
             if not self.__is_item_disabled(app_settings):
-                self.__app_settings[(engine, app)] = app_settings
+                # copied since the location key is removed from the settings
+                self.__app_settings[(engine, app)] = dict(app_settings)
 
     def __process_engines(self, engines):
         """
@@ -143,9 +145,11 @@ class Environment(object):
         if engines is None:
             return
         # iterate over the engine dict
-        for engine, engine_settings in engines.items():
+        for engine, engine_settings in dict(engines).items():
             # Check for engine disabled
             if not self.__is_item_disabled(engine_settings):
+                # copied since the apps and location keys are removed from the settings
+                engine_settings = dict(engine_settings)
                 engine_apps = engine_settings.pop('apps')
                 self.__process_apps(engine, engine_apps)
                 self.__engine_settings[engine] = engine_settings
@@ -157,10 +161,11 @@ class Environment(object):
         if frameworks is None:
             return
 
-        for fw, fw_settings in frameworks.items():
+        for fw, fw_settings in dict(frameworks).items():
             # Check for framework disabled
             if not self.__is_item_disabled(fw_settings):
-                self.__framework_settings[fw] = fw_settings
+                # copied since the location key is removed from the settings
+                self.__framework_settings[fw] = dict(fw_settings)
 
     def __extract_locations(self):
         """
@@ -323,9 +328,10 @@ class Environment(object):
 
     def __load_data(self, path):
         """
-        loads the main data from disk, raw form
+        loads the main data from disk, raw form. The returned data
+        is shared with the yaml cache and is read-only.
         """
-        return g_yaml_cache.get(path)
+        return g_yaml_cache.get_frozen(path)
 
     def find_location_for_engine(self, engine_name):
         """
@@ -228,7 +228,7 @@ def _process_includes_r(file_name, data, context):
     for include_file in include_files:
                 
         # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
+        included_data = g_yaml_cache.get_frozen(include_file) or {}
                 
         # now resolve this data before proceeding
         included_data, included_fw_lookup = _process_includes_r(include_file, included_data, context)
@@ -273,7 +273,7 @@ def find_framework_location(file_name, framework_name, context):
                             defined in or None if not found.
     """
     # load the data in for the root file:
-    data = g_yaml_cache.get(file_name)
+    data = g_yaml_cache.get_frozen(file_name)
 
     # track root frameworks:
     root_fw_lookup = {}
@@ -296,7 +296,7 @@ def find_reference(file_name, context, token):
     """
     
     # load the data in 
-    data = g_yaml_cache.get(file_name)
+    data = g_yaml_cache.get_frozen(file_name)
     
     # first build our big fat lookup dict
     include_files = _resolve_includes(file_name, data, context)
@@ -306,7 +306,7 @@ def find_reference(file_name, context, token):
     for include_file in include_files:
                 
         # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
+        included_data = g_yaml_cache.get_frozen(include_file) or {}
         
         if token in included_data:
             found_file = include_file
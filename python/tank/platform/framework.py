@@ -292,7 +292,8 @@ def load_framework(engine_obj, env, fw_instance_name):
                                      engine_obj.tank, 
                                      engine_obj.context, 
                                      fw_schema, 
-                                     fw_settings)
+                                     fw_settings,
+                                     descriptor)
 
     except TankError, e:
         # validation error - probably some issue with the settings!
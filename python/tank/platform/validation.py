@@ -12,8 +12,14 @@
 App configuration and schema validation.
 
 """
+from __future__ import with_statement
+
 import os
 import sys
+import json
+import hashlib
+import weakref
+import threading
 
 from . import constants
 from ..errors import TankError, TankNoDefaultValueError
@@ -30,16 +36,91 @@ def validate_schema(app_or_engine_display_name, schema):
     v = _SchemaValidator(app_or_engine_display_name, schema)
     v.validate()
 
-def validate_settings(app_or_engine_display_name, tank_api, context, schema, settings):
+# settings which validated successfully, for each toolkit instance.
+# Values are tuples (templates, set of validation keys), where templates
+# is the dictionary of templates the settings were validated against.
+_validated_settings = weakref.WeakKeyDictionary()
+_validated_settings_lock = threading.Lock()
+
+def validate_settings(app_or_engine_display_name, tank_api, context, schema, settings, descriptor=None):
     """
     Validates the settings of an app or engine against its
     schema definition (info.yml).
+
+    If the descriptor of the app or engine is given, successful validations
+    are remembered and not carried out again for the same settings and schema,
+    as long as the context has the same project, entity and step, the templates
+    haven't been reloaded and the hooks folder hasn't changed. This avoids
+    resolving template fields from the context for each app every time an
+    engine starts or changes context.
     
     Will raise a TankError if validation fails, will return None
     if validation succeeds.
     """
+    key = None
+    if descriptor is not None:
+        key = _get_validation_key(tank_api, context, schema, settings, descriptor)
+        with _validated_settings_lock:
+            (templates, validated) = _validated_settings.get(tank_api, (None, None))
+            if templates is tank_api.templates and key in validated:
+                return
+
     v = _SettingsValidator(app_or_engine_display_name, tank_api, schema, context)
     v.validate(settings)
+
+    if key is not None:
+        with _validated_settings_lock:
+            (templates, validated) = _validated_settings.get(tank_api, (None, None))
+            if templates is not tank_api.templates:
+                # templates have been reloaded, drop previous validations
+                validated = set()
+                _validated_settings[tank_api] = (tank_api.templates, validated)
+            validated.add(key)
+
+def _get_validation_key(tank_api, context, schema, settings, descriptor):
+    """
+    Returns a key identifying the validation of some settings, see :func:`validate_settings`.
+    """
+    # settings and schema are plain data loaded from yaml files
+    fingerprint = hashlib.sha1(
+        json.dumps([schema, settings], sort_keys=True, default=repr)
+    ).hexdigest()
+
+    if context is None:
+        context_signature = None
+    else:
+        # the task only matters for its presence, template fields are
+        # resolved from the other entities. The user is left out: reading
+        # it can query Shotgun, and unless it is baked into the context it
+        # is the current user, the same for all the contexts of a session.
+        context_signature = (
+            _get_entity_signature(context.project),
+            _get_entity_signature(context.entity),
+            _get_entity_signature(context.step),
+            tuple(_get_entity_signature(x) for x in context.additional_entities),
+            context.task is not None,
+        )
+
+    # hooks referenced by the settings are checked for existence
+    try:
+        hooks_mtime = os.path.getmtime(tank_api.pipeline_configuration.get_hooks_location())
+    except OSError:
+        hooks_mtime = None
+
+    # hooks may be resolved from the current engine
+    from .engine import current_engine
+    engine = current_engine()
+    engine_location = engine.disk_location if engine else None
+
+    return (descriptor.get_uri(), fingerprint, context_signature, hooks_mtime, engine_location)
+
+def _get_entity_signature(entity):
+    """
+    Returns a hashable signature for an entity dictionary of a context.
+    """
+    if entity is None:
+        return None
+    return (entity.get("type"), entity.get("id"))
     
     
 def validate_context(descriptor, context):
@@ -20,7 +20,9 @@ import sys
 from . import templatekey
 from .errors import TankError
 from . import constants
-from .template_path_parser import TemplatePathParser
+from .template_path_parser import TemplatePathParser, CompiledPathPattern
+from .util import concurrency
+from .util.lru_cache import LRUCache
 
 class Template(object):
     """
@@ -103,6 +105,10 @@ class Template(object):
         # string which will be prefixed to definition
         self._prefix = ''
         self._static_tokens = []
+        self._path_patterns = []
+
+        # results of parsing paths, keyed by normalized path and skip keys
+        self._parse_cache = LRUCache(constants.TEMPLATE_PARSE_CACHE_SIZE)
 
     def __repr__(self):
         class_name = self.__class__.__name__
@@ -360,6 +366,16 @@ class Template(object):
         # Remove empty strings
         return [x for x in tokens if x]
 
+    def _compile_path_patterns(self):
+        """
+        Compiles the patterns used to quickly reject paths which can't match
+        any of the definition variations. Needs to be called once the static
+        tokens have been calculated.
+        """
+        self._path_patterns = []
+        for ordered_keys, static_tokens in zip(self._ordered_keys, self._static_tokens):
+            self._path_patterns.append(CompiledPathPattern(ordered_keys, static_tokens))
+
     @property
     def parent(self):
         """
@@ -398,10 +414,9 @@ class Template(object):
         skip_keys = skip_keys or []
         
         # Path should split into keys as per template
-        path_fields = {}
-        try:
-            path_fields = self.get_fields(path, skip_keys=skip_keys)
-        except TankError:
+        input_path = self._normalize_path(path)
+        path_fields = self._parse_normalized_path(input_path, input_path.lower(), skip_keys)
+        if path_fields is None:
             return None
         
         # Check that all required fields were found in the path:
@@ -456,20 +471,147 @@ class Template(object):
         :returns: Values found in the path based on keys in template
         :rtype: Dictionary
         """
-        path_parser = None
-        fields = None
+        input_path = self._normalize_path(input_path)
+        return self._get_fields_from_normalized_path(input_path, input_path.lower(), skip_keys)
 
-        for ordered_keys, static_tokens in zip(self._ordered_keys, self._static_tokens):
-            path_parser = TemplatePathParser(ordered_keys, static_tokens)
-            fields = path_parser.parse_path(input_path, skip_keys)
-            if fields != None:
-                break
+    def get_fields_many(self, input_paths, skip_keys=None, max_workers=None):
+        """
+        Extracts key name, value pairs from a list of strings. This is equivalent
+        to calling :meth:`get_fields` for each of the strings, except that paths
+        which don't match the template don't raise an error. Example::
+
+            >>> template_path.get_fields_many([good_path, bad_path])
+            [{'Sequence': 'seq_1',
+              'Shot': 'shot_2',
+              'Step': 'comp',
+              'name': 'henry',
+              'version': 3},
+             None]
+
+        :param input_paths: Source paths for values
+        :type input_paths: List of strings
+        :param skip_keys: Optional keys to skip
+        :type skip_keys: List
+        :param max_workers: Optional maximum number of threads used to process
+                            the paths in chunks. By default, all paths are
+                            processed in the calling thread.
+        :type max_workers: Integer
 
+        :returns: For each input path, the values found in the path based on keys
+                  in the template or None if the path doesn't match the template.
+        :rtype: List of dictionaries
+        """
+        def get_chunk_fields(chunk):
+            chunk_fields = []
+            for input_path in chunk:
+                input_path = self._normalize_path(input_path)
+                chunk_fields.append(self._parse_normalized_path(input_path, input_path.lower(), skip_keys))
+            return chunk_fields
+
+        chunks = concurrency.split_in_chunks(input_paths, constants.TEMPLATE_BATCH_CHUNK_SIZE)
+        results = []
+        for chunk_fields in concurrency.map_concurrently(get_chunk_fields, chunks, max_workers):
+            results.extend(chunk_fields)
+        return results
+
+    def _normalize_path(self, input_path):
+        """
+        Normalizes a path before it gets parsed.
+
+        :param input_path: Source path for values
+        :returns: Normalized path
+        """
+        return os.path.normpath(input_path)
+
+    def _get_fields_from_normalized_path(self, input_path, lower_path, skip_keys=None,
+                                         token_positions_cache=None):
+        """
+        Extracts key name, value pairs from a path which has already been normalized.
+
+        :param input_path: Normalized source path for values
+        :param lower_path: Normalized source path, in lower case
+        :param skip_keys: Optional keys to skip
+        :param token_positions_cache: Optional dictionary used to share the position of
+                                      static tokens in the path between templates.
+
+        :returns: Values found in the path based on keys in template
+        :raises: :class:`TankError` if the path doesn't match the template.
+        """
+        fields = self._parse_normalized_path(input_path, lower_path, skip_keys, token_positions_cache)
         if fields is None:
+            # parse the path again, without taking any shortcuts, to report
+            # why it doesn't match the template.
+            path_parser = None
+            for ordered_keys, static_tokens in zip(self._ordered_keys, self._static_tokens):
+                path_parser = TemplatePathParser(ordered_keys, static_tokens)
+                path_parser.parse_normalized_path(input_path, lower_path, skip_keys)
             raise TankError("Template %s: %s" % (str(self), path_parser.last_error))
 
         return fields
 
+    def _parse_normalized_path(self, input_path, lower_path, skip_keys=None,
+                               token_positions_cache=None):
+        """
+        Extracts key name, value pairs from a path which has already been normalized.
+        Results are cached for subsequent calls with the same path and skip keys.
+
+        :param input_path: Normalized source path for values
+        :param lower_path: Normalized source path, in lower case
+        :param skip_keys: Optional keys to skip
+        :param token_positions_cache: Optional dictionary used to share the position of
+                                      static tokens in the path between templates.
+
+        :returns: Values found in the path based on keys in template or None
+                  if the path doesn't match the template.
+        """
+        if isinstance(skip_keys, basestring):
+            cache_key = (input_path, skip_keys)
+        else:
+            cache_key = (input_path, tuple(sorted(skip_keys or [])))
+
+        # the cached value is wrapped in a tuple so that paths which
+        # failed to parse can be told apart from uncached paths.
+        cached_result = self._parse_cache.get(cache_key)
+        if cached_result is None:
+            fields = None
+            for ordered_keys, static_tokens, path_pattern in zip(self._ordered_keys,
+                                                                 self._static_tokens,
+                                                                 self._path_patterns):
+                # key constraints don't apply to skipped keys so the
+                # compiled pattern can't be used when keys are skipped.
+                if not skip_keys and not path_pattern.may_match(lower_path):
+                    continue
+                path_parser = TemplatePathParser(ordered_keys, static_tokens)
+                fields = path_parser.parse_normalized_path(input_path, lower_path, skip_keys,
+                                                           token_positions_cache)
+                if fields != None:
+                    break
+
+            cached_result = (fields,)
+            self._parse_cache.set(cache_key, cached_result)
+
+        fields = cached_result[0]
+        if fields is None:
+            return None
+
+        # hand out a copy so that callers can't modify the cached fields
+        return dict(fields)
+
+    def get_parse_cache_stats(self):
+        """
+        Returns statistics about the cache holding the results of parsing
+        paths against this template, e.g. via :meth:`get_fields` or :meth:`validate`.
+
+        :returns: Dictionary with keys ``hits``, ``misses``, ``size`` and ``max_size``.
+        """
+        return self._parse_cache.get_stats()
+
+    def clear_parse_cache(self):
+        """
+        Clears the cache holding the results of parsing paths against this template.
+        """
+        self._parse_cache.clear()
+
 
 class TemplatePath(Template):
     """
@@ -506,6 +648,8 @@ class TemplatePath(Template):
         for definition in self._definitions:
             self._static_tokens.append(self._calc_static_tokens(definition))
 
+        self._compile_path_patterns()
+
     @property
     def root_path(self):
         """
@@ -612,6 +756,8 @@ class TemplateString(Template):
         self._static_tokens = []
         for definition in self._definitions:
             self._static_tokens.append(self._calc_static_tokens(definition))
+
+        self._compile_path_patterns()
     
     @property
     def parent(self):
@@ -638,9 +784,18 @@ class TemplateString(Template):
         :returns: Values found in the path based on keys in template
         :rtype: Dictionary
         """
+        return super(TemplateString, self).get_fields(input_path, skip_keys=skip_keys)
+
+    def _normalize_path(self, input_path):
+        """
+        Normalizes a string before it gets parsed.
+
+        :param input_path: Source string for values
+        :returns: Normalized string, including the template prefix.
+        """
         # add path prefix as original design was to require project root
         adj_path = os.path.join(self._prefix, input_path)
-        return super(TemplateString, self).get_fields(adj_path, skip_keys=skip_keys)
+        return super(TemplateString, self)._normalize_path(adj_path)
 
 def split_path(input_path):
     """
@@ -767,7 +922,10 @@ def _conform_template_data(template_data, template_name):
     """
     if isinstance(template_data, basestring):
         template_data = {"definition": template_data}
-    elif not isinstance(template_data, dict):
+    elif isinstance(template_data, dict):
+        # work on a copy, the data may come straight from the read-only yaml cache.
+        template_data = dict(template_data)
+    else:
         raise TankError("template %s has data which is not a string or dictionary." % template_name)
 
     if "definition" not in template_data:
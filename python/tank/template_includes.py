@@ -106,7 +106,7 @@ def _process_template_includes_r(file_name, data):
     included_paths = _get_includes(file_name, data)
     
     for included_path in included_paths:
-        included_data = yaml_cache.g_yaml_cache.get(included_path, deepcopy_data=False) or dict()
+        included_data = yaml_cache.g_yaml_cache.get_frozen(included_path) or dict()
         
         # before doing any type of processing, allow the included data to be resolved.
         included_data = _process_template_includes_r(included_path, included_data)
@@ -191,9 +191,10 @@ def process_includes(file_name, data):
             if resolved_template_str == template_str:
                 continue
                 
-            # set the value back again:
+            # set the value back again. Note that the definition is not updated
+            # in place since it may be part of read-only cached data.
             if complex_syntax:
-                templates[template_name]["definition"] = resolved_template_str
+                templates[template_name] = dict(template_definition, definition=resolved_template_str)
             else:
                 templates[template_name] = resolved_template_str
                 
@@ -293,7 +294,7 @@ def _resolve_template_r(template_paths, template_strings, template_name, templat
     # put the value back:
     templates = {"path":template_paths, "string":template_strings}[template_type]
     if complex_syntax:
-        templates[template_name]["definition"] = resolved_template_str
+        templates[template_name] = dict(template_definition, definition=resolved_template_str)
     else:
         templates[template_name] = resolved_template_str
         
@@ -0,0 +1,151 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Indexed lookup of the templates which may match a given path.
+"""
+
+import os
+
+from .template import TemplatePath
+
+
+class TemplateMatcher(object):
+    """
+    Prebuilt index over a collection of templates, used to quickly narrow down
+    the templates that could possibly match a path before running the full
+    key-level validation on them.
+
+    Each :class:`TemplatePath` is indexed by the directory part of the first
+    static token of each of its definition variations (for example
+    ``/studio/proj/sequences/``). A path will only be considered a candidate
+    for a template if one of its variations has all of its static tokens
+    appearing, in order, in the path and if the path starts with the first
+    static token. These are the same conditions :class:`TemplatePathParser`
+    checks before trying to resolve any key values, so the set of templates
+    that end up validating is always the same as if every template had been
+    validated.
+
+    Templates which are not path templates (e.g. :class:`TemplateString`)
+    adjust the input before parsing and are therefore never filtered out.
+    """
+
+    def __init__(self, templates):
+        """
+        Constructor.
+
+        :param templates: Dictionary of template names to template objects,
+                          as returned by :meth:`~tank.template.read_templates`.
+        """
+        # keep a shallow copy of the templates so that we can detect when
+        # the dictionary we were built from has been modified.
+        self._snapshot = dict(templates)
+
+        # templates are tracked by the order in which they are returned when
+        # iterating over the dictionary so that the candidates can be returned
+        # in the exact same order as a plain loop over the templates would.
+        self._templates = []
+
+        # directory prefix -> list of (template index, static tokens)
+        self._prefix_index = {}
+        # indices of templates that should always be validated
+        self._unindexed = []
+
+        for index, (name, template) in enumerate(templates.items()):
+            self._templates.append(template)
+
+            if not isinstance(template, TemplatePath) or not all(template._static_tokens):
+                self._unindexed.append(index)
+                continue
+
+            for static_tokens in template._static_tokens:
+                first_token = static_tokens[0] if static_tokens else ""
+                prefix = first_token[:first_token.rfind(os.path.sep) + 1]
+                self._prefix_index.setdefault(prefix, []).append((index, static_tokens))
+
+    def is_valid_for(self, templates):
+        """
+        Checks if this matcher reflects the given templates dictionary.
+
+        :param templates: Dictionary of template names to template objects.
+        :returns: True if the matcher was built from an identical dictionary.
+        """
+        # note: templates don't implement equality so this compares
+        # the template objects by identity.
+        return templates == self._snapshot
+
+    def get_candidates(self, path):
+        """
+        Returns the templates that could possibly match the given path, in the
+        order in which they appear in the templates dictionary.
+
+        :param path: Path to find candidate templates for.
+        :returns: List of :class:`Template` objects.
+        """
+        return self.get_candidates_from_normalized_path(os.path.normpath(path).lower())
+
+    def get_candidates_from_normalized_path(self, lower_path):
+        """
+        Returns the templates that could possibly match the given normalized
+        path. See :meth:`get_candidates` for details.
+
+        :param lower_path: Normalized path, in lower case.
+        :returns: List of :class:`Template` objects.
+        """
+        candidate_indices = set(self._unindexed)
+
+        # The path parser allows for a key value to appear in front of the
+        # first static token, as long as that value doesn't contain a path
+        # separator. The first static token can therefore start anywhere up
+        # to and including the first separator in the path.
+        first_sep = lower_path.find(os.path.sep)
+        if first_sep < 0:
+            first_sep = len(lower_path)
+
+        for start in range(first_sep + 1):
+            sub_path = lower_path[start:]
+
+            # look up every directory prefix of the path in the index
+            prefixes = [""]
+            sep_pos = sub_path.find(os.path.sep)
+            while sep_pos >= 0:
+                prefixes.append(sub_path[:sep_pos + 1])
+                sep_pos = sub_path.find(os.path.sep, sep_pos + 1)
+
+            for prefix in prefixes:
+                for (index, static_tokens) in self._prefix_index.get(prefix, []):
+                    if index in candidate_indices:
+                        continue
+                    if _tokens_match(sub_path, static_tokens):
+                        candidate_indices.add(index)
+
+        return [self._templates[index] for index in sorted(candidate_indices)]
+
+
+def _tokens_match(path, static_tokens):
+    """
+    Checks that the path starts with the first static token and that all the
+    static tokens can be found, in order, in the path.
+
+    :param path: Normalized, lower case path.
+    :param static_tokens: List of lower case static tokens for a template definition.
+    :returns: True if the tokens could be found, False otherwise.
+    """
+    if not static_tokens or not path.startswith(static_tokens[0]):
+        return False
+
+    position = len(static_tokens[0])
+    for token in static_tokens[1:]:
+        position = path.find(token, position)
+        if position < 0:
+            return False
+        position += len(token)
+
+    return True
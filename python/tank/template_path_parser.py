@@ -13,7 +13,13 @@ Parsing of template paths into values for specified keys using a list of static
 """
 
 import os
+import re
+
 from .errors import TankError
+from .templatekey import StringKey, IntegerKey, SequenceKey, TimestampKey
+
+# matches encoded strings containing characters outside of the ascii range
+_NON_ASCII_REGEX = re.compile(r"[\x80-\xff]")
 
 class TemplatePathParser(object):
     """
@@ -87,12 +93,30 @@ class TemplatePathParser(object):
         :returns:           If succesful, a dictionary of fields mapping key names to 
                             their values. None if the fields can't be resolved. 
         """
-        skip_keys = skip_keys or []
         input_path = os.path.normpath(input_path)
 
         # all token comparisons are done case insensitively.
-        lower_path = input_path.lower()
-        
+        return self.parse_normalized_path(input_path, input_path.lower(), skip_keys)
+
+    def parse_normalized_path(self, input_path, lower_path, skip_keys, token_positions_cache=None):
+        """
+        Parses a path that has already been normalized. See :meth:`parse_path` for details.
+
+        This allows the normalization of a path to be shared when it is parsed
+        against many different sets of keys and static tokens.
+
+        :param input_path:  The normalized path to parse.
+        :param lower_path:  The normalized path, in lower case.
+        :param skip_keys:   List of keys for whom we do not need to find values.
+        :param token_positions_cache: Optional dictionary used to share the
+                            positions of static tokens found in the path between
+                            parsers. It should only ever be used for a single path.
+
+        :returns:           If succesful, a dictionary of fields mapping key names to 
+                            their values. None if the fields can't be resolved. 
+        """
+        skip_keys = skip_keys or []
+
         # if no keys, nothing to discover
         if not self.ordered_keys:
             if lower_path == self.static_tokens[0]:
@@ -123,20 +147,21 @@ class TemplatePathParser(object):
         token_positions = []
         start_pos = 0
         for token in self.static_tokens:
-            positions = []
-            token_pos = start_pos
-                
-            while token_pos >= 0:
-                token_pos = lower_path.find(token, token_pos)
-                if token_pos >= 0:
-                    if not positions:
-                        # this is the first instance of this token we found so it
-                        # will be the start position to look for the next token
-                        # as it will be the first possible location available!
-                        start_pos = token_pos + len(token)
-                    positions.append(token_pos)
-                    token_pos += len(token)
-            if not positions:
+            if token_positions_cache is None:
+                positions = _find_token_positions(lower_path, token, start_pos)
+            else:
+                cache_key = (token, start_pos)
+                positions = token_positions_cache.get(cache_key)
+                if positions is None:
+                    positions = _find_token_positions(lower_path, token, start_pos)
+                    token_positions_cache[cache_key] = positions
+
+            if positions:
+                # the first instance of this token will be the start position
+                # to look for the next token as it will be the first possible
+                # location available!
+                start_pos = positions[0] + len(token)
+            else:
                 # didn't find token!
                 self.last_error = ("Tried to extract fields from path '%s', "
                                    "but the path does not fit the template." % input_path)
@@ -358,4 +383,176 @@ class TemplatePathParser(object):
                                                                     fully_resolved, 
                                                                     last_error))
             
-        return possible_values
\ No newline at end of file
+        return possible_values
+
+def _find_token_positions(lower_path, token, start_pos):
+    """
+    Finds all the non-overlapping occurrences of a static token in a path.
+
+    :param lower_path:  The path to search, in lower case.
+    :param token:       The static token to look for.
+    :param start_pos:   The position in the path to start looking from.
+
+    :returns:           List of positions where the token was found.
+    """
+    positions = []
+    token_pos = lower_path.find(token, start_pos)
+    while token_pos >= 0:
+        positions.append(token_pos)
+        token_pos = lower_path.find(token, token_pos + len(token))
+    return positions
+
+
+class CompiledPathPattern(object):
+    """
+    Regular expression compiled from a set of keys and static tokens, used to
+    quickly reject paths before parsing them with a :class:`TemplatePathParser`.
+
+    The expression is matched against the lower case version of a path. It
+    mirrors the way the parser pairs up keys and static tokens and encodes the
+    key constraints which can be expressed as a pattern, e.g. integer keys only
+    containing digits or string keys limited to a set of choices. It always
+    accepts every path the parser would be able to resolve, so a path which
+    doesn't match can't be parsed successfully, while a path which matches
+    still needs to be parsed to extract and validate the key values.
+
+    Key constraints are not taken into account for keys which are skipped.
+    """
+
+    def __init__(self, ordered_keys, static_tokens):
+        """
+        Construction
+
+        :param ordered_keys:    Template key objects in order that they appear in the
+                                template definition.
+        :param static_tokens:   Pieces of the definition that don't represent Template Keys.
+        """
+        # set when the pattern relies on unicode character classes, which
+        # can't be evaluated on encoded strings
+        self._uses_unicode_classes = False
+        self._regex = re.compile(self._build_pattern(ordered_keys, static_tokens), re.UNICODE)
+
+    def may_match(self, lower_path):
+        """
+        Checks if a path could be parsed successfully.
+
+        :param lower_path:  The normalized path, in lower case.
+        :returns:           False if the path can't be parsed, True if it may be.
+        """
+        if (self._uses_unicode_classes and
+                isinstance(lower_path, str) and _NON_ASCII_REGEX.search(lower_path)):
+            # the string is encoded, there is no way to tell which characters
+            # the key values will be made of once decoded.
+            return True
+        return self._regex.match(lower_path) is not None
+
+    def _build_pattern(self, ordered_keys, static_tokens):
+        """
+        Builds the regular expression for a set of keys and static tokens.
+
+        :param ordered_keys:    Template key objects in order that they appear in the
+                                template definition.
+        :param static_tokens:   Pieces of the definition that don't represent Template Keys.
+        :returns:               Regular expression string.
+        """
+        if not ordered_keys:
+            return r"%s\Z" % re.escape(static_tokens[0])
+
+        key_patterns = [self._key_pattern(key) for key in ordered_keys]
+        tokens = [re.escape(token) for token in static_tokens]
+
+        # the parser considers both the path starting with the first static
+        # token and the path starting with a key value.
+        alternatives = []
+        if len(key_patterns) >= len(tokens) - 1:
+            remainder = _build_remainder_pattern(key_patterns, tokens[1:])
+            if remainder is not None:
+                alternatives.append(tokens[0] + remainder)
+        if len(key_patterns) >= len(tokens):
+            remainder = _build_remainder_pattern(key_patterns, tokens)
+            if remainder is not None:
+                alternatives.append(remainder)
+
+        if not alternatives:
+            # nothing can ever be resolved
+            return r"(?!)"
+
+        return r"(?:%s)\Z" % "|".join(alternatives)
+
+    def _key_pattern(self, key):
+        """
+        Returns a pattern matching the lower case version of any value the
+        parser would accept for a key.
+
+        :param key: :class:`TemplateKey` to get the pattern for.
+        :returns:   Regular expression string.
+        """
+        # values can't contain path separators
+        any_char = "[^%s]" % re.escape(os.path.sep)
+
+        if isinstance(key, (SequenceKey, TimestampKey)):
+            # these accept a number of special formats
+            return "%s+" % any_char
+
+        if isinstance(key, IntegerKey):
+            if key.strict_matching:
+                # padded digits - the validation tolerates a trailing new line.
+                padding = "" if key.format_spec.startswith("0") else " "
+                return r"[%s0-9]+\n?" % padding
+            return "%s+" % any_char
+
+        if isinstance(key, StringKey):
+            if key.choices:
+                # choices are compared case insensitively
+                try:
+                    choices = [str(choice).lower() for choice in key.choices]
+                except UnicodeError:
+                    return "%s+" % any_char
+                # try the longest choices first
+                choices.sort(key=len, reverse=True)
+                return "(?:%s)" % "|".join([re.escape(choice) for choice in choices])
+
+            if key.filter_by == "alphanumeric":
+                self._uses_unicode_classes = True
+                char = r"[^\W_]"
+            elif key.filter_by == "alpha":
+                self._uses_unicode_classes = True
+                char = r"[^\W_0-9]"
+            else:
+                char = any_char
+
+            if key.length is not None:
+                return "%s{%d}" % (char, key.length)
+            return "%s+" % char
+
+        return "%s+" % any_char
+
+
+def _build_remainder_pattern(key_patterns, tokens):
+    """
+    Builds the pattern for alternating keys and static tokens, in the same way
+    :meth:`TemplatePathParser.__find_possible_key_values_recursive` resolves
+    them: each key is followed by the next token, if any, and the path is
+    allowed to end after any token as long as there are keys left.
+
+    :param key_patterns:    Patterns for the remaining keys.
+    :param tokens:          Escaped remaining static tokens.
+    :returns:               Regular expression string, or None if the
+                            keys and tokens can't ever be resolved.
+    """
+    key_pattern = key_patterns[0]
+    token = tokens[0] if tokens else ""
+
+    if len(key_patterns) > 1:
+        if not tokens:
+            # the key will consume the rest of the path
+            return key_pattern
+        remainder = _build_remainder_pattern(key_patterns[1:], tokens[1:])
+        if remainder is None:
+            return key_pattern + token
+        return "%s%s(?:%s)?" % (key_pattern, token, remainder)
+
+    if len(tokens) > 1:
+        # there are tokens left once all keys are resolved
+        return None
+    return key_pattern + token
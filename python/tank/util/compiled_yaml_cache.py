@@ -0,0 +1,344 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Binary on-disk cache of parsed yaml data, used to avoid parsing the yaml
+files of a configuration each time a process starts.
+
+The cache is a single file holding one pickled record per yaml file, keyed by
+path. A record is only used while the mtime and size of the file on disk match
+the ones stored alongside it. The file is memory mapped and records are only
+unpickled when they are requested.
+
+File layout::
+
+    header   magic string, format version and offset of the index
+    records  pickled yaml data, one record per file
+    index    pickled dictionary of path -> (mtime, size, offset, length)
+"""
+
+from __future__ import with_statement
+
+import os
+import sys
+import mmap
+import uuid
+import atexit
+import struct
+import cPickle
+import threading
+
+from .. import LogManager
+
+log = LogManager.get_logger(__name__)
+
+
+class CompiledYamlCache(object):
+    """
+    Compiled yaml cache file for all the yaml files found under a given root
+    folder, typically a pipeline configuration.
+
+    Records added for files which were missing or out of date in the cache are
+    written out to disk in a background thread shortly after the first of them
+    was added, so that all the files read during startup are written in one go.
+    Records for files which have since been modified or removed are dropped
+    whenever the file is written. All operations are thread safe.
+    """
+
+    # identifies compiled yaml cache files
+    MAGIC = "TKYC"
+
+    # version of the file layout and record format. Files written with a
+    # different version are ignored and replaced.
+    FORMAT_VERSION = 1
+
+    # delay in seconds between a record being added and the file being written
+    WRITE_DELAY = 2.0
+
+    # magic, format version, index offset
+    _HEADER = struct.Struct("<4sIQ")
+
+    def __init__(self, path, root=None):
+        """
+        :param str path: Path to the cache file. The file doesn't need to exist.
+        :param str root: Only yaml files located under this folder are cached.
+                         Defaults to the folder the cache file is in.
+        """
+        self._path = os.path.normpath(path)
+        self._root = os.path.join(os.path.normpath(root or os.path.dirname(self._path)), "")
+
+        # protects the memory map, the index and the pending records
+        self._lock = threading.Lock()
+        # makes sure the file is written by one thread at a time
+        self._write_lock = threading.Lock()
+
+        self._mmap = None
+        self._index = {}
+        # records waiting to be written, keyed by path
+        self._pending = {}
+        self._timer = None
+        self._flush_at_exit_registered = False
+
+        self._swap(*self._read())
+
+    def __repr__(self):
+        return "<CompiledYamlCache %s>" % self._path
+
+    @property
+    def path(self):
+        """
+        Path to the cache file.
+        """
+        return self._path
+
+    def handles(self, path):
+        """
+        Tests whether the given yaml file is located under the root folder of
+        this cache and can be stored in it.
+
+        :param str path: Normalized path to a yaml file.
+        :returns: ``True`` if the file can be cached, ``False`` otherwise.
+        """
+        return path.startswith(self._root)
+
+    def get(self, path, stat):
+        """
+        Retrieves the data cached for a yaml file.
+
+        :param str path: Normalized path to the yaml file.
+        :param stat: Current stat of the file, in ``os.stat`` form.
+        :returns: Tuple (found, data). ``found`` is ``False`` if the file is not
+                  in the cache or if the cached data is out of date.
+        """
+        with self._lock:
+            if path in self._pending:
+                (mtime, size, blob) = self._pending[path]
+            elif path in self._index:
+                (mtime, size, offset, length) = self._index[path]
+                blob = self._mmap[offset:offset + length]
+            else:
+                return (False, None)
+
+        if mtime != stat.st_mtime or size != stat.st_size:
+            return (False, None)
+
+        try:
+            return (True, cPickle.loads(blob))
+        except Exception, e:
+            log.debug("Could not read %s from compiled yaml cache %s: %s" % (path, self._path, e))
+            return (False, None)
+
+    def add(self, path, stat, data):
+        """
+        Adds the data loaded from a yaml file to the cache. The cache file will
+        be written to disk in the background shortly after.
+
+        :param str path: Normalized path to the yaml file.
+        :param stat: Stat of the file the data was loaded from, in ``os.stat`` form.
+        :param data: The data loaded from the file.
+        """
+        if not self.handles(path):
+            return
+
+        # pickle the data right away, the caller is free to modify it afterwards
+        try:
+            blob = cPickle.dumps(data, cPickle.HIGHEST_PROTOCOL)
+        except Exception, e:
+            log.debug("Could not add %s to compiled yaml cache %s: %s" % (path, self._path, e))
+            return
+
+        with self._lock:
+            self._pending[path] = (stat.st_mtime, stat.st_size, blob)
+
+            if self._timer is None:
+                self._timer = threading.Timer(self.WRITE_DELAY, self._write_in_background)
+                self._timer.setDaemon(True)
+                self._timer.start()
+
+            # make sure records added just before the process ends are not lost
+            if not self._flush_at_exit_registered:
+                atexit.register(self._flush_at_exit)
+                self._flush_at_exit_registered = True
+
+    def flush(self):
+        """
+        Writes the cache file to disk right away if records were added since
+        it was last written.
+
+        :raises: ``IOError`` or ``OSError`` if the file could not be written.
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+        self._write()
+
+    def _write_in_background(self):
+        """
+        Writes the cache file to disk, logging any error.
+        """
+        with self._lock:
+            self._timer = None
+        try:
+            self._write()
+        except Exception, e:
+            log.debug("Could not write compiled yaml cache %s: %s" % (self._path, e))
+
+    def _flush_at_exit(self):
+        """
+        Writes any pending records to disk when the process exits.
+        """
+        try:
+            self.flush()
+        except Exception, e:
+            log.debug("Could not write compiled yaml cache %s: %s" % (self._path, e))
+
+    def _write(self):
+        """
+        Writes the pending records and the still valid existing records to a
+        new cache file, which then replaces the current one.
+        """
+        with self._write_lock:
+            with self._lock:
+                pending = self._pending.copy()
+
+            try:
+                # the memory map and index are only ever swapped by writers, so
+                # they can be used without holding the lock from here on.
+                records = {}
+                for (path, (mtime, size, offset, length)) in self._index.iteritems():
+                    if path in pending:
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        # the file has been removed
+                        continue
+                    if stat.st_mtime == mtime and stat.st_size == size:
+                        records[path] = (mtime, size, self._mmap[offset:offset + length])
+                records.update(pending)
+
+                temp_path = "%s.%s.tmp" % (self._path, uuid.uuid4().hex)
+                try:
+                    self._write_file(temp_path, records)
+                    self._replace_file(temp_path)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+
+                self._swap(*self._read())
+                log.debug("Wrote %d records to compiled yaml cache %s" % (len(records), self._path))
+
+            finally:
+                # pending records are dropped even if the file could not be
+                # written, the data is already held in memory by the yaml cache
+                # and writing will be attempted again by the next process.
+                with self._lock:
+                    for (path, record) in pending.iteritems():
+                        if self._pending.get(path) is record:
+                            del self._pending[path]
+
+    def _write_file(self, path, records):
+        """
+        Writes a cache file.
+
+        :param str path: Path of the file to write.
+        :param dict records: Records to write, as a dictionary of yaml file
+                             path -> (mtime, size, pickled data).
+        """
+        fh = open(path, "wb")
+        try:
+            # the header is written again once the offset of the index is known
+            fh.write(self._HEADER.pack(self.MAGIC, self.FORMAT_VERSION, 0))
+            index = {}
+            for (yaml_path, (mtime, size, blob)) in records.iteritems():
+                index[yaml_path] = (mtime, size, fh.tell(), len(blob))
+                fh.write(blob)
+            index_offset = fh.tell()
+            fh.write(cPickle.dumps(index, cPickle.HIGHEST_PROTOCOL))
+            fh.seek(0)
+            fh.write(self._HEADER.pack(self.MAGIC, self.FORMAT_VERSION, index_offset))
+        finally:
+            fh.close()
+
+    def _replace_file(self, temp_path):
+        """
+        Replaces the cache file with the given file.
+
+        :param str temp_path: Path of the newly written cache file.
+        """
+        if sys.platform == "win32":
+            # files can't be renamed over existing ones, nor removed while
+            # they're memory mapped, on Windows.
+            self._swap(None, {})
+            replaced = False
+            try:
+                if os.path.exists(self._path):
+                    os.remove(self._path)
+                os.rename(temp_path, self._path)
+                replaced = True
+            finally:
+                if not replaced:
+                    # typically because another process maps the file. Keep
+                    # using the current file rather than running without it.
+                    self._swap(*self._read())
+        else:
+            os.rename(temp_path, self._path)
+
+    def _read(self):
+        """
+        Memory maps the cache file and reads its index. Missing, corrupt or
+        outdated cache files are treated as empty.
+
+        :returns: Tuple (memory map, index dictionary). The memory map is
+                  ``None`` if the file couldn't be read.
+        """
+        try:
+            fh = open(self._path, "rb")
+        except IOError:
+            # no cache file yet
+            return (None, {})
+
+        try:
+            try:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except Exception, e:
+                log.debug("Could not map compiled yaml cache %s: %s" % (self._path, e))
+                return (None, {})
+        finally:
+            # the memory map doesn't need the file to be kept open
+            fh.close()
+
+        try:
+            (magic, version, index_offset) = self._HEADER.unpack(mapped[:self._HEADER.size])
+            if magic != self.MAGIC or version != self.FORMAT_VERSION:
+                raise ValueError("unsupported format")
+            index = cPickle.loads(mapped[index_offset:])
+        except Exception, e:
+            log.debug("Ignoring compiled yaml cache %s: %s" % (self._path, e))
+            mapped.close()
+            return (None, {})
+
+        return (mapped, index)
+
+    def _swap(self, mapped, index):
+        """
+        Replaces the memory map and index in use, closing the current map.
+
+        :param mapped: New memory map, or ``None``.
+        :param dict index: New index.
+        """
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mapped
+            self._index = index
@@ -0,0 +1,160 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers for running work concurrently in a bounded number of threads.
+"""
+
+import sys
+import threading
+import Queue
+
+
+def map_concurrently(func, items, max_workers):
+    """
+    Calls a function for each item of a sequence using a bounded pool of
+    worker threads and returns the results in the same order as the items.
+
+    If ``max_workers`` is None or less than two, or if there is at most a
+    single item to process, the function is simply called in the current thread.
+
+    If any of the calls raises an exception, the remaining items are not
+    processed and the first exception raised is re-raised in the calling thread.
+
+    :param func: Callable accepting a single item as a parameter.
+    :param items: Sequence of items to process.
+    :param int max_workers: Maximum number of threads to use.
+
+    :returns: List of results, one for each item.
+    """
+    items = list(items)
+
+    if not max_workers or max_workers < 2 or len(items) < 2:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)
+    errors = []
+    work_queue = Queue.Queue()
+    for index, item in enumerate(items):
+        work_queue.put((index, item))
+
+    def worker():
+        while not errors:
+            try:
+                index, item = work_queue.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[index] = func(item)
+            except Exception:
+                errors.append(sys.exc_info())
+
+    threads = []
+    for _ in range(min(max_workers, len(items))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        exc_type, exc_value, exc_traceback = errors[0]
+        raise exc_type, exc_value, exc_traceback
+
+    return results
+
+
+def iter_concurrently(func, items, max_workers):
+    """
+    Calls a function for each item of a sequence using a bounded pool of
+    worker threads, yielding ``(item, result)`` tuples in the calling thread
+    as each call completes. Results are therefore yielded in completion order,
+    which allows the caller to report progress as the work goes.
+
+    If ``max_workers`` is None or less than two, or if there is at most a
+    single item to process, the function is simply called in the current thread.
+
+    If any of the calls raises an exception, the remaining items are not
+    processed and, once the calls in progress have completed, the first
+    exception raised is re-raised in the calling thread.
+
+    :param func: Callable accepting a single item as a parameter.
+    :param items: Sequence of items to process.
+    :param int max_workers: Maximum number of threads to use.
+
+    :returns: Generator of (item, result) tuples.
+    """
+    items = list(items)
+
+    if not max_workers or max_workers < 2 or len(items) < 2:
+        for item in items:
+            yield (item, func(item))
+        return
+
+    errors = []
+    work_queue = Queue.Queue()
+    for item in items:
+        work_queue.put(item)
+    done_queue = Queue.Queue()
+
+    def worker():
+        while not errors:
+            try:
+                item = work_queue.get_nowait()
+            except Queue.Empty:
+                break
+            try:
+                done_queue.put((item, func(item)))
+            except Exception:
+                errors.append(sys.exc_info())
+        # tells the calling thread this worker is done
+        done_queue.put(None)
+
+    threads = []
+    for _ in range(min(max_workers, len(items))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    num_workers = len(threads)
+    try:
+        while num_workers:
+            completed = done_queue.get()
+            if completed is None:
+                num_workers -= 1
+            elif not errors:
+                yield completed
+    finally:
+        # if the caller stopped iterating early, stop the workers
+        # and wait for the calls in progress to complete.
+        if num_workers:
+            errors.append(None)
+            for thread in threads:
+                thread.join()
+
+    if errors:
+        exc_type, exc_value, exc_traceback = errors[0]
+        raise exc_type, exc_value, exc_traceback
+
+
+def split_in_chunks(items, chunk_size):
+    """
+    Splits a sequence into consecutive chunks of at most ``chunk_size`` items.
+
+    :param items: Sequence of items to split.
+    :param int chunk_size: Maximum number of items per chunk.
+
+    :returns: List of lists.
+    """
+    items = list(items)
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
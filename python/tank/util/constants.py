@@ -27,6 +27,13 @@ STUDIO_HOOK_SG_CONNECTION_SETTINGS = "sg_connection.py"
 # the storage name that is treated to be the primary storage for tank
 PRIMARY_STORAGE_NAME = "primary"
 
+# maximum number of paths in the path_cache filter of a find_publish query
+FIND_PUBLISH_CHUNK_SIZE = 500
+
+# maximum number of find_publish queries run concurrently,
+# each using a separate Shotgun connection.
+FIND_PUBLISH_MAX_WORKERS = 4
+
 # hook that is executed before a publish is registered in sg.
 TANK_PUBLISH_HOOK_NAME = "before_register_publish"
 
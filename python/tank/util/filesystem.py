@@ -15,11 +15,14 @@ Utility methods for manipulating files and folders
 import os
 import re
 import sys
+import glob
 import errno
 import stat
 import shutil
+import fnmatch
 import functools
 from .. import LogManager
+from . import concurrency
 
 log = LogManager.get_logger(__name__)
 
@@ -284,3 +287,204 @@ def create_valid_filename(value):
         u_src = value.decode("utf-8")
         return exp.sub("_", u_src).encode("utf-8")
 
+
+def iter_glob(pattern, max_workers=None):
+    """
+    Finds the paths matching a glob pattern, like :func:`glob.iglob`.
+
+    The file system is walked one level of the pattern at a time, only listing
+    the folders which match the pattern so far. The folders of a level are
+    listed concurrently and the matching paths are yielded as soon as the
+    folder they are in has been listed, in no particular order. This makes a
+    big difference with patterns matching many folders on network storage.
+
+    :param pattern: Glob pattern, for example ``/foo/*/bar/*.ma``.
+    :param int max_workers: Maximum number of threads used to list folders.
+                            By default, folders are listed in the calling thread.
+    :returns: Generator of matching paths.
+    """
+    # split the pattern into its root and the components of each level
+    components = []
+    root = pattern
+    while True:
+        (head, tail) = os.path.split(root)
+        if not tail:
+            break
+        components.insert(0, tail)
+        root = head
+
+    if not components:
+        # no file name in the pattern
+        if os.path.lexists(root):
+            yield root
+        return
+
+    def list_matches(item):
+        (parent, component) = item
+        if not glob.has_magic(component):
+            path = os.path.join(parent, component)
+            if os.path.lexists(path):
+                return [path]
+            return []
+        try:
+            names = os.listdir(parent or os.curdir)
+        except OSError:
+            # not a folder or it can't be read, same as glob
+            return []
+        if component[0] != ".":
+            # hidden files are only matched explicitly, same as glob
+            names = [name for name in names if name[0] != "."]
+        return [os.path.join(parent, name) for name in fnmatch.filter(names, component)]
+
+    parents = [root]
+    for (index, component) in enumerate(components):
+        if index == len(components) - 1:
+            # last level: yield the matches as they are found
+            items = [(parent, component) for parent in parents]
+            for (_, paths) in concurrency.iter_concurrently(list_matches, items, max_workers):
+                for path in paths:
+                    yield path
+
+        elif not glob.has_magic(component):
+            # static folder names don't need listing, missing
+            # folders are pruned when the next level is listed.
+            parents = [os.path.join(parent, component) for parent in parents]
+
+        else:
+            items = [(parent, component) for parent in parents]
+            parents = []
+            for (_, paths) in concurrency.iter_concurrently(list_matches, items, max_workers):
+                parents.extend(paths)
+
+
+@with_cleared_umask
+def process_folder_creation_items(items, preview_mode, max_workers=None):
+    """
+    Carries out the folder creation requests passed to the ``process_folder_creation``
+    core hook, in the same way as the default implementation of the hook.
+
+    Items are processed one level of the file system hierarchy at a time, from the
+    top down. All the items of a level are processed concurrently, after all the
+    folders of the levels above have been created. Items located in folders which
+    have just been created are known not to exist, so their existence isn't checked.
+    This makes a big difference when creating many folders on network storage.
+
+    Folders are created with open permissions, regardless of the umask.
+
+    :param items: List of item dictionaries, as passed to the hook.
+    :param bool preview_mode: If True, nothing is created on disk but the items
+                              which would have been created are still returned.
+    :param int max_workers: Maximum number of threads used to create items.
+                            By default, items are created in the calling thread.
+    :returns: List of paths created, in the same order as the items.
+    """
+    # path of each item as returned and normalized, None for items which are not processed
+    item_paths = []
+    paths = []
+    for item in items:
+        action = item.get("action")
+        if action in ["entity_folder", "folder", "create_file"]:
+            path = item.get("path")
+        elif action == "symlink" and sys.platform != "win32":
+            # no windows support for symbolic links
+            path = item.get("path")
+        elif action == "copy":
+            path = item.get("target_path")
+        else:
+            # remote entity folders have already been created on
+            # the storage they were created for.
+            path = None
+        item_paths.append(path)
+        paths.append(path and os.path.normpath(path))
+
+    # folders created, or which would have been created in preview mode
+    created_folders = set()
+    # whether each item was created, indexed like the items
+    created = [False] * len(items)
+
+    def process(index):
+        item = items[index]
+        path = paths[index]
+        action = item.get("action")
+        # items located in a folder which was just created can't exist
+        may_exist = os.path.dirname(path) not in created_folders
+
+        if action in ["entity_folder", "folder"]:
+            if may_exist and os.path.exists(path):
+                return
+            if not preview_mode:
+                # create the folder using open permissions
+                if may_exist:
+                    os.makedirs(path, 0777)
+                else:
+                    try:
+                        os.mkdir(path, 0777)
+                    except OSError, e:
+                        # the path may still exist on case insensitive
+                        # file systems, same as when checking for it
+                        if e.errno != errno.EEXIST:
+                            raise
+                        return
+            created_folders.add(path)
+
+        elif action == "symlink":
+            # note use of lexists to check existance of symlink
+            # rather than what symlink is pointing at
+            if may_exist and os.path.lexists(path):
+                return
+            if not preview_mode:
+                os.symlink(item.get("target"), path)
+
+        elif action == "copy":
+            if may_exist and os.path.exists(path):
+                return
+            if not preview_mode:
+                # do a standard file copy and set permissions to open
+                shutil.copy(item.get("source_path"), path)
+                os.chmod(path, 0666)
+
+        elif action == "create_file":
+            parent_folder = os.path.dirname(path)
+            if may_exist and not os.path.exists(parent_folder) and not preview_mode:
+                os.makedirs(parent_folder, 0777)
+            if may_exist and os.path.exists(path):
+                return
+            if not preview_mode:
+                # create the file and set permissions to open
+                fp = open(path, "wb")
+                try:
+                    fp.write(item.get("content"))
+                finally:
+                    fp.close()
+                os.chmod(path, 0666)
+
+        created[index] = True
+
+    # group the items by depth. Items targeting a path already targeted by a
+    # previous item are not processed, they would find it exists.
+    levels = {}
+    first_indices = {}
+    for (index, path) in enumerate(paths):
+        if path is None:
+            continue
+        if path in first_indices:
+            continue
+        first_indices[path] = index
+        levels.setdefault(path.count(os.path.sep), []).append(index)
+
+    for depth in sorted(levels):
+        # sorting by path keeps the items of each folder together
+        level = sorted(levels[depth], key=lambda index: paths[index])
+        concurrency.map_concurrently(process, level, max_workers)
+
+    created_paths = []
+    for (index, path) in enumerate(paths):
+        if path is None:
+            continue
+        first_index = first_indices[path]
+        if created[first_index] and (first_index == index or preview_mode):
+            # in preview mode, items targeting the same path as a previous
+            # one are reported again since nothing was actually created.
+            created_paths.append(item_paths[index])
+
+    return created_paths
@@ -8,7 +8,7 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import os
+import subprocess
 
 from ..errors import TankError
 from .process import subprocess_check_output
@@ -20,7 +20,10 @@ class TankGitError(TankError):
     pass
 
 
-def execute_git_command(cmd):
+# set once the git executable has been found
+_git_found = False
+
+def execute_git_command(cmd, cwd=None):
     """
     Wrapper around git execution.
 
@@ -30,33 +33,33 @@ def execute_git_command(cmd):
     executes the given command. Any output generated by the command
     will not be captured but will get emitted to stdout/stderr.
 
-    Git operates in the context of the current working directory,
-    so this method is typically used in the following way::
+    Git operates in the context of a working directory, which is
+    passed to the command rather than changed for the whole process,
+    so that git commands can be executed from several threads::
 
-        cwd = os.getcwd()
-        try:
-            # do something
-            execute_git_command("checkout %s -q" % self._branch)
-        finally:
-            os.chdir(cwd)
+        execute_git_command("checkout %s -q" % self._branch, cwd=repo_path)
 
     :raises: Will raise a TankGitError on failure
     :param cmd: git command to execute (e.g. 'clone foo.git')
+    :param cwd: Folder to execute the command in. Defaults
+                to the current working directory.
     """
+    global _git_found
+
     # first probe to check that git exists in our PATH
-    try:
-        _ = subprocess_check_output("git --version", shell=True)
-    except:
-        raise TankGitError(
-            "Cannot execute the 'git' command. Please make sure that git is "
-            "installed on your system and that the git executable has been added to the PATH."
-        )
+    if not _git_found:
+        try:
+            _ = subprocess_check_output("git --version", shell=True)
+        except:
+            raise TankGitError(
+                "Cannot execute the 'git' command. Please make sure that git is "
+                "installed on your system and that the git executable has been added to the PATH."
+            )
+        _git_found = True
 
-    status = os.system("git %s" % cmd)
+    status = subprocess.call("git %s" % cmd, shell=True, cwd=cwd)
     if status != 0:
         raise TankGitError(
             "Error executing git operation. The git command '%s' "
             "returned error code %s." % (cmd, status)
         )
-
-
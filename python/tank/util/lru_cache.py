@@ -0,0 +1,125 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Bounded, thread safe least recently used cache.
+"""
+
+import collections
+import threading
+
+
+class LRUCache(object):
+    """
+    Dictionary-like cache holding at most a given number of items. When the
+    cache is full, the least recently used item is evicted to make room for
+    new items.
+
+    The number of cache hits and misses are tracked so that the cache can be
+    sized appropriately. All operations are thread safe.
+    """
+
+    # sentinel used to tell a cached None apart from a missing item
+    _MISSING = object()
+
+    def __init__(self, max_size):
+        """
+        :param int max_size: Maximum number of items to keep in the cache.
+        """
+        self._max_size = max_size
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __getstate__(self):
+        # locks can't be copied or pickled, so only the cache settings
+        # are kept when this object is.
+        return {"max_size": self._max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_size"])
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    @property
+    def max_size(self):
+        """
+        Maximum number of items kept in the cache.
+        """
+        return self._max_size
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for a key and marks it as the most recently used.
+
+        :param key: Key to look up.
+        :param default: Value to return if the key is not cached.
+        :returns: The cached value or ``default``.
+        """
+        with self._lock:
+            value = self._items.pop(key, self._MISSING)
+            if value is self._MISSING:
+                self._misses += 1
+                return default
+            # re-insert the item to mark it as the most recently used
+            self._items[key] = value
+            self._hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Caches a value for a key, evicting the least recently used items if the
+        cache is full.
+
+        :param key: Key to cache the value for.
+        :param value: Value to cache.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Removes a key from the cache.
+
+        :param key: Key to remove.
+        :param default: Value to return if the key is not cached.
+        :returns: The value that was cached for the key or ``default``.
+        """
+        with self._lock:
+            return self._items.pop(key, default)
+
+    def clear(self):
+        """
+        Removes all the items from the cache. Statistics are left untouched.
+        """
+        with self._lock:
+            self._items.clear()
+
+    def get_stats(self):
+        """
+        Returns statistics about the cache usage.
+
+        :returns: Dictionary with keys ``hits``, ``misses``, ``size`` and ``max_size``.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._items),
+                "max_size": self._max_size,
+            }
@@ -28,6 +28,7 @@ from .. import hook
 from . import constants
 from . import login
 from . import yaml_cache
+from . import concurrency
 
 log = LogManager.get_logger(__name__)
 
@@ -487,19 +488,17 @@ def find_publish(tk, list_of_paths, filters=None, fields=None):
     if constants.PRIMARY_STORAGE_NAME in local_storage_names:
         local_storage_names.append("Tank")
 
-    published_file_entity_type = get_published_file_entity_type(tk)
+    # build a query per storage and chunk of paths, so that the size of the
+    # path_cache filters is bounded for large lists of paths.
+    queries = []
     for local_storage_name in local_storage_names:
 
-        local_storage = tk.shotgun.find_one("LocalStorage", [["code", "is", local_storage_name]])
+        # fail gracefully here if the storage doesn't exist - it may be a storage which has been deleted
+        published_files[local_storage_name] = []
+        local_storage = tk._get_local_storage(local_storage_name)
         if not local_storage:
-            # fail gracefully here - it may be a storage which has been deleted
-            published_files[local_storage_name] = []
             continue
 
-        # make copy
-        sg_filters = filters[:]
-        path_cache_filter = ["path_cache", "in"]
-
         # now get the list of normalized files for this storage
         # 0.12 backwards compatibility: if the storage name is Tank,
         # this is the same as the primary storage.
@@ -508,15 +507,26 @@ def find_publish(tk, list_of_paths, filters=None, fields=None):
         else:
             normalized_paths = storages_paths[local_storage_name].keys()
 
-        # add all of those to the query filter
-        for path_cache_path in normalized_paths:
-            path_cache_filter.append(path_cache_path)
+        for chunk in concurrency.split_in_chunks(normalized_paths, constants.FIND_PUBLISH_CHUNK_SIZE):
+            queries.append((local_storage_name, local_storage, chunk))
 
-        sg_filters.append(path_cache_filter)
+    published_file_entity_type = get_published_file_entity_type(tk)
+
+    def find_publishes(query):
+        (local_storage_name, local_storage, normalized_paths) = query
+
+        # make copy
+        sg_filters = filters[:]
+        sg_filters.append(["path_cache", "in"] + normalized_paths)
         sg_filters.append( ["path_cache_storage", "is", local_storage] )
 
-        # organize the returned data by storage
-        published_files[local_storage_name] = tk.shotgun.find(published_file_entity_type, sg_filters, sg_fields)
+        # note that each thread uses its own shotgun connection
+        return tk.shotgun.find(published_file_entity_type, sg_filters, sg_fields)
+
+    # organize the returned data by storage
+    results = concurrency.map_concurrently(find_publishes, queries, constants.FIND_PUBLISH_MAX_WORKERS)
+    for ((local_storage_name, _, _), publishes) in zip(queries, results):
+        published_files[local_storage_name].extend(publishes)
 
 
     # PASS 2
@@ -607,10 +617,13 @@ def _group_by_storage(tk, list_of_paths):
     """
     storages_paths = {}
 
-    for path in list_of_paths:
+    # match all the paths against the templates in one go
+    templates_and_fields = tk.templates_from_paths(list_of_paths)
+
+    for (path, (template, fields)) in zip(list_of_paths, templates_and_fields):
 
         # use abstracted path if path is part of a sequence
-        abstract_path = _translate_abstract_fields(tk, path)
+        abstract_path = _apply_default_abstract_fields(path, template, fields)
         root_name, dep_path_cache = _calc_path_cache(tk, abstract_path)
 
         # make sure that the path is even remotely valid, otherwise skip
@@ -859,13 +872,27 @@ def _translate_abstract_fields(tk, path):
     /foo/bar/xyz.%04d.exr
     """
     template = tk.template_from_path(path)
+    if template:
+        path = _apply_default_abstract_fields(path, template, template.get_fields(path))
+    return path
+
+def _apply_default_abstract_fields(path, template, fields):
+    """
+    Translates abstract fields for a path already matched against a template
+    into the default abstract value. See :meth:`_translate_abstract_fields`.
+
+    :param path: The path to translate.
+    :param template: The template matching the path, or None.
+    :param fields: The fields extracted from the path by the template.
+    :returns: The translated path.
+    """
     if template:
 
         abstract_key_names = [k.name for k in template.keys.values() if k.is_abstract]
 
         if len(abstract_key_names) > 0:
             # we want to use the default values for abstract keys
-            cur_fields = template.get_fields(path)
+            cur_fields = dict(fields)
             for abstract_key_name in abstract_key_names:
                 del(cur_fields[abstract_key_name])
             path = template.apply_fields(cur_fields)
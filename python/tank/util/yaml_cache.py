@@ -20,12 +20,103 @@ import copy
 import threading
 
 from tank_vendor import yaml
+from . import compiled_yaml_cache
 from ..errors import (
     TankError,
     TankUnreadableFileError,
     TankFileDoesNotExistError,
 )
 
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary, as handed out by :meth:`YamlCache.get_frozen`.
+
+    Any attempt at modifying it raises a ``TypeError``. A regular, mutable copy
+    of the data can be obtained using ``copy.deepcopy``.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Cached yaml data is read-only and cannot be modified.")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        data = {}
+        memo[id(self)] = data
+        for (key, value) in self.iteritems():
+            data[copy.deepcopy(key, memo)] = copy.deepcopy(value, memo)
+        return data
+
+    def __reduce__(self):
+        # pickled as a regular dictionary
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """
+    Read-only list, as handed out by :meth:`YamlCache.get_frozen`.
+
+    Any attempt at modifying it raises a ``TypeError``. A regular, mutable copy
+    of the data can be obtained using ``copy.deepcopy``.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Cached yaml data is read-only and cannot be modified.")
+
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _read_only
+    __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        data = []
+        memo[id(self)] = data
+        for value in self:
+            data.append(copy.deepcopy(value, memo))
+        return data
+
+    def __reduce__(self):
+        # pickled as a regular list
+        return (list, (list(self),))
+
+
+def freeze(data, memo=None):
+    """
+    Returns a read-only version of some yaml data, where all dictionaries and
+    lists have been replaced with :class:`FrozenDict` and :class:`FrozenList`
+    instances.
+
+    :param data: Data to freeze.
+    :param memo: Dictionary of already frozen containers, keyed by id, used to
+                 preserve references shared within the data.
+    :returns: The frozen data.
+    """
+    if not isinstance(data, (dict, list)) or isinstance(data, (FrozenDict, FrozenList)):
+        return data
+
+    if memo is None:
+        memo = {}
+    if id(data) in memo:
+        return memo[id(data)]
+
+    if isinstance(data, dict):
+        frozen_data = FrozenDict(
+            (key, freeze(value, memo)) for (key, value) in data.iteritems()
+        )
+    else:
+        frozen_data = FrozenList(freeze(value, memo) for value in data)
+
+    memo[id(data)] = frozen_data
+    return frozen_data
+
+
 class CacheItem(object):
     """
     Represents a single item in the global yaml cache.
@@ -47,6 +138,7 @@ class CacheItem(object):
         """
         self._path = os.path.normpath(path)
         self._data = data
+        self._frozen_data = None
 
         if stat is None:
             try:
@@ -65,9 +157,24 @@ class CacheItem(object):
 
     def _set_data(self, config_data):
         self._data = config_data
+        self._frozen_data = None
 
     data = property(_get_data, _set_data)
 
+    @property
+    def frozen_data(self):
+        """A read-only version of the item's data, see :func:`freeze`."""
+        # note: items unpickled from older caches don't have this attribute.
+        if getattr(self, "_frozen_data", None) is None:
+            self._frozen_data = freeze(self._data)
+        return self._frozen_data
+
+    def __getstate__(self):
+        # the frozen data is rebuilt on demand rather than persisted.
+        state = self.__dict__.copy()
+        state.pop("_frozen_data", None)
+        return state
+
     @property
     def path(self):
         """The path to the file on disk that the item was sourced from."""
@@ -134,6 +241,8 @@ class YamlCache(object):
         self._cache = cache_dict or dict()
         self._lock = threading.Lock()
         self._is_static = is_static
+        # compiled caches, keyed by the path of their file on disk
+        self._compiled_caches = {}
 
     def _get_is_static(self):
         """
@@ -182,6 +291,45 @@ class YamlCache(object):
         else:
             return item.data
 
+    def get_frozen(self, path):
+        """
+        Retrieve a read-only version of the yaml data for the specified path,
+        loading the file from disk like :meth:`get` does if needed.
+
+        The same read-only data is shared by all callers, so no copy of the data
+        is made. Any attempt at modifying it will raise a ``TypeError``. Callers
+        who need to modify the data should use ``copy.deepcopy`` to get a regular,
+        mutable copy of it.
+
+        :param path: The path of the yaml file to load.
+        :returns: The yaml data loaded from the file, where all dictionaries
+                  and lists are :class:`FrozenDict` and :class:`FrozenList`
+                  instances.
+        """
+        return self._add(CacheItem(path)).frozen_data
+
+    def add_compiled_cache(self, path, root=None):
+        """
+        Registers a compiled, on-disk cache of yaml data. Files located under
+        the root of the compiled cache are loaded from it rather than parsed
+        when they are up to date in it, and are added to it otherwise.
+
+        If a compiled cache using the same file on disk has already been
+        registered, it is returned and the file isn't read again.
+
+        :param str path: Path to the compiled cache file.
+        :param str root: Only yaml files located under this folder are cached.
+                         Defaults to the folder the cache file is in.
+        :returns: The registered :class:`~.compiled_yaml_cache.CompiledYamlCache`.
+        """
+        path = os.path.normpath(path)
+        with self._lock:
+            compiled_cache = self._compiled_caches.get(path)
+            if compiled_cache is None:
+                compiled_cache = compiled_yaml_cache.CompiledYamlCache(path, root)
+                self._compiled_caches[path] = compiled_cache
+            return compiled_cache
+
     def get_cached_items(self):
         """
         Returns a list of all CacheItems stored in the cache.
@@ -253,9 +401,21 @@ class YamlCache(object):
 
     def _populate_cache_item_data(self, item):
         """
-        Loads the CacheItem's YAML data from disk.
+        Loads the CacheItem's YAML data from disk, or from a compiled
+        cache if one holds up to date data for the file.
         """
         path = item.path
+
+        compiled_cache = None
+        for candidate in self._compiled_caches.itervalues():
+            if candidate.handles(path):
+                compiled_cache = candidate
+                (found, data) = compiled_cache.get(path, item.stat)
+                if found:
+                    item.data = data
+                    return
+                break
+
         try:
             fh = open(path, "r")
             raw_data = yaml.load(fh)
@@ -271,5 +431,8 @@ class YamlCache(object):
         # Populate the item's data before adding it to the cache.
         item.data = raw_data
 
+        if compiled_cache:
+            compiled_cache.add(path, item.stat, raw_data)
+
 # The global instance of the YamlCache.
 g_yaml_cache = YamlCache()
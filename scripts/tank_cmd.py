@@ -31,6 +31,7 @@ from tank.authentication import ShotgunAuthenticationError
 from tank.authentication import AuthenticationCancelled
 from tank.authentication import IncompleteCredentials
 from tank.commands import constants as command_constants
+from tank.commands import command_server
 from tank_vendor import yaml
 from tank.platform import engine
 from tank import pipelineconfig_utils
@@ -335,78 +336,10 @@ def _write_shotgun_cache(tk, entity_type, cache_file_name):
                             for
     :param cache_file_name: name of the file used to store the cached data
     """
-    cache_path = os.path.join(tk.pipeline_configuration.get_shotgun_menu_cache_location(), cache_file_name)
-
     # start the shotgun engine, load the apps
     e = engine.start_shotgun_engine(tk, entity_type, tk.context_empty())
 
-    # get list of actions
-    engine_commands = e.commands
-
-    # insert special system commands
-    if entity_type.lower() == "project":
-        engine_commands["__core_info"] = { "properties": {"title": "Check for Core Upgrades...",
-                                                          "deny_permissions": ["Artist"] } }
-
-        engine_commands["__upgrade_check"] = { "properties": {"title": "Check for App Upgrades...",
-                                                              "deny_permissions": ["Artist"] } }
-
-    # extract actions into cache file
-    res = []
-    for (cmd_name, cmd_params) in engine_commands.items():
-
-        # some apps provide a special deny_platforms entry
-        if "deny_platforms" in cmd_params["properties"]:
-            # setting can be Linux, Windows or Mac
-            curr_os = {"linux2": "Linux", "darwin": "Mac", "win32": "Windows"}[sys.platform]
-            if curr_os in cmd_params["properties"]["deny_platforms"]:
-                # deny this platform! :)
-                continue
-
-        title = cmd_params["properties"].get("title", cmd_name)
-        supports_multiple_sel = cmd_params["properties"].get(
-            "supports_multiple_selection", False)
-        deny = ",".join(cmd_params["properties"].get("deny_permissions", []))
-        icon = cmd_params["properties"].get("icon", "")
-        description = cmd_params["properties"].get("description", "")
-
-        entry = [ cmd_name, title, deny, str(supports_multiple_sel),
-                  icon, description ]
-
-        # sanitize the fields to make sure that they do not break the cache
-        # format
-        sanitized = [ token.replace("\n", " ").replace("$", "_")
-                      for token in entry ]
-
-        res.append("$".join(sanitized))
-
-    data = "\n".join(res)
-
-    try:
-        # if file does not exist, make sure it is created with open permissions
-        cache_file_created = False
-        if not os.path.exists(cache_path):
-            cache_file_created = True
-
-        # Write to cache file
-        # Note that we are using binary form here to ensure that the line
-        # endings are written out consistently on all different OSes
-        # otherwise with wt mode, \n on windows will be turned into \n\r
-        # which is not interpreted correctly by the jacascript code.
-        f = open(cache_path, "wb")
-        f.write(data)
-        f.close()
-
-        # make sure cache file has proper permissions
-        if cache_file_created:
-            old_umask = os.umask(0)
-            try:
-                os.chmod(cache_path, 0666)
-            finally:
-                os.umask(old_umask)
-
-    except Exception, e:
-        raise TankError("Could not write to cache file %s: %s" % (cache_path, e))
+    command_server.write_shotgun_cache(tk, e, entity_type, cache_file_name)
 
 
 def shotgun_cache_actions(pipeline_config_root, args):
@@ -465,6 +398,20 @@ def shotgun_cache_actions(pipeline_config_root, args):
     # return success error code
     return 0
 
+def shotgun_command_server(pipeline_config_root, args):
+    """
+    Runs the command server answering the shotgun menu requests
+    of a pipeline configuration until it is idle.
+    """
+    logger.debug("Running shotgun_command_server command")
+    logger.debug("Arguments passed: %s" % args)
+
+    if pipeline_config_root is None:
+        raise TankError("The command server needs to be started from a pipeline configuration!")
+
+    command_server.CommandServer(pipeline_config_root).serve()
+    return 0
+
 def shotgun_run_action_auth(install_root, pipeline_config_root, is_localized, args):
     """
     Executes the special shotgun run action command from inside of shotgun.
@@ -1542,6 +1489,11 @@ if __name__ == "__main__":
             # note: this pathway does not require authentication
             exit_code = shotgun_cache_actions(pipeline_config_root, cmd_line[1:])
 
+        # special case when we are called from shotgun
+        elif cmd_line[0] == "shotgun_command_server":
+            # note: this pathway does not require authentication
+            exit_code = shotgun_command_server(pipeline_config_root, cmd_line[1:])
+
         else:
             # these choices remain:
             #
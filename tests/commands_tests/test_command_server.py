@@ -0,0 +1,247 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Unit tests for the command server answering shotgun menu requests.
+"""
+
+from __future__ import with_statement
+
+import os
+import threading
+import time
+
+import mock
+
+from tank_test.tank_test_base import TankTestBase, setUpModule
+
+from tank.commands import command_server
+from tank.commands import constants
+from tank.commands.get_entity_commands import execute_tank_command
+from tank.util.process import SubprocessCalledProcessError
+
+
+class TestCommandServer(TankTestBase):
+    """
+    Tests the command server and its clients.
+    """
+
+    def setUp(self):
+        super(TestCommandServer, self).setUp()
+
+        env_root = os.path.join(self.project_config, "env")
+        if not os.path.exists(env_root):
+            os.makedirs(env_root)
+        self._env_path = os.path.join(env_root, "shotgun_task.yml")
+        self._write_file(self._env_path, "engines: {}")
+        self._cache_path = os.path.join(self.pipeline_config_root, "cache", "shotgun_linux_task.txt")
+
+        self._server = None
+        self._server_thread = None
+
+    def tearDown(self):
+        if self._server_thread:
+            self._server_thread.join()
+        super(TestCommandServer, self).tearDown()
+
+    def _write_file(self, path, content, mtime=None):
+        """
+        Writes a file, optionally setting its modification time.
+        """
+        fh = open(path, "wb")
+        try:
+            fh.write(content)
+        finally:
+            fh.close()
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def _start_server(self):
+        """
+        Runs a command server for the test pipeline configuration in a thread
+        and waits until it is advertised.
+        """
+        self._server = command_server.CommandServer(self.pipeline_config_root, idle_timeout=1)
+        self._server_thread = threading.Thread(target=self._server.serve)
+        self._server_thread.start()
+
+        info_path = command_server.get_server_info_path(self.pipeline_config_root)
+        for _ in range(500):
+            if os.path.exists(info_path):
+                break
+            time.sleep(0.01)
+
+    def test_get_actions(self):
+        """
+        Ensures cache files are served the same way the tank command does.
+        """
+        args = ["shotgun_get_actions", "shotgun_linux_task.txt", "shotgun_task.yml"]
+
+        # no server running
+        self.assertEqual(command_server.execute_command(self.pipeline_config_root, args), None)
+
+        self._start_server()
+
+        # missing cache
+        with self.assertRaises(SubprocessCalledProcessError) as cm:
+            command_server.execute_command(self.pipeline_config_root, args)
+        self.assertEqual(cm.exception.returncode, 1)
+
+        # outdated cache
+        self._write_file(self._cache_path, "old", mtime=os.path.getmtime(self._env_path) - 10)
+        with self.assertRaises(SubprocessCalledProcessError) as cm:
+            command_server.execute_command(self.pipeline_config_root, args)
+        self.assertEqual(cm.exception.returncode, 1)
+
+        # up to date cache
+        self._write_file(self._cache_path, "launch$Launch$$False$$", mtime=os.path.getmtime(self._env_path) + 10)
+        self.assertEqual(
+            command_server.execute_command(self.pipeline_config_root, args),
+            "launch$Launch$$False$$"
+        )
+
+        # missing environment
+        with self.assertRaises(SubprocessCalledProcessError) as cm:
+            command_server.execute_command(
+                self.pipeline_config_root,
+                ["shotgun_get_actions", "shotgun_linux_shot.txt", "shotgun_shot.yml"]
+            )
+        self.assertEqual(cm.exception.returncode, 2)
+
+        # a second server doesn't replace the running one
+        command_server.CommandServer(self.pipeline_config_root).serve()
+        self.assertEqual(
+            command_server.execute_command(self.pipeline_config_root, args),
+            "launch$Launch$$False$$"
+        )
+
+        # the server removes its advertisement once idle
+        self._server_thread.join()
+        self.assertFalse(os.path.exists(command_server.get_server_info_path(self.pipeline_config_root)))
+        self.assertEqual(command_server.execute_command(self.pipeline_config_root, args), None)
+
+    def test_cache_actions(self):
+        """
+        Ensures the shotgun engine is kept between requests until the configuration changes.
+        """
+        engine = mock.Mock()
+        engine.commands = {"launch": {"properties": {"title": "Launch"}}}
+
+        with mock.patch.object(command_server.CommandServer, "_get_tk", return_value=self.tk):
+            with mock.patch(
+                "tank.platform.engine.start_shotgun_engine", return_value=engine
+            ) as start_shotgun_engine:
+                self._start_server()
+
+                for _ in range(2):
+                    self.assertEqual(
+                        command_server.execute_command(
+                            self.pipeline_config_root,
+                            ["shotgun_cache_actions", "Task", "shotgun_linux_task.txt"]
+                        ),
+                        ""
+                    )
+                self.assertEqual(start_shotgun_engine.call_count, 1)
+                self.assertEqual(open(self._cache_path).read(), "launch$Launch$$False$$")
+
+                # another entity type needs another engine
+                command_server.execute_command(
+                    self.pipeline_config_root,
+                    ["shotgun_cache_actions", "Shot", "shotgun_linux_shot.txt"]
+                )
+                self.assertEqual(start_shotgun_engine.call_count, 2)
+                self.assertEqual(engine.destroy.call_count, 1)
+
+                # modified configurations are reloaded
+                self._write_file(self._env_path, "engines: {}\n", mtime=time.time() + 10)
+                command_server.execute_command(
+                    self.pipeline_config_root,
+                    ["shotgun_cache_actions", "Shot", "shotgun_linux_shot.txt"]
+                )
+                self.assertEqual(start_shotgun_engine.call_count, 3)
+                self.assertEqual(engine.destroy.call_count, 2)
+
+                self._server_thread.join()
+                self.assertEqual(engine.destroy.call_count, 3)
+
+    def test_invalid_token(self):
+        """
+        Ensures requests without the token of the server are not answered.
+        """
+        self._start_server()
+        with mock.patch.object(command_server, "_read_server_info", return_value={
+            "port": self._server.port, "token": "invalid"
+        }):
+            self.assertEqual(
+                command_server.execute_command(
+                    self.pipeline_config_root,
+                    ["shotgun_get_actions", "shotgun_linux_task.txt", "shotgun_task.yml"]
+                ),
+                None
+            )
+
+    def test_per_user_advertisement(self):
+        """
+        Ensures each user uses their own server for a shared pipeline configuration.
+        """
+        args = ["shotgun_get_actions", "shotgun_linux_task.txt", "shotgun_task.yml"]
+        self._write_file(self._cache_path, "cached", mtime=os.path.getmtime(self._env_path) + 10)
+
+        with mock.patch("getpass.getuser", return_value="other.user"):
+            other_info_path = command_server.get_server_info_path(self.pipeline_config_root)
+        self.assertNotEqual(other_info_path, command_server.get_server_info_path(self.pipeline_config_root))
+
+        self._start_server()
+        self.assertEqual(command_server.execute_command(self.pipeline_config_root, args), "cached")
+
+        with mock.patch("getpass.getuser", return_value="other.user"):
+            # the other user doesn't see our server, and runs its own
+            # without replacing our advertisement.
+            self.assertEqual(command_server.execute_command(self.pipeline_config_root, args), None)
+            other_server = command_server.CommandServer(self.pipeline_config_root, idle_timeout=0.5)
+            other_thread = threading.Thread(target=other_server.serve)
+            other_thread.start()
+            for _ in range(500):
+                if os.path.exists(other_info_path):
+                    break
+                time.sleep(0.01)
+            self.assertEqual(command_server.execute_command(self.pipeline_config_root, args), "cached")
+            other_thread.join()
+            self.assertFalse(os.path.exists(other_info_path))
+
+        self.assertEqual(command_server.execute_command(self.pipeline_config_root, args), "cached")
+        self.assertTrue(os.path.exists(command_server.get_server_info_path(self.pipeline_config_root)))
+
+    def test_execute_tank_command(self):
+        """
+        Ensures the tank command is used, and the server started, when no server answers.
+        """
+        tank_command_path = os.path.join(self.pipeline_config_root, "tank")
+        self._write_file(tank_command_path, "")
+        args = ["shotgun_get_actions", "shotgun_linux_task.txt", "shotgun_task.yml"]
+
+        with mock.patch(
+            "tank.commands.get_entity_commands.subprocess_check_output", return_value="output"
+        ) as subprocess_check_output:
+            with mock.patch.object(command_server, "start_server") as start_server:
+                # servers are only used when enabled
+                with mock.patch.dict(os.environ, {constants.COMMAND_SERVER_ENV_VAR: ""}):
+                    self.assertEqual(execute_tank_command(self.pipeline_config_root, args), "output")
+                self.assertEqual(start_server.call_count, 0)
+
+                with mock.patch.dict(os.environ, {constants.COMMAND_SERVER_ENV_VAR: "1"}):
+                    self.assertEqual(execute_tank_command(self.pipeline_config_root, args), "output")
+                    start_server.assert_called_once_with(self.pipeline_config_root)
+
+                    self._write_file(self._cache_path, "cached", mtime=os.path.getmtime(self._env_path) + 10)
+                    self._start_server()
+                    self.assertEqual(execute_tank_command(self.pipeline_config_root, args), "cached")
+
+        self.assertEqual(subprocess_check_output.call_count, 2)
@@ -16,6 +16,7 @@ from __future__ import with_statement
 
 import os
 import re
+import shutil
 import logging
 import functools
 import tempfile
@@ -569,6 +570,39 @@ class TestSimpleUpdates(TankTestBase):
         desc = env.get_framework_descriptor("tk-framework-test_v1.x.x")
         self.assertEqual(desc.version, "v1.1.0")
 
+    def test_latest_versions_looked_up_once(self):
+        """
+        Makes sure items used by several environments are only looked up once.
+        """
+        # bundles used by the other environment of the config
+        self._mock_store.add_engine("tk-engine", "v1.0.0")
+        self._mock_store.add_application("tk-multi-app", "v1.0.0")
+        self._mock_store.add_framework("tk-framework-2nd-level-dep", "v1.0.0")
+
+        env_folder = os.path.join(self.project_config, "env")
+        shutil.copy(os.path.join(env_folder, "simple.yml"), os.path.join(env_folder, "simple_copy.yml"))
+
+        with mock.patch.object(
+            TankMockStoreDescriptor,
+            "get_latest_version",
+            autospec=True,
+            side_effect=TankMockStoreDescriptor.get_latest_version
+        ) as get_latest_version:
+            command = self.tk.get_command("updates")
+            command.set_logger(logging.getLogger("/dev/null"))
+            command.execute({})
+
+        lookups = []
+        for ((desc, pattern), _) in get_latest_version.call_args_list:
+            lookups.append((desc.get_system_name(), desc.get_version(), pattern))
+        self.assertIn(("tk-framework-test", "v1.0.0", "v1.0.x"), lookups)
+        self.assertEqual(len(lookups), len(set(lookups)))
+
+        for env_name in ["simple", "simple_copy"]:
+            env = Environment(os.path.join(env_folder, "%s.yml" % env_name), self.pipeline_configuration)
+            desc = env.get_app_descriptor("tk-test", "tk-multi-nodep")
+            self.assertEqual(desc.version, "v2.0.0")
+
 
 class TestIncludeUpdates(TankTestBase):
     """
@@ -64,6 +64,103 @@ class TestTemplateFromPath(TankTestBase):
         self.assertIsNotNone(template)
         self.assertIsInstance(template, TemplateString)
 
+    def test_matches_full_scan(self):
+        """Check that the indexed lookup finds the same templates as validating all of them."""
+        fields = {"Sequence": "Sequence_1",
+                  "Shot": "shot_010",
+                  "Step": "Anm",
+                  "Asset": "Car",
+                  "sg_asset_type": "Vehicle",
+                  "name": "jfk",
+                  "version": 1,
+                  "SEQ": 12,
+                  "eye": "left",
+                  "width": 1920,
+                  "height": 1080,
+                  "output": "main",
+                  "YYYY": 2016,
+                  "MM": 1,
+                  "DD": 1,
+                  "nuke.output": "main",
+                  "houdini.node": "out",
+                  "maya.layer_name": "layer",
+                  "maya.camera_name": "cam",
+                  "segment_name": "seg",
+                  "flame.frame": 1}
+        paths = [self.project_root,
+                 os.path.join(self.project_root, "sequences", "Sequence 1", "shot_010"),
+                 "Nuke Script Name, v002",
+                 "relative/path"]
+        for template in self.tk.templates.values():
+            if not template.missing_keys(fields):
+                paths.append(template.apply_fields(fields))
+
+        for path in paths:
+            expected = [t for t in self.tk.templates.values() if t.validate(path)]
+            candidates = self.tk._get_template_matcher().get_candidates(path)
+            self.assertTrue(set(expected).issubset(set(candidates)))
+            if len(expected) == 1:
+                self.assertEqual(self.tk.template_from_path(path), expected[0])
+            elif len(expected) > 1:
+                self.assertRaises(TankError, self.tk.template_from_path, path)
+            else:
+                self.assertIsNone(self.tk.template_from_path(path))
+
+    def test_templates_from_paths(self):
+        """Check that matching paths in bulk is equivalent to matching them one by one."""
+        paths = [os.path.join(self.project_root,
+                              "sequences/Sequence_1/shot_010/Anm/publish/shot_010.jfk.v001.ma"),
+                 os.path.join(self.project_root, "sequences/Sequence 1/shot_010/Anm/publish/"),
+                 "Nuke Script Name, v002"]
+        expected = []
+        for path in paths:
+            template = self.tk.template_from_path(path)
+            expected.append((template, template.get_fields(path) if template else None))
+
+        self.assertEqual(expected, self.tk.templates_from_paths(paths))
+        self.assertEqual(expected * 400, self.tk.templates_from_paths(paths * 400, max_workers=4))
+
+    def test_templates_from_paths_ambiguous(self):
+        """Check that an ambiguous path raises an error when matched in bulk."""
+        keys = {"Shot": StringKey("Shot")}
+        self.tk.templates["ambiguous_1"] = TemplatePath("ambiguous/{Shot}", keys, self.project_root)
+        self.tk.templates["ambiguous_2"] = TemplatePath("ambiguous/{Shot}", keys, self.project_root)
+        file_path = os.path.join(self.project_root, "ambiguous", "shot_010")
+        self.assertRaises(TankError, self.tk.template_from_path, file_path)
+        self.assertRaises(TankError, self.tk.templates_from_paths, [file_path])
+
+    def test_modified_templates(self):
+        """Check that templates added after the templates were read are found."""
+        keys = {"Shot": StringKey("Shot")}
+        template = TemplatePath("extra_folder/{Shot}", keys, self.project_root, "extra_template")
+        file_path = os.path.join(self.project_root, "extra_folder", "shot_010")
+        self.assertIsNone(self.tk.template_from_path(file_path))
+        self.tk.templates["extra_template"] = template
+        self.assertEqual(self.tk.template_from_path(file_path), template)
+        del self.tk.templates["extra_template"]
+        self.assertIsNone(self.tk.template_from_path(file_path))
+
+
+class TestReloadTemplates(TankTestBase):
+    """Cases testing Tank.reload_templates method"""
+    def setUp(self):
+        super(TestReloadTemplates, self).setUp()
+        self.setup_fixtures()
+
+    def test_parse_cache_cleared(self):
+        """Check that reloading templates clears the cached parsing results."""
+        file_path = os.path.join(self.project_root,
+                'sequences/Sequence_1/shot_010/Anm/publish/shot_010.jfk.v001.ma')
+        template = self.tk.template_from_path(file_path)
+        template.get_fields(file_path)
+        self.assertTrue(self.tk.get_template_cache_stats()["hits"] > 0)
+        self.assertTrue(template.get_parse_cache_stats()["size"] > 0)
+
+        self.tk.reload_templates()
+        self.assertEqual(template.get_parse_cache_stats()["size"], 0)
+        self.assertEqual(self.tk.get_template_cache_stats()["size"], 0)
+        self.assertEqual(self.tk.template_from_path(file_path).name, template.name)
+
 
 class TestTemplatesLoaded(TankTestBase):
     """Test case for the loading of templates from project level config."""
@@ -187,6 +284,44 @@ class TestPathsFromTemplate(TankTestBase):
         self.assertNotIn(bad_file_path, result)
 
 
+    def test_iter_paths(self):
+        """
+        Tests that the generator variant finds the same files, whether folders
+        are listed concurrently or not.
+        """
+        # a sibling shot and files which shouldn't be matched
+        other_file = self.template.apply_fields({"Sequence": "Seq_1",
+                                                 "Shot": "shot_2",
+                                                 "Step": "step_name",
+                                                 "name": "filename",
+                                                 "version": 1})
+        self.create_file(other_file)
+        self.create_file(os.path.join(os.path.dirname(self.file_1), "filename.v001.nk"))
+        self.create_file(os.path.join(os.path.dirname(self.file_1), ".filename.v003.ma"))
+
+        for (fields, skip_keys) in [({"Shot": "shot_1", "Step": "step_name", "Sequence": "Seq_1"}, []),
+                                    ({"Shot": "shot_1", "Step": "step_name", "Sequence": "Seq_1"}, ["version"]),
+                                    ({"version": 1}, ["Shot"]),
+                                    ({}, [])]:
+            expected = self.tk.paths_from_template(self.template, fields, skip_keys=skip_keys)
+            self.assertTrue(len(expected) > 0)
+            for max_workers in (None, 4):
+                result = list(self.tk.iter_paths_from_template(self.template,
+                                                               fields,
+                                                               skip_keys=skip_keys,
+                                                               max_workers=max_workers))
+                self.assertEqual(sorted(result), sorted(expected))
+
+    def test_iter_paths_is_lazy(self):
+        """
+        Tests that paths are yielded as they are found.
+        """
+        fields = {"Shot": "shot_1", "Step": "step_name", "Sequence": "Seq_1"}
+        paths = self.tk.iter_paths_from_template(self.template, fields)
+        self.assertIn(next(paths), [self.file_1, self.file_2])
+        paths.close()
+
+
 class TestAbstractPathsFromTemplate(TankTestBase):
     """Tests Tank.abstract_paths_from_template method."""
     def setUp(self):
@@ -306,6 +441,29 @@ class TestAbstractPathsFromTemplate(TankTestBase):
         result = self.tk.abstract_paths_from_template(self.template, {"name": "filename"})
         self.assertEquals(set(expected), set(result))
 
+    def test_sequence_frame_ranges(self):
+        self.create_file(os.path.join(self.shot_a_path, "left", "filename.0006.exr"))
+        # frame numbers which don't match the format exactly are still validated
+        self.create_file(os.path.join(self.shot_a_path, "right", "filename.7.exr"))
+        self.create_file(os.path.join(self.shot_a_path, "right", "filename.0009_old.exr"))
+
+        expected = {
+            os.path.join(self.shot_a_path, "%V", "filename.%04d.exr"): [(1, 4), (6, 7)],
+            os.path.join(self.shot_a_path, "%V", "anothername.%04d.exr"): [(1, 4)],
+        }
+        result = self.tk.abstract_sequences_from_template(self.template, {"Shot": "AAA"})
+        self.assertEquals(expected, result)
+
+    def test_sequence_frames_not_validated(self):
+        # only the first frame of each sequence in each folder is validated
+        validate = self.template.validate_and_get_fields
+        with patch.object(self.template, "validate_and_get_fields", wraps=validate) as mock_validate:
+            result = self.tk.abstract_sequences_from_template(self.template, {}, max_workers=None)
+        self.assertEquals(4, len(result))
+        self.assertEquals(8, mock_validate.call_count)
+        for frame_ranges in result.values():
+            self.assertEquals([(1, 4)], frame_ranges)
+
 
 class TestPathsFromTemplateGlob(TankTestBase):
     """Tests for Tank.paths_from_template method which check the string sent to glob.glob."""
@@ -742,6 +742,55 @@ class TestAsTemplateFields(TestContext):
         # Check that the shotgun method find_one was not used
         self.assertEqual(finds, self.tk.shotgun.finds)
 
+    def test_fields_memoized(self):
+        """
+        Test that the fields for a template are only computed once, and that path cache
+        data is shared between templates with common ancestors.
+        """
+        expected_fields = {"Sequence": "Seq", "Shot": "shot_code", "Step": "step_short_name"}
+        publish_template = TemplatePath(
+            "/sequence/{Sequence}/{Shot}/{Step}/publish", self.keys, self.project_root
+        )
+
+        fields = self.ctx.as_template_fields(self.template)
+        self.assertEquals(fields, expected_fields)
+        # callers are free to modify the returned fields
+        fields["Shot"] = "modified"
+
+        with patch("tank.context._values_from_path_cache", wraps=context._values_from_path_cache) as mocked:
+            self.assertEquals(self.ctx.as_template_fields(self.template), expected_fields)
+            self.assertEquals(self.ctx.as_template_fields(publish_template), expected_fields)
+            self.assertEquals(mocked.call_count, 0)
+
+            # copies of the context don't share the memoized data
+            ctx_copy = copy.deepcopy(self.ctx)
+            self.assertEquals(ctx_copy.as_template_fields(self.template), expected_fields)
+            self.assertNotEquals(mocked.call_count, 0)
+
+    def test_memoized_fields_path_cache_modified(self):
+        """
+        Test that memoized fields are discarded when the path cache is modified.
+        """
+        other_shot = {"type": "Shot",
+                      "code": "shot_other",
+                      "id": 16,
+                      "sg_sequence": self.seq,
+                      "project": self.project}
+        other_shot_path = os.path.join(self.seq_path, "shot_other")
+        self.add_production_path(other_shot_path, other_shot)
+        test_ctx = context.Context(self.tk, project=self.project, entity=other_shot, step=self.step)
+
+        fields = test_ctx.as_template_fields(self.template)
+        self.assertEquals(fields, {"Sequence": "Seq", "Shot": "shot_other"})
+
+        # create the step folder for the shot
+        self.add_production_path(os.path.join(other_shot_path, "step_short_name"), self.step)
+
+        fields = test_ctx.as_template_fields(self.template)
+        self.assertEquals(
+            fields, {"Sequence": "Seq", "Shot": "shot_other", "Step": "step_short_name"}
+        )
+
     def test_shot_step(self):
         expected_step_name = "step_short_name"
         expected_shot_name = "shot_code"
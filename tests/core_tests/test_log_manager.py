@@ -0,0 +1,150 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from __future__ import with_statement
+
+import os
+import logging
+import threading
+
+from mock import patch
+
+from tank import constants
+from tank.log import LogManager, _AsyncFileHandler, _BatchedRotatingFileHandler
+from tank_test.tank_test_base import *
+
+
+class TestAsyncFileLogging(TankTestBase):
+    """
+    Tests writing the log file from a background thread.
+    """
+
+    def setUp(self):
+        super(TestAsyncFileLogging, self).setUp()
+
+        self._root = os.path.join(self.tank_temp, "async_logging_%s" % self.id())
+        os.makedirs(self._root)
+        self._log_path = os.path.join(self._root, "test.log")
+
+        self._logger = logging.getLogger("test_async_logging.%s" % self.id())
+        self._logger.propagate = False
+        self._logger.setLevel(logging.DEBUG)
+
+    def _create_handler(self, overflow_policy=constants.ASYNC_FILE_LOGGING_BLOCK, max_bytes=0, **kwargs):
+        """
+        Creates an asynchronous handler writing to the test log file
+        and attaches it to the test logger.
+        """
+        handler = _AsyncFileHandler(
+            _BatchedRotatingFileHandler(self._log_path, maxBytes=max_bytes, backupCount=1),
+            overflow_policy,
+            **kwargs
+        )
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self._logger.addHandler(handler)
+        self.addCleanup(self._logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+        return handler
+
+    def _read_log(self):
+        """
+        Returns the lines of the test log file.
+        """
+        return open(self._log_path).read().splitlines()
+
+    def test_write(self):
+        """
+        Ensures messages are written in order, as they were when logged.
+        """
+        handler = self._create_handler(batch_size=3)
+        self.assertEqual(handler.baseFilename, self._log_path)
+
+        items = ["first"]
+        self._logger.debug("items: %s", items)
+        items.append("second")
+        for i in range(10):
+            self._logger.info("message %d", i)
+        try:
+            raise ValueError("failure")
+        except ValueError:
+            self._logger.exception("error")
+
+        handler.flush()
+        lines = self._read_log()
+        self.assertEqual(lines[0], "DEBUG items: ['first']")
+        self.assertEqual(lines[1:11], ["INFO message %d" % i for i in range(10)])
+        self.assertEqual(lines[11], "ERROR error")
+        self.assertEqual(lines[-1], "ValueError: failure")
+
+        # messages logged after the handler was closed are ignored
+        handler.close()
+        self._logger.info("closed")
+        self.assertFalse("INFO closed" in self._read_log())
+
+    def test_rotation(self):
+        """
+        Ensures the log file is rotated by the background thread.
+        """
+        handler = self._create_handler(max_bytes=1024)
+        for i in range(100):
+            self._logger.info("message %d", i)
+        handler.flush()
+
+        self.assertTrue(os.path.exists("%s.1" % self._log_path))
+        self.assertEqual(self._read_log()[-1], "INFO message 99")
+
+    def test_drop_oldest(self):
+        """
+        Ensures the oldest messages are discarded when the queue is full.
+        """
+        handler = self._create_handler(constants.ASYNC_FILE_LOGGING_DROP_OLDEST, queue_size=2)
+
+        # hold the writer while it writes the first message
+        writing = threading.Event()
+        release = threading.Event()
+        write = handler._target.handle
+
+        def held_write(record):
+            writing.set()
+            release.wait()
+            write(record)
+
+        with patch.object(handler._target, "handle", side_effect=held_write):
+            self._logger.info("message 0")
+            writing.wait()
+            for i in range(1, 6):
+                self._logger.info("message %d", i)
+            release.set()
+            handler.flush()
+
+        self.assertEqual(handler.num_dropped, 3)
+        self.assertEqual(self._read_log(), ["INFO message 0", "INFO message 4", "INFO message 5"])
+
+    def test_base_file_handler(self):
+        """
+        Ensures the base file handler is asynchronous when requested and drains on uninitialize.
+        """
+        manager = LogManager()
+        previous_log_name = manager.uninitialize_base_file_handler()
+        try:
+            with patch.object(LogManager, "log_folder", self._root):
+                with patch.dict(os.environ, {constants.ASYNC_FILE_LOGGING_ENV_VAR: "drop_oldest"}):
+                    manager.initialize_base_file_handler("async_test")
+
+                handler = manager.base_file_handler
+                self.assertTrue(isinstance(handler, _AsyncFileHandler))
+                LogManager.get_logger("async_test").error("logged asynchronously")
+                manager.uninitialize_base_file_handler()
+
+            lines = open(handler.baseFilename).read().splitlines()
+            self.assertTrue(lines[-1].endswith("[%d ERROR sgtk.ext.async_test] logged asynchronously" % os.getpid()))
+        finally:
+            if previous_log_name:
+                manager.initialize_base_file_handler(previous_log_name)
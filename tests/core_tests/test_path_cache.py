@@ -12,9 +12,11 @@ import os
 import StringIO
 import sqlite3
 import shutil
+import threading
 import logging
 
 from tank_test.tank_test_base import *
+from mock import patch
 
 from tank import path_cache
 from tank import folder
@@ -76,6 +78,48 @@ class TestInit(TestPathCache):
         pc.close()
         self.assertTrue(os.path.exists(self.path_cache_location))
 
+    def test_pooled_connection(self):
+        """
+        Test that path cache objects reuse the database connection of the current thread.
+        """
+        pc = path_cache.PathCache(self.tk)
+        self.assertIs(pc._connection, self.path_cache._connection)
+
+        # a new connection is made if the file is replaced on disk
+        connection = pc._connection
+        pc.close()
+        self.path_cache.close()
+        os.remove(self.path_cache_location)
+        pc = path_cache.PathCache(self.tk)
+        self.assertIsNot(pc._connection, connection)
+        self.assertTrue(os.path.exists(self.path_cache_location))
+        pc.close()
+
+        # connections are not shared across threads
+        connections = []
+        def create_path_cache():
+            thread_pc = path_cache.PathCache(self.tk)
+            connections.append(thread_pc._connection)
+            thread_pc.close()
+        thread = threading.Thread(target=create_path_cache)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(connections), 1)
+        self.assertIsNot(connections[0], pc._connection)
+
+    def test_close_rolls_back(self):
+        """
+        Test that uncommitted changes are discarded when a path cache is closed.
+        """
+        entity = {"type": "EntityType", "id": 1, "name": "EntityName"}
+        path = os.path.join(self.project_root, "path")
+        self.path_cache._add_db_mapping(self.path_cache._connection.cursor(), path, entity, True)
+        self.path_cache.close()
+
+        pc = path_cache.PathCache(self.tk)
+        self.assertIsNone(pc.get_entity(path))
+        pc.close()
+
     def test_root_map(self):
         """Test that mapping of project root locations is created"""
         # More specific testing of loading roots happens in test_root
@@ -284,6 +328,150 @@ class TestGetEntity(TestPathCache):
         self.assertIsNone(result)
 
 
+class TestGetEntitiesForPathAndParents(TestPathCache):
+    """
+    Tests for get_entities_for_path_and_parents.
+    """
+    def setUp(self):
+        super(TestGetEntitiesForPathAndParents, self).setUp()
+
+        self.proj = {"type": "Project", "id": self.project["id"], "name": self.project["name"]}
+        self.seq = {"type": "Sequence", "id": 1, "name": "seq"}
+        self.shot = {"type": "Shot", "id": 2, "name": "shot_name"}
+        self.step = {"type": "Step", "id": 3, "name": "step"}
+        self.asset = {"type": "Asset", "id": 4, "name": "asset"}
+
+        self.seq_path = os.path.join(self.project_root, "seq")
+        self.shot_path = os.path.join(self.seq_path, "shot_name")
+        self.step_path = os.path.join(self.shot_path, "step")
+
+        add_item_to_cache(self.path_cache, self.proj, self.project_root)
+        add_item_to_cache(self.path_cache, self.proj, self.alt_root_1)
+        add_item_to_cache(self.path_cache, self.seq, self.seq_path)
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        add_item_to_cache(self.path_cache, self.step, self.step_path)
+        add_item_to_cache(self.path_cache, self.seq, self.shot_path, primary=False)
+        add_item_to_cache(self.path_cache, self.asset, self.shot_path, primary=False)
+
+    def test_path_and_parents(self):
+        """
+        Test that entities are returned for the path and all its parents up to the root.
+        """
+        work_path = os.path.join(self.step_path, "work")
+        result = self.path_cache.get_entities_for_path_and_parents(work_path)
+
+        self.assertEqual(
+            result,
+            [
+                (work_path, None, []),
+                (self.step_path, self.step, []),
+                (self.shot_path, self.shot, [self.seq, self.asset]),
+                (self.seq_path, self.seq, []),
+                (self.project_root, self.proj, []),
+            ]
+        )
+
+        # results should be the same as looking up each path separately
+        for (path, entity, secondary_entities) in result:
+            self.assertEqual(entity, self.path_cache.get_entity(path))
+            self.assertEqual(secondary_entities, self.path_cache.get_secondary_entities(path))
+
+    def test_alternate_root(self):
+        """
+        Test that the lookup stops at a non primary root.
+        """
+        path = os.path.join(self.alt_root_1, "seq")
+        result = self.path_cache.get_entities_for_path_and_parents(path)
+        self.assertEqual(result, [(path, None, []), (self.alt_root_1, self.proj, [])])
+
+    def test_non_project_path(self):
+        """
+        Test that paths outside of the project don't resolve to any entity.
+        """
+        path = os.path.join(self.tank_temp, "not", "in", "project")
+        result = self.path_cache.get_entities_for_path_and_parents(path)
+        self.assertEqual(result[0], (path, None, []))
+        for (_, entity, secondary_entities) in result:
+            self.assertIsNone(entity)
+            self.assertEqual(secondary_entities, [])
+
+
+class TestLookupCache(TestPathCache):
+    """
+    Tests for the in memory cache of path cache lookups.
+    """
+    def setUp(self):
+        super(TestLookupCache, self).setUp()
+        self.shot = {"type": "Shot", "id": 1, "name": "shot_name"}
+        self.shot_path = os.path.join(self.project_root, "seq", "shot_name")
+
+    def test_disabled(self):
+        """
+        Test that lookups are not cached by default.
+        """
+        with patch.dict(os.environ):
+            os.environ.pop(constants.PATH_CACHE_LOOKUP_CACHE_SIZE_ENV_VAR, None)
+            pc = path_cache.PathCache(self.tk)
+            self.assertIsNone(pc.get_lookup_cache_stats())
+            pc.close()
+
+    @patch.dict(os.environ, {constants.PATH_CACHE_LOOKUP_CACHE_SIZE_ENV_VAR: "100"})
+    def test_cached_lookups(self):
+        """
+        Test that lookups are cached and invalidated when mappings are added.
+        """
+        pc = path_cache.PathCache(self.tk)
+        self.assertIsNone(pc.get_entity(self.shot_path))
+        self.assertIsNone(pc.get_entity(self.shot_path))
+        stats = pc.get_lookup_cache_stats()
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["max_size"], 100)
+        hits = stats["hits"]
+
+        add_item_to_cache(pc, self.shot, self.shot_path)
+        self.assertEqual(pc.get_lookup_cache_stats()["generation"], stats["generation"] + 1)
+        self.assertEqual(pc.get_entity(self.shot_path), self.shot)
+        self.assertEqual(pc.get_paths("Shot", 1, primary_only=True), [self.shot_path])
+
+        # lookups are shared with other path cache objects
+        pc.close()
+        pc = path_cache.PathCache(self.tk)
+        entity = pc.get_entity(self.shot_path)
+        self.assertEqual(entity, self.shot)
+        self.assertEqual(pc.get_paths("Shot", 1, primary_only=True), [self.shot_path])
+        self.assertEqual(pc.get_lookup_cache_stats()["hits"], hits + 2)
+
+        # modifying the results doesn't affect the cache
+        entity["name"] = "modified"
+        self.assertEqual(pc.get_entity(self.shot_path), self.shot)
+        pc.close()
+
+    @patch.dict(os.environ, {constants.PATH_CACHE_LOOKUP_CACHE_SIZE_ENV_VAR: "100"})
+    def test_modified_database(self):
+        """
+        Test that lookups are invalidated when the database is modified by someone else.
+        """
+        pc = path_cache.PathCache(self.tk)
+        self.assertEqual(pc.get_secondary_entities(self.shot_path), [])
+        generation = pc.get_lookup_cache_stats()["generation"]
+        pc.close()
+
+        # write directly to the database, like another process would
+        connection = sqlite3.connect(self.path_cache_location)
+        connection.execute(
+            "INSERT INTO path_cache(entity_type, entity_id, entity_name, root, path, primary_entity) "
+            "VALUES(?, ?, ?, ?, ?, ?)",
+            ("Shot", 1, "shot_name", "primary", "/seq/shot_name", 0)
+        )
+        connection.commit()
+        connection.close()
+
+        pc = path_cache.PathCache(self.tk)
+        self.assertGreater(pc.get_lookup_cache_stats()["generation"], generation)
+        self.assertEqual(pc.get_secondary_entities(self.shot_path), [self.shot])
+        pc.close()
+
+
 class TestGetPaths(TestPathCache):
     def test_add_and_find_shot(self):
         # add two paths to cache for a shot
@@ -529,6 +717,126 @@ class TestShotgunSync(TankTestBase):
         self.assertEqual( len(self._get_path_cache()), 4)
 
 
+    def test_incremental_sync_deletions(self):
+        """
+        Tests that unregistered folders are removed by an incremental sync.
+        """
+        path_cache = tank.path_cache.PathCache(self.tk)
+        pcl = path_cache._get_path_cache_location()
+        path_cache.close()
+
+        folder.process_filesystem_structure(self.tk,
+                                            self.task["type"],
+                                            self.task["id"],
+                                            preview=False,
+                                            engine=None)
+        self.assertEqual(len(self._get_path_cache()), 4)
+
+        # make a copy of the path cache at this point
+        shutil.copy(pcl, "%s.snap1" % pcl)
+
+        # unregister the shot and step folders, the way unregister_folders does
+        sg_ids = [
+            x["id"] for x in self.tk.shotgun.find(
+                tank.path_cache.SHOTGUN_ENTITY,
+                [[tank.path_cache.SG_ENTITY_TYPE_FIELD, "in", ["Shot", "Step"]]]
+            )
+        ]
+        self.assertEqual(len(sg_ids), 2)
+        for sg_id in sg_ids:
+            self.tk.shotgun.delete(tank.path_cache.SHOTGUN_ENTITY, sg_id)
+        self.tk.shotgun.create(
+            "EventLogEntry",
+            {"event_type": "Toolkit_Folders_Delete",
+             "description": "Toolkit HEAD: Unregistered 2 folders.",
+             "entity": {"type": "PipelineConfiguration", "id": self.sg_pc_entity["id"]},
+             "meta": {"core_api_version": "HEAD", "sg_folder_ids": sg_ids},
+             "project": self.project}
+        )
+
+        log = sync_path_cache(self.tk)
+        self.assertFalse("Performing a complete Shotgun folder sync" in log)
+        self.assertEqual(len(self._get_path_cache()), 2)
+        self.assertEqual(self.tk.paths_from_entity("Shot", self.shot["id"]), [])
+
+        # register the folders again and sync the copy taken before they were
+        # unregistered, which has to replay both events.
+        folder.process_filesystem_structure(self.tk,
+                                            self.task["type"],
+                                            self.task["id"],
+                                            preview=False,
+                                            engine=None)
+        path_cache_contents = self._get_path_cache()
+        self.assertEqual(len(path_cache_contents), 4)
+
+        shutil.copy("%s.snap1" % pcl, pcl)
+        log = sync_path_cache(self.tk)
+        self.assertFalse("Performing a complete Shotgun folder sync" in log)
+        self.assertEqual(sorted(self._get_path_cache()), sorted(path_cache_contents))
+
+    def test_snapshot(self):
+        """
+        Tests that new path caches are seeded from the newest snapshot.
+        """
+        folder.process_filesystem_structure(self.tk,
+                                            self.seq["type"],
+                                            self.seq["id"],
+                                            preview=False,
+                                            engine=None)
+
+        pc = tank.path_cache.PathCache(self.tk)
+        try:
+            pcl = pc._get_path_cache_location()
+            snapshot_path = pc.write_snapshot()
+        finally:
+            pc.close()
+        self.assertTrue(os.path.exists(snapshot_path))
+        self.assertTrue(tank.path_cache.SNAPSHOT_FILE_REGEX.match(os.path.basename(snapshot_path)))
+
+        # more folders are created after the snapshot was written
+        folder.process_filesystem_structure(self.tk,
+                                            self.task["type"],
+                                            self.task["id"],
+                                            preview=False,
+                                            engine=None)
+        path_cache_contents = self._get_path_cache()
+        self.assertEqual(len(path_cache_contents), 4)
+
+        # a new machine starts from the snapshot and only syncs the new folders
+        os.remove(pcl)
+        log = sync_path_cache(self.tk)
+        self.assertFalse("Performing a complete Shotgun folder sync" in log)
+        self.assertTrue("seeding it from snapshot" in log)
+        self.assertTrue("Doing an incremental sync" in log)
+        self.assertEqual(self._get_path_cache(), path_cache_contents)
+
+        # up to date path caches are left alone
+        log = sync_path_cache(self.tk)
+        self.assertFalse("seeding it from snapshot" in log)
+
+    def test_snapshot_cleanup(self):
+        """
+        Tests that older snapshots are removed when writing a snapshot.
+        """
+        snapshot_paths = []
+        for entity in (self.project, self.seq, self.task):
+            folder.process_filesystem_structure(self.tk,
+                                                entity["type"],
+                                                entity["id"],
+                                                preview=False,
+                                                engine=None)
+            pc = tank.path_cache.PathCache(self.tk)
+            try:
+                snapshot_paths.append(pc.write_snapshot())
+            finally:
+                pc.close()
+
+        self.assertEqual(len(set(snapshot_paths)), 3)
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(snapshot_paths[0]))),
+            sorted([os.path.basename(x) for x in snapshot_paths[-constants.PATH_CACHE_SNAPSHOTS_TO_KEEP:]])
+        )
+
     def test_missing_roots_mapping(self):
         """
         Tests that invalid roots.yml lookups result in ignored records 
@@ -575,6 +883,82 @@ class TestShotgunSync(TankTestBase):
         self.assertEqual( len(self._get_path_cache()), 4)
 
 
+    def _duplicate_filesystem_location(self, sg_location, changes=None):
+        """
+        Adds a copy of a FilesystemLocation record to the mocked shotgun database.
+        """
+        locations = self.tk.shotgun._db[tank.path_cache.SHOTGUN_ENTITY]
+        data = sg_location.copy()
+        data["id"] = max(locations.keys()) + 1
+        data.update(changes or {})
+        locations[data["id"]] = data
+
+    def test_full_sync_duplicates(self):
+        """
+        Tests that duplicate FilesystemLocation records are skipped by a full sync.
+        """
+        folder.process_filesystem_structure(self.tk,
+                                            self.task["type"],
+                                            self.task["id"],
+                                            preview=False,
+                                            engine=None)
+        path_cache_contents = self._get_path_cache()
+        self.assertEqual(len(path_cache_contents), 4)
+
+        # duplicate all the records in shotgun
+        for sg_location in self.tk.shotgun._db[tank.path_cache.SHOTGUN_ENTITY].values():
+            self._duplicate_filesystem_location(sg_location)
+        self.assertEqual(len(self.tk.shotgun.find(tank.path_cache.SHOTGUN_ENTITY, [])), 8)
+
+        # page through the records a few at a time
+        with patch("tank.constants.PATH_CACHE_SYNC_PAGE_SIZE", 3):
+            pc = tank.path_cache.PathCache(self.tk)
+            try:
+                new_items = pc.synchronize(full_sync=True)
+            finally:
+                pc.close()
+
+        self.assertEqual(self._get_path_cache(), path_cache_contents)
+        self.assertEqual(len(new_items), 4)
+        for item in new_items:
+            self.assertEqual(item["metadata"], tank.path_cache.SG_METADATA_FIELD)
+            self.assertEqual(sorted(item["entity"].keys()), ["id", "name", "type"])
+            self.assertTrue(os.path.isdir(item["path"]))
+
+        # the sync marker was written and the next sync is incremental
+        log = sync_path_cache(self.tk)
+        self.assertFalse("Performing a complete Shotgun folder sync" in log)
+
+    def test_full_sync_conflict(self):
+        """
+        Tests that a full sync fails and leaves the path cache untouched when
+        a path is associated with different primary entities.
+        """
+        folder.process_filesystem_structure(self.tk,
+                                            self.task["type"],
+                                            self.task["id"],
+                                            preview=False,
+                                            engine=None)
+        path_cache_contents = self._get_path_cache()
+
+        # associate the shot path with another shot
+        sg_location = self.tk.shotgun.find_one(
+            tank.path_cache.SHOTGUN_ENTITY,
+            [[tank.path_cache.SG_ENTITY_TYPE_FIELD, "is", "Shot"]]
+        )
+        self._duplicate_filesystem_location(
+            self.tk.shotgun._db[tank.path_cache.SHOTGUN_ENTITY][sg_location["id"]],
+            {tank.path_cache.SG_ENTITY_ID_FIELD: 1234}
+        )
+
+        pc = tank.path_cache.PathCache(self.tk)
+        try:
+            self.assertRaises(tank.TankError, pc.synchronize, True)
+        finally:
+            pc.close()
+
+        self.assertEqual(self._get_path_cache(), path_cache_contents)
+
     def test_truncated_eventlog(self):
         """Tests that a full sync happens if the event log is truncated."""
 
@@ -9,6 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 
+import re
 import sys
 import os
 
@@ -16,6 +17,7 @@ import tank
 from tank import TankError
 
 from tank.template import TemplatePath
+from tank.template_path_parser import TemplatePathParser
 from tank_test.tank_test_base import *
 from tank.templatekey import (TemplateKey, StringKey, IntegerKey, 
                                 SequenceKey)
@@ -957,6 +959,75 @@ class TestGetFields(TestTemplatePath):
         input_path = os.path.join(self.project_root, "some", "thing", "else")
         self.assertRaises(TankError, template.get_fields, input_path)
 
+    def test_get_fields_many(self):
+        """
+        Test that fields are extracted for each path and that paths
+        not matching the template return None.
+        """
+        good_path = os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work",
+                                 "shot_1.mmm.v003.002.ma")
+        bad_path = os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work",
+                                "shot_1.mmm.vxxx.002.ma")
+        expected = [self.template_path.get_fields(good_path), None]
+        self.assertEqual(expected, self.template_path.get_fields_many([good_path, bad_path]))
+
+        input_paths = [good_path, bad_path] * 600
+        self.assertEqual(expected * 600, self.template_path.get_fields_many(input_paths, max_workers=4))
+
+    def test_parse_cache(self):
+        """
+        Test that the results of parsing paths are cached and that
+        the cached fields can't be modified by callers.
+        """
+        file_path = os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work",
+                                 "shot_1.mmm.v003.002.ma")
+        bad_path = os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work",
+                                "shot_1.mmm.vxxx.002.ma")
+
+        fields = self.template_path.get_fields(file_path)
+        fields["Shot"] = "modified"
+        self.assertRaises(TankError, self.template_path.get_fields, bad_path)
+        self.assertEqual(self.template_path.get_parse_cache_stats()["misses"], 2)
+
+        self.assertEqual(self.template_path.get_fields(file_path)["Shot"], "shot_1")
+        self.assertRaises(TankError, self.template_path.get_fields, bad_path)
+        self.assertEqual(self.template_path.get_fields(file_path, skip_keys=["Shot"]).get("Shot"), None)
+        stats = self.template_path.get_parse_cache_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["size"], 3)
+
+        self.template_path.clear_parse_cache()
+        self.assertEqual(self.template_path.get_parse_cache_stats()["size"], 0)
+
+    def test_compiled_pattern(self):
+        """
+        Test that the compiled pattern rejects paths the parser can't resolve
+        and that the error reported for those paths is the parser's.
+        """
+        good_path = os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work",
+                                 "shot_1.mmm.v003.002.ma")
+        # the version and branch keys have constraints which can be compiled
+        bad_version = os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work",
+                                   "shot_1.mmm.vxxx.002.ma")
+        bad_branch = os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work",
+                                  "shot_1.m_m.v003.002.ma")
+        pattern = self.template_path._path_patterns[0]
+        self.assertTrue(pattern.may_match(os.path.normpath(good_path).lower()))
+        self.assertFalse(pattern.may_match(os.path.normpath(bad_version).lower()))
+        self.assertFalse(pattern.may_match(os.path.normpath(bad_branch).lower()))
+
+        for bad_path in [bad_version, bad_branch]:
+            path_parser = TemplatePathParser(self.template_path._ordered_keys[0],
+                                             self.template_path._static_tokens[0])
+            self.assertEqual(path_parser.parse_path(bad_path, None), None)
+            expected_error = "Template %s: %s" % (self.template_path, path_parser.last_error)
+            self.assertRaisesRegexp(TankError, re.escape(expected_error),
+                                    self.template_path.get_fields, bad_path)
+
+        # constraints don't apply to skipped keys
+        self.assertEqual(self.template_path.get_fields(bad_version, skip_keys=["version"])["branch"], "mmm")
+
 
 class TestGetKeysSepInValue(TestTemplatePath):
     """Tests for cases where seperator used between keys is used in value for keys."""
@@ -159,6 +159,11 @@ class TestGetFields(TestTemplateString):
         input_string = "shot_1."
         self.assertRaises(TankError, self.template_string.get_fields, input_string)
 
+    def test_get_fields_many(self):
+        input_strings = ["something-shot_1.Seq_12", "shot_1."]
+        expected = [{"Shot": "shot_1", "Sequence": "Seq_12"}, None]
+        self.assertEquals(expected, self.template_string.get_fields_many(input_strings))
+
     def test_conflicting_values(self):
         definition = "{Shot}.{Shot}"
         input_string = "shot_1.shot_2"
@@ -11,6 +11,10 @@
 import os
 import tempfile
 
+from mock import patch
+
+from sgtk.util.process import subprocess_check_output
+
 from tank_test.tank_test_base import *
 import sgtk
 
@@ -37,3 +41,181 @@ class TestIODescriptors(TankTestBase):
         # make sure we are getting the same instance back
         self.assertTrue(d1._io_descriptor is d2._io_descriptor)
         self.assertTrue(d1._io_descriptor is not d3._io_descriptor)
+
+    def _create_download_descriptor(self, name):
+        """
+        Creates an app store descriptor cached in a unique bundle cache root.
+
+        :returns: Tuple (descriptor, path of the item in the bundle cache).
+        """
+        bundle_root = os.path.join(self.tank_temp, "bundle_cache_%s" % name)
+        desc = sgtk.descriptor.create_descriptor(
+            self.tk.shotgun,
+            sgtk.descriptor.Descriptor.APP,
+            {"type": "app_store", "version": "v1.2.3", "name": name},
+            bundle_root
+        )
+        return (desc, os.path.join(bundle_root, "app_store", name, "v1.2.3"))
+
+    def _write_bundle(self, path, content="name: test"):
+        """
+        Writes a minimal bundle into the given folder.
+        """
+        if not os.path.exists(path):
+            os.makedirs(path)
+        fh = open(os.path.join(path, "info.yml"), "w")
+        try:
+            fh.write(content)
+        finally:
+            fh.close()
+
+    def test_download_moved_into_place(self):
+        """
+        Tests that downloads are moved into the bundle cache once complete,
+        leaving no temporary folders behind.
+        """
+        (desc, target) = self._create_download_descriptor("tk-download-move")
+        self.assertFalse(desc.exists_local())
+
+        with patch.object(desc._io_descriptor, "_download_local", side_effect=self._write_bundle):
+            desc.download_local()
+
+        self.assertEqual(desc.get_path(), target)
+        self.assertEqual(os.listdir(os.path.dirname(target)), ["v1.2.3"])
+
+    def test_failed_download_cleaned_up(self):
+        """
+        Tests that nothing is left in the bundle cache when a download fails.
+        """
+        (desc, target) = self._create_download_descriptor("tk-download-failed")
+
+        def failing_download(path):
+            self._write_bundle(path)
+            raise sgtk.TankError("Download failed")
+
+        with patch.object(desc._io_descriptor, "_download_local", side_effect=failing_download):
+            self.assertRaises(sgtk.TankError, desc.download_local)
+
+        self.assertFalse(desc.exists_local())
+        self.assertEqual(os.listdir(os.path.dirname(target)), [])
+
+    def test_concurrent_download_kept(self):
+        """
+        Tests that a bundle downloaded concurrently by someone else is kept,
+        while leftovers of incomplete downloads are replaced.
+        """
+        (desc, target) = self._create_download_descriptor("tk-download-concurrent")
+
+        def concurrent_download(path):
+            self._write_bundle(path, "name: ours")
+            self._write_bundle(target, "name: theirs")
+
+        with patch.object(desc._io_descriptor, "_download_local", side_effect=concurrent_download):
+            desc.download_local()
+
+        self.assertEqual(open(os.path.join(target, "info.yml")).read(), "name: theirs")
+        self.assertEqual(os.listdir(os.path.dirname(target)), ["v1.2.3"])
+
+        (desc, target) = self._create_download_descriptor("tk-download-incomplete")
+        os.makedirs(os.path.join(target, "python"))
+
+        with patch.object(desc._io_descriptor, "_download_local", side_effect=self._write_bundle):
+            desc.download_local()
+
+        self.assertEqual(desc.get_path(), target)
+        self.assertFalse(os.path.exists(os.path.join(target, "python")))
+
+
+class TestGitMirror(TankTestBase):
+    """
+    Tests the local mirrors used by git descriptors.
+    """
+
+    def setUp(self):
+        super(TestGitMirror, self).setUp()
+
+        # create a repository with two tags
+        self.repo_path = os.path.join(self.tank_temp, "git_mirror_%s" % self.id(), "tk-multi-mirror.git")
+        os.makedirs(self.repo_path)
+        self._git("init -q")
+        self._git("symbolic-ref HEAD refs/heads/master")
+        self._git("config user.email test@example.com")
+        self._git("config user.name test")
+        self._commit_time = 1500000000
+        for version in ["v1.0.0", "v1.1.0"]:
+            self._commit(version)
+            self._git("tag %s" % version)
+
+        self.bundle_root = os.path.join(self.tank_temp, "bundle_cache_%s" % self.id())
+
+    def _git(self, cmd):
+        sgtk.util.git.execute_git_command(cmd, cwd=self.repo_path)
+
+    def _commit(self, content):
+        """
+        Commits a new version of the info.yml file to the repository.
+        """
+        fh = open(os.path.join(self.repo_path, "info.yml"), "w")
+        try:
+            fh.write("version: %s" % content)
+        finally:
+            fh.close()
+        self._git("add info.yml")
+        # the latest tag is found by commit date, make sure they differ
+        self._commit_time += 60
+        with patch.dict(os.environ, {"GIT_COMMITTER_DATE": "%d +0000" % self._commit_time}):
+            self._git("commit -q -m \"%s\"" % content)
+
+    def _create_descriptor(self, location):
+        location = dict(location, path=self.repo_path)
+        return sgtk.descriptor.create_descriptor(
+            self.tk.shotgun,
+            sgtk.descriptor.Descriptor.APP,
+            location,
+            self.bundle_root
+        )
+
+    def test_tags(self):
+        """
+        Tests that tags are resolved and downloaded from a single mirror.
+        """
+        io_descriptor_class = sgtk.descriptor.io_descriptor.git.IODescriptorGit
+        with patch.object(io_descriptor_class, "_create_mirror",
+                          autospec=True, side_effect=io_descriptor_class._create_mirror) as create_mirror:
+            desc = self._create_descriptor({"type": "git", "version": "v1.0.0"})
+            self.assertEqual(desc.find_latest_version().version, "v1.1.0")
+            self.assertEqual(desc.find_latest_version("v1.0.x").version, "v1.0.0")
+
+            # tags created after the mirror was created are fetched
+            self._commit("v1.2.0")
+            self._git("tag v1.2.0")
+            latest = desc.find_latest_version()
+            self.assertEqual(latest.version, "v1.2.0")
+
+            latest.download_local()
+            self.assertEqual(
+                open(os.path.join(latest.get_path(), "info.yml")).read(),
+                "version: v1.2.0"
+            )
+            self.assertEqual(create_mirror.call_count, 1)
+
+        self.assertEqual(len(os.listdir(os.path.join(self.bundle_root, "git_mirrors"))), 1)
+
+    def test_branch(self):
+        """
+        Tests that commits downloaded from a mirror are set up as clones of the repository.
+        """
+        desc = self._create_descriptor({"type": "git_branch", "branch": "master", "version": "0000000"})
+        desc.find_latest_version().download_local()
+
+        # commits made after the mirror was created are fetched
+        self._commit("v1.2.0")
+        latest = desc.find_latest_version()
+        latest.download_local()
+
+        path = latest.get_path()
+        self.assertEqual(open(os.path.join(path, "info.yml")).read(), "version: v1.2.0")
+        self.assertEqual(
+            subprocess_check_output("git config remote.origin.url", shell=True, cwd=path).strip(),
+            self.repo_path
+        )
@@ -11,7 +11,7 @@
 import os
 import unittest
 import shutil
-from mock import Mock
+from mock import Mock, patch
 import tank
 from tank_vendor import yaml
 from tank import TankError
@@ -74,3 +74,34 @@ class TestFolderConfiguration(TankTestBase):
                           self.schema_location)
 
 
+
+    def test_compiled_schema(self):
+        """
+        Checks that the compiled schema is reused for as long as the schema is not modified.
+        """
+        self.setup_fixtures()
+
+        config = folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+        self.assertEqual(len(config.get_folder_objs_for_entity_type("Sequence")), 1)
+        compiled_schema_path = os.path.join(
+            self.tk.pipeline_configuration.get_path(), tank.constants.COMPILED_FOLDER_SCHEMA_FILE
+        )
+        self.assertTrue(os.path.exists(compiled_schema_path))
+
+        with patch.object(folder.configuration.FolderConfiguration, "_compile_schema") as compile_schema:
+            # from memory
+            config = folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+            self.assertEqual(len(config.get_folder_objs_for_entity_type("Sequence")), 1)
+            # from disk, as done by another process
+            with patch.dict(folder.configuration._compiled_schemas, clear=True):
+                config = folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+                self.assertEqual(len(config.get_folder_objs_for_entity_type("Sequence")), 1)
+            self.assertFalse(compile_schema.called)
+
+        # add a second sequence folder to the schema
+        sequence_path = os.path.join(self.schema_location, "project", "sequences", "sequence")
+        os.mkdir(sequence_path + "_2")
+        shutil.copy(sequence_path + ".yml", sequence_path + "_2.yml")
+
+        config = folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+        self.assertEqual(len(config.get_folder_objs_for_entity_type("Sequence")), 2)
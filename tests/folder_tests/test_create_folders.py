@@ -11,7 +11,7 @@
 import os
 import unittest
 import shutil
-from mock import Mock
+from mock import Mock, patch
 import tank
 from tank_vendor import yaml
 from tank import TankError
@@ -550,7 +550,38 @@ class TestCreateFilesystemStructure(TankTestBase):
                                             engine=None)
         self.assertTrue(os.path.exists(expected))
 
-              
+    def test_create_shots_bulk(self):
+        """
+        Tests that the shotgun data for multiple shots is retrieved in bulk.
+        """
+        shots = []
+        for shot_id in range(100, 110):
+            shots.append({"type": "Shot",
+                          "id": shot_id,
+                          "code": "shot_%d" % shot_id,
+                          "sg_sequence": self.seq,
+                          "project": self.project})
+        self.add_to_sg_mock_db(shots)
+
+        sg = self.tk.shotgun
+        with patch.object(sg, "find", wraps=sg.find) as find:
+            with patch.object(sg, "find_one", wraps=sg.find_one) as find_one:
+                folder.process_filesystem_structure(self.tk,
+                                                    "Shot",
+                                                    [shot["id"] for shot in shots],
+                                                    preview=False,
+                                                    engine=None)
+
+        for shot in shots:
+            expected = os.path.join(self.project_root, "sequences", self.seq["code"], shot["code"])
+            self.assertTrue(os.path.exists(expected))
+
+        # the shots and their parents are queried once when extracting the data
+        # upwards and once when creating the folders, regardless of the number of shots.
+        queried_entity_types = [call[0][0] for call in find.call_args_list + find_one.call_args_list]
+        for entity_type in ["Project", "Sequence", "Shot"]:
+            self.assertEqual(queried_entity_types.count(entity_type), 2)
+
     def test_wrong_type_entity_ids(self):
         """Test passing in type other than list, int or tuple as value for entity_ids parameter.
         """
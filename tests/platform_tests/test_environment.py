@@ -6,6 +6,7 @@ from tank.platform.validation import *
 from tank_vendor import yaml
 
 import copy
+from mock import patch
 
 class TestEnvironment(TankTestBase):
     """
@@ -66,6 +67,31 @@ class TestEnvironment(TankTestBase):
         app_env.pop("location")
         self.assertEqual(self.env.get_app_settings("test_engine", "test_app"), app_env)
         
+    def test_no_deep_copy(self):
+        """
+        Ensures the environment data isn't deep copied when loading an environment,
+        and that the data shared with the yaml cache isn't modified.
+        """
+        with patch("copy.deepcopy", wraps=copy.deepcopy) as deepcopy:
+            env = self.tk.pipeline_configuration.get_environment(self.test_env)
+        for call in deepcopy.call_args_list:
+            data = call[0][0]
+            self.assertFalse(isinstance(data, dict) and "engines" in data)
+
+        # loading the environment again still finds the locations and apps
+        # removed from the settings
+        env = self.tk.pipeline_configuration.get_environment(self.test_env)
+        self.assertEqual(env.get_engines(), ["test_engine"])
+        self.assertEqual(env.get_apps("test_engine"), ["test_app"])
+        self.assertEqual(
+            env.get_engine_settings("test_engine"),
+            self.env.get_engine_settings("test_engine")
+        )
+        self.assertEqual(
+            env.get_app_settings("test_engine", "test_app"),
+            self.env.get_app_settings("test_engine", "test_app")
+        )
+
     def test_engine_meta(self):
         
         self.assertRaises(TankError, self.env.get_engine_descriptor, "bad_engine")
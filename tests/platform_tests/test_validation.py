@@ -3,6 +3,7 @@ import tank.platform.constants
 from tank.errors import TankError
 from tank.templatekey import StringKey
 from tank_test.tank_test_base import *
+from mock import Mock, patch
 from tank.platform.validation import *
 from tank.platform.environment import Environment
 
@@ -494,6 +495,71 @@ class TestValidateContext(TankTestBase):
         # If no error, then success
         validate_settings(self.app_name, self.tk, self.context, schema, self.config)
 
+    def _validate_with_descriptor(self, context, config):
+        """
+        Validates the settings for a test descriptor, counting calls
+        to the context's as_template_fields method.
+
+        :returns: Number of calls to as_template_fields.
+        """
+        descriptor = Mock()
+        descriptor.get_uri.return_value = "sgtk:descriptor:dev?path=/test_app"
+        with patch.object(context, "as_template_fields", wraps=context.as_template_fields) as mock_fields:
+            validate_settings(self.app_name, self.tk, context, self.metadata, config, descriptor)
+        return mock_fields.call_count
+
+    def test_validation_cached(self):
+        """
+        Case that the same settings are validated again for a context with the same entity.
+        """
+        template = tank.template.TemplatePath("sequence/{Sequence}", self.keys, self.project_root)
+        self.tk.templates = {self.template_name: template}
+
+        self.assertEqual(self._validate_with_descriptor(self.context, self.config), 1)
+        self.assertEqual(self._validate_with_descriptor(self.context, self.config), 0)
+        other_context = self.tk.context_from_path(os.path.join(self.project_root, "sequence/Seq/shot_code"))
+        self.assertEqual(self._validate_with_descriptor(other_context, self.config), 0)
+
+        # without a descriptor, settings are always validated
+        with patch.object(self.context, "as_template_fields", wraps=self.context.as_template_fields) as mock_fields:
+            validate_settings(self.app_name, self.tk, self.context, self.metadata, self.config)
+        self.assertEqual(mock_fields.call_count, 1)
+
+    def test_validation_key_without_user(self):
+        """
+        Case that the validation cache doesn't resolve the current user of the context.
+        """
+        template = tank.template.TemplatePath("sequence/{Sequence}", self.keys, self.project_root)
+        self.tk.templates = {self.template_name: template}
+        self.assertEqual(self._validate_with_descriptor(self.context, self.config), 1)
+
+        with patch("tank.util.login.get_current_user", side_effect=AssertionError("user was resolved")):
+            other_context = self.tk.context_from_path(os.path.join(self.project_root, "sequence/Seq/shot_code"))
+            self.assertEqual(self._validate_with_descriptor(other_context, self.config), 0)
+
+    def test_validation_cache_invalidated(self):
+        """
+        Case that settings are validated again after something they depend on changed.
+        """
+        template = tank.template.TemplatePath("sequence/{Sequence}", self.keys, self.project_root)
+        self.tk.templates = {self.template_name: template}
+        self.assertEqual(self._validate_with_descriptor(self.context, self.config), 1)
+
+        # different settings
+        other_name = "other_template_name"
+        self.tk.templates = {self.template_name: template, other_name: template}
+        self.assertEqual(self._validate_with_descriptor(self.context, {self.config_name: other_name}), 1)
+
+        # different context entity
+        project_context = self.tk.context_from_entity("Project", self.project["id"])
+        self.assertRaises(TankError, self._validate_with_descriptor, project_context, self.config)
+        # failed validations are not cached
+        self.assertRaises(TankError, self._validate_with_descriptor, project_context, self.config)
+
+        # reloaded templates
+        self.tk.templates = {self.template_name: template}
+        self.assertEqual(self._validate_with_descriptor(self.context, self.config), 1)
+
 
 class TestValidateFixtures(TankTestBase):
     """Integration test running validation on test fixtures."""
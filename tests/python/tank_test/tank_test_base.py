@@ -294,6 +294,7 @@ class TankTestBase(unittest.TestCase):
         pc = path_cache.PathCache(self.tk)
         path_cache_file = pc._get_path_cache_location()
         pc.close()
+        path_cache.PathCache.close_pooled_connections(self.tk)
         if os.path.exists(path_cache_file):
             os.remove(path_cache_file)
             
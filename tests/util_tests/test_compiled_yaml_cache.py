@@ -0,0 +1,194 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import time
+
+from mock import patch
+
+from sgtk.util.yaml_cache import YamlCache
+from sgtk.util.compiled_yaml_cache import CompiledYamlCache
+from tank_vendor import yaml
+from tank_test.tank_test_base import *
+
+
+class TestCompiledYamlCache(TankTestBase):
+    """
+    Tests the compiled, on-disk yaml cache.
+    """
+
+    def setUp(self):
+        super(TestCompiledYamlCache, self).setUp()
+
+        self._root = os.path.join(self.tank_temp, "compiled_yaml_cache_%s" % self.id())
+        os.makedirs(self._root)
+        self._cache_path = os.path.join(self._root, "yaml_cache.bin")
+
+    def _write_yaml(self, file_name, data):
+        """
+        Writes a yaml file in the test root and returns its path.
+        """
+        path = os.path.join(self._root, file_name)
+        fh = open(path, "w")
+        try:
+            fh.write(yaml.dump(data))
+        finally:
+            fh.close()
+        return path
+
+    def test_round_trip(self):
+        """
+        Ensures records written to disk are read back by new cache instances,
+        and only while the files are unchanged.
+        """
+        data = {"engines": {"tk-maya": {"apps": [1, "two", None]}}}
+        path = self._write_yaml("env.yml", data)
+
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        self.assertEqual(compiled_cache.get(path, os.stat(path)), (False, None))
+        compiled_cache.add(path, os.stat(path), data)
+        compiled_cache.flush()
+        self.assertTrue(os.path.exists(self._cache_path))
+
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        self.assertEqual(compiled_cache.get(path, os.stat(path)), (True, data))
+
+        # modified files are not served from the cache anymore:
+        self._write_yaml("env.yml", {"engines": {}})
+        self.assertEqual(compiled_cache.get(path, os.stat(path)), (False, None))
+
+    def test_stale_records_dropped(self):
+        """
+        Ensures records for modified or removed files are not written again.
+        """
+        kept_path = self._write_yaml("kept.yml", [1])
+        modified_path = self._write_yaml("modified.yml", [2])
+        removed_path = self._write_yaml("removed.yml", [3])
+
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        for path in (kept_path, modified_path, removed_path):
+            compiled_cache.add(path, os.stat(path), yaml.load(open(path)))
+        compiled_cache.flush()
+
+        self._write_yaml("modified.yml", [2, 2])
+        os.remove(removed_path)
+        added_path = self._write_yaml("added.yml", [4])
+
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        compiled_cache.add(added_path, os.stat(added_path), [4])
+        compiled_cache.flush()
+
+        self.assertEqual(
+            sorted(CompiledYamlCache(self._cache_path)._index.keys()),
+            sorted([kept_path, added_path])
+        )
+
+    def test_files_outside_root_ignored(self):
+        """
+        Ensures only files located under the root of the cache are stored.
+        """
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        outside_path = self._root + "_other.yml"
+        self.assertFalse(compiled_cache.handles(outside_path))
+        self.assertTrue(compiled_cache.handles(os.path.join(self._root, "config", "a.yml")))
+
+        compiled_cache.add(outside_path, os.stat(self._root), [1])
+        compiled_cache.flush()
+        self.assertFalse(os.path.exists(self._cache_path))
+
+    def test_invalid_files_ignored(self):
+        """
+        Ensures corrupt and outdated cache files are treated as empty and replaced.
+        """
+        path = self._write_yaml("env.yml", [1])
+
+        fh = open(self._cache_path, "wb")
+        try:
+            fh.write("not a compiled yaml cache")
+        finally:
+            fh.close()
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        self.assertEqual(compiled_cache.get(path, os.stat(path)), (False, None))
+
+        compiled_cache.add(path, os.stat(path), [1])
+        compiled_cache.flush()
+        self.assertEqual(
+            CompiledYamlCache(self._cache_path).get(path, os.stat(path)),
+            (True, [1])
+        )
+
+        with patch.object(CompiledYamlCache, "FORMAT_VERSION", CompiledYamlCache.FORMAT_VERSION + 1):
+            compiled_cache = CompiledYamlCache(self._cache_path)
+            self.assertEqual(compiled_cache.get(path, os.stat(path)), (False, None))
+
+    def test_failed_replace_keeps_cache(self):
+        """
+        Ensures the current cache file is still used when it can't be replaced on Windows.
+        """
+        path = self._write_yaml("env.yml", [1])
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        compiled_cache.add(path, os.stat(path), [1])
+        compiled_cache.flush()
+
+        compiled_cache = CompiledYamlCache(self._cache_path)
+        added_path = self._write_yaml("added.yml", [2])
+        compiled_cache.add(added_path, os.stat(added_path), [2])
+
+        with patch("sys.platform", "win32"):
+            with patch("os.remove", side_effect=OSError("file is mapped by another process")):
+                self.assertRaises(OSError, compiled_cache.flush)
+
+        self.assertEqual(compiled_cache.get(path, os.stat(path)), (True, [1]))
+
+    def test_background_write(self):
+        """
+        Ensures added records are written to disk without flushing explicitly.
+        """
+        path = self._write_yaml("env.yml", [1])
+
+        with patch.object(CompiledYamlCache, "WRITE_DELAY", 0.01):
+            compiled_cache = CompiledYamlCache(self._cache_path)
+            compiled_cache.add(path, os.stat(path), [1])
+
+            for _ in range(500):
+                if not compiled_cache._pending:
+                    break
+                time.sleep(0.01)
+
+        self.assertEqual(
+            CompiledYamlCache(self._cache_path).get(path, os.stat(path)),
+            (True, [1])
+        )
+
+    def test_yaml_cache_integration(self):
+        """
+        Ensures the yaml cache only parses files missing from its compiled cache.
+        """
+        data = {"one": [1, {"two": 2}]}
+        path = self._write_yaml("env.yml", data)
+
+        yaml_cache = YamlCache()
+        compiled_cache = yaml_cache.add_compiled_cache(self._cache_path)
+        self.assertTrue(isinstance(compiled_cache, CompiledYamlCache))
+        self.assertEqual(compiled_cache.path, self._cache_path)
+        # registering the same file again returns the registered cache without reading the file
+        with patch.object(CompiledYamlCache, "_read", side_effect=AssertionError("cache file was read")):
+            self.assertTrue(
+                yaml_cache.add_compiled_cache(os.path.join(self._root, ".", "yaml_cache.bin")) is compiled_cache
+            )
+        self.assertEqual(yaml_cache.get(path), data)
+        compiled_cache.flush()
+
+        # a new yaml cache, as used by another process, doesn't parse the file
+        yaml_cache = YamlCache()
+        yaml_cache.add_compiled_cache(self._cache_path)
+        with patch("tank_vendor.yaml.load", side_effect=AssertionError("yaml was parsed")):
+            self.assertEqual(yaml_cache.get(path), data)
+            self.assertEqual(yaml_cache.get_frozen(path), data)
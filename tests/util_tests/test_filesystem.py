@@ -0,0 +1,118 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+
+from mock import patch
+
+from sgtk.util import filesystem
+from tank_test.tank_test_base import *
+
+
+class TestProcessFolderCreationItems(TankTestBase):
+    """
+    Tests the creation of the items requested by the folder creation.
+    """
+
+    def setUp(self):
+        super(TestProcessFolderCreationItems, self).setUp()
+
+        self._root = os.path.join(self.tank_temp, "folder_creation_%s" % self.id())
+        os.makedirs(self._root)
+
+        self._source_file = os.path.join(self._root, "source.txt")
+        fh = open(self._source_file, "w")
+        try:
+            fh.write("source")
+        finally:
+            fh.close()
+
+        shot_path = os.path.join(self._root, "sequences", "seq_1", "shot_1")
+        # the items are not necessarily sorted from the top down
+        self._items = [
+            {"action": "entity_folder", "path": shot_path},
+            {"action": "folder", "path": os.path.join(shot_path, "work")},
+            {"action": "entity_folder", "path": os.path.join(self._root, "sequences", "seq_1")},
+            {"action": "remote_entity_folder", "path": os.path.join(self._root, "remote")},
+            {"action": "copy",
+             "source_path": self._source_file,
+             "target_path": os.path.join(shot_path, "work", "copied.txt")},
+            {"action": "create_file",
+             "path": os.path.join(shot_path, "created", "created.txt"),
+             "content": "created"},
+        ]
+        self._created_paths = [
+            shot_path,
+            os.path.join(shot_path, "work"),
+            os.path.join(self._root, "sequences", "seq_1"),
+            os.path.join(shot_path, "work", "copied.txt"),
+            os.path.join(shot_path, "created", "created.txt"),
+        ]
+        if sys.platform != "win32":
+            self._items.append(
+                {"action": "symlink", "path": os.path.join(shot_path, "link"), "target": "work"}
+            )
+            self._created_paths.append(os.path.join(shot_path, "link"))
+
+    def test_create(self):
+        """
+        Ensures all items are created and returned in order, and only once.
+        """
+        self.assertEqual(
+            filesystem.process_folder_creation_items(self._items, False, max_workers=4),
+            self._created_paths
+        )
+        self.assertTrue(os.path.isdir(os.path.join(self._root, "sequences", "seq_1", "shot_1", "work")))
+        self.assertFalse(os.path.exists(os.path.join(self._root, "remote")))
+        self.assertEqual(
+            open(self._created_paths[3]).read(), "source"
+        )
+        self.assertEqual(
+            open(self._created_paths[4]).read(), "created"
+        )
+        if sys.platform != "win32":
+            self.assertEqual(os.readlink(self._created_paths[5]), "work")
+
+        # existing items are skipped
+        self.assertEqual(
+            filesystem.process_folder_creation_items(self._items, False, max_workers=4),
+            []
+        )
+
+    def test_preview(self):
+        """
+        Ensures nothing is created in preview mode.
+        """
+        # items requested twice are reported twice since they don't exist yet
+        items = self._items + [self._items[0]]
+        self.assertEqual(
+            filesystem.process_folder_creation_items(items, True, max_workers=4),
+            self._created_paths + [self._created_paths[0]]
+        )
+        self.assertEqual(os.listdir(self._root), ["source.txt"])
+
+        self.assertEqual(
+            filesystem.process_folder_creation_items(items, False),
+            self._created_paths
+        )
+
+    def test_created_folders_not_checked(self):
+        """
+        Ensures the existence of items in folders which were just created is not checked.
+        """
+        # os.makedirs, used to create the folders of files, checks its parents itself
+        items = [item for item in self._items if item["action"] != "create_file"]
+        with patch("os.path.exists", wraps=os.path.exists) as exists:
+            filesystem.process_folder_creation_items(items, False, max_workers=4)
+        checked_paths = [call[0][0] for call in exists.call_args_list]
+        self.assertTrue(os.path.join(self._root, "sequences", "seq_1") in checked_paths)
+        for path in self._created_paths[:2] + self._created_paths[3:4] + self._created_paths[5:]:
+            self.assertFalse(path in checked_paths)
@@ -0,0 +1,66 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+# 
+# CONFIDENTIAL AND PROPRIETARY
+# 
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit 
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your 
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights 
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import copy
+
+from tank.util.lru_cache import LRUCache
+from tank_test.tank_test_base import *
+
+
+class TestLRUCache(TankTestBase):
+    """
+    Tests to ensure that the LRUCache behaves correctly
+    """
+
+    def test_get_set(self):
+        cache = LRUCache(2)
+        self.assertEqual(cache.get("a"), None)
+        self.assertEqual(cache.get("a", "default"), "default")
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertTrue("a" in cache)
+        self.assertEqual(len(cache), 1)
+
+    def test_eviction(self):
+        """
+        Test that the least recently used item is evicted when the cache is full.
+        """
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        # touch "a" so that "b" becomes the least recently used
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertTrue("a" in cache)
+        self.assertFalse("b" in cache)
+        self.assertTrue("c" in cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_stats(self):
+        cache = LRUCache(10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual(cache.get_stats(), {"hits": 2, "misses": 1, "size": 1, "max_size": 10})
+        cache.clear()
+        self.assertEqual(cache.get_stats(), {"hits": 2, "misses": 1, "size": 0, "max_size": 10})
+
+    def test_copy(self):
+        """
+        Test that copying a cache gives an empty cache with the same settings.
+        """
+        cache = LRUCache(10)
+        cache.set("a", 1)
+        cache_copy = copy.deepcopy(cache)
+        self.assertEqual(len(cache_copy), 0)
+        self.assertEqual(cache_copy.max_size, 10)
+        cache_copy.set("b", 2)
+        self.assertFalse("b" in cache)
@@ -156,6 +156,48 @@ class TestShotgunFindPublish(TankTestBase):
         paths = [os.path.join(self.project_root, "foo", "doesnotexist")]
         d = tank.util.find_publish(self.tk, paths)
         self.assertEqual(len(d), 0)
+
+    def test_chunked_queries(self):
+        """
+        Tests that large lists of paths are looked up in several queries.
+        """
+        keys = {"seq": SequenceKey("seq", format_spec="03")}
+        template = TemplatePath("foo/seq_{seq}.ext", keys, self.project_root)
+        self.tk.templates["sequence_test"] = template
+        paths = [os.path.join(self.project_root, "foo", "bar"),
+                 os.path.join(self.project_root, "foo", "baz"),
+                 os.path.join(self.project_root, "foo", "seq_001.ext"),
+                 os.path.join(self.project_root, "foo", "seq_002.ext"),
+                 os.path.join(self.alt_root_1, "foo", "bar")]
+
+        with patch("tank.util.constants.FIND_PUBLISH_CHUNK_SIZE", 1):
+            with patch.object(self.tk.shotgun, "find", wraps=self.tk.shotgun.find) as find_mock:
+                d = tank.util.find_publish(self.tk, paths)
+                # 3 path caches for the primary storage, also looked up for the
+                # Tank storage, and one for the alternate storage.
+                self.assertEqual(find_mock.call_count, 7)
+
+        self.assertEqual(
+            dict((path, sg_data["id"]) for (path, sg_data) in d.items()),
+            {paths[0]: self.pub_2["id"],
+             paths[1]: self.pub_3["id"],
+             paths[2]: self.pub_4["id"],
+             paths[3]: self.pub_4["id"],
+             paths[4]: self.pub_5["id"]}
+        )
+
+    def test_local_storages_cached(self):
+        """
+        Tests that storages are only looked up once per Toolkit instance.
+        """
+        paths = [os.path.join(self.project_root, "foo", "bar")]
+        with patch.object(self.tk.shotgun, "find_one", wraps=self.tk.shotgun.find_one) as find_one_mock:
+            tank.util.find_publish(self.tk, paths)
+            call_count = find_one_mock.call_count
+            self.assertTrue(call_count > 0)
+            d = tank.util.find_publish(self.tk, paths)
+            self.assertEqual(find_one_mock.call_count, call_count)
+        self.assertEqual(d[paths[0]]["id"], self.pub_2["id"])
         
 
 
@@ -121,3 +121,56 @@ class TestYamlCache(TankTestBase):
 
 
 
+
+    def test_get_frozen(self):
+        """
+        Test that YamlCache.get_frozen() returns read-only data which is shared
+        between calls, that deep copies of it are regular mutable containers
+        and that the frozen data is rebuilt when the file is modified.
+        """
+        yaml_path = os.path.join(self.tank_temp, "test_frozen_data.yml")
+
+        test_data = {"one": [1, {"two": 2}], "three": {"four": [4]}}
+
+        yaml_file = open(yaml_path, "w")
+        try:
+            yaml_file.write(yaml.dump(test_data))
+        finally:
+            yaml_file.close()
+
+        yaml_cache = YamlCache()
+        frozen_data = yaml_cache.get_frozen(yaml_path)
+
+        # the data matches the file and the same data is returned each time:
+        self.assertEquals(frozen_data, test_data)
+        self.assertTrue(frozen_data is yaml_cache.get_frozen(yaml_path))
+
+        # none of the containers can be modified:
+        self.assertRaises(TypeError, frozen_data.__setitem__, "five", 5)
+        self.assertRaises(TypeError, frozen_data.update, {"five": 5})
+        self.assertRaises(TypeError, frozen_data.pop, "one")
+        self.assertRaises(TypeError, frozen_data["one"].append, 5)
+        self.assertRaises(TypeError, frozen_data["one"][1].__setitem__, "two", 5)
+        self.assertRaises(TypeError, frozen_data["three"]["four"].__delitem__, 0)
+
+        # the cached data itself is left untouched:
+        self.assertEquals(yaml_cache.get(yaml_path), test_data)
+
+        # a deep copy is made of regular, mutable containers:
+        data = copy.deepcopy(frozen_data)
+        self.assertEquals(type(data), dict)
+        self.assertEquals(type(data["one"]), list)
+        self.assertEquals(type(data["one"][1]), dict)
+        data["one"][1]["two"] = 5
+        self.assertEquals(frozen_data["one"][1]["two"], 2)
+
+        # modifying the file gives back updated frozen data:
+        yaml_file = open(yaml_path, "w")
+        try:
+            yaml_file.write(yaml.dump({"six": [6]}))
+        finally:
+            yaml_file.close()
+
+        frozen_data = yaml_cache.get_frozen(yaml_path)
+        self.assertEquals(frozen_data, {"six": [6]})
+        self.assertRaises(TypeError, frozen_data["six"].append, 7)